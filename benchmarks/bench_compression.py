@@ -0,0 +1,122 @@
+"""Benchmark database size and read latency for raw content compression.
+
+Creates a throwaway SQLite database per codec, fills it with synthetic
+questions whose HTML resembles saved question pages, and reports the file
+size plus the latency of loading questions by ID through QuestionRepository.
+
+Usage:
+    python benchmarks/bench_compression.py [--questions N] [--html-kb KB]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from doughub2.compression import zstandard
+from doughub2.config import settings
+from doughub2.models import Base
+from doughub2.persistence import QuestionRepository
+
+WORDS = (
+    "patient presents with acute chest pain dyspnea fever history of "
+    "hypertension diabetes examination reveals tachycardia laboratory "
+    "studies show elevated troponin which of the following is the most "
+    "appropriate next step in management"
+).split()
+
+
+def make_html(rng: random.Random, target_bytes: int) -> str:
+    """Build a page-like HTML document of roughly target_bytes."""
+    parts = ["<html><head><style>.q{margin:0}</style></head><body>"]
+    size = 0
+    while size < target_bytes:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 30)))
+        chunk = (
+            f'<div class="q" data-id="{rng.randint(0, 10**6)}"><p>{sentence}</p></div>'
+        )
+        parts.append(chunk)
+        size += len(chunk)
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def run(codec: str, questions: int, html_kb: int, seed: int) -> dict:
+    """Populate a database with the given codec and time reads."""
+    settings.RAW_CONTENT_COMPRESSION = codec
+    rng = random.Random(seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        engine = create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        repo = QuestionRepository(session)
+        source = repo.get_or_create_source("Bench")
+
+        start = time.perf_counter()
+        ids = []
+        for i in range(questions):
+            question = repo.add_question(
+                {
+                    "source_id": source.source_id,
+                    "source_question_key": f"q{i}",
+                    "raw_html": make_html(rng, html_kb * 1024),
+                    "raw_metadata_json": json.dumps(
+                        {"bodyText": make_html(rng, 2048), "index": i}
+                    ),
+                }
+            )
+            ids.append(question.question_id)
+        repo.commit()
+        write_seconds = time.perf_counter() - start
+
+        latencies = []
+        for question_id in rng.sample(ids, len(ids)):
+            session.expire_all()
+            start = time.perf_counter()
+            question = repo.get_question_by_id(question_id)
+            _ = len(question.raw_html) + len(question.raw_metadata_json)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        session.close()
+        engine.dispose()
+        size = db_path.stat().st_size
+
+    return {
+        "codec": codec,
+        "db_mb": size / (1024 * 1024),
+        "write_s": write_seconds,
+        "read_p50_ms": statistics.median(latencies),
+        "read_p95_ms": statistics.quantiles(latencies, n=20)[-1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=200)
+    parser.add_argument("--html-kb", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    codecs = ["none", "zlib"] + (["zstd"] if zstandard is not None else [])
+    print(
+        f"{args.questions} questions, ~{args.html_kb} KB HTML each\n"
+        f"{'codec':<6} {'db MB':>8} {'write s':>8} {'p50 ms':>8} {'p95 ms':>8}"
+    )
+    for codec in codecs:
+        r = run(codec, args.questions, args.html_kb, args.seed)
+        print(
+            f"{r['codec']:<6} {r['db_mb']:>8.1f} {r['write_s']:>8.2f} "
+            f"{r['read_p50_ms']:>8.3f} {r['read_p95_ms']:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Benchmark question import throughput through QuestionRepository.
+
+Imports synthetic questions (a few KB of HTML each, with two media records)
+into a throwaway SQLite database, in one transaction, three ways:
+
+- add_question: one call per question, plus add_media_to_question per
+  media record
+- add_questions: the bulk upserts, add_questions and add_media
+- re-import: add_questions again over the same keys (every row updates)
+
+and reports questions per second for each.
+
+Usage:
+    python benchmarks/bench_ingest.py [--questions N] [--profile NAME]
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.orm import sessionmaker
+
+from doughub2.database import SQLITE_PROFILES, create_db_engine
+from doughub2.models import Base
+from doughub2.persistence import QuestionRepository
+
+WORDS = (
+    "patient presents with acute chest pain dyspnea fever history of "
+    "hypertension diabetes examination reveals tachycardia laboratory "
+    "studies show elevated troponin anemia thyroid nodule renal failure"
+).split()
+
+
+def make_rows(source_id: int, count: int, seed: int) -> list[dict]:
+    """Build add_question input for count questions."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        text = " ".join(rng.choice(WORDS) for _ in range(400))
+        rows.append(
+            {
+                "source_id": source_id,
+                "source_question_key": f"q{i}",
+                "raw_html": f"<html><body><p>{text}</p></body></html>",
+                "raw_metadata_json": json.dumps({"bodyText": text[:400]}),
+                "status": "extracted",
+            }
+        )
+    return rows
+
+
+def media_for(question_id: int) -> list[dict]:
+    """Two media records of a question."""
+    return [
+        {
+            "question_id": question_id,
+            "media_role": "image",
+            "media_type": "question_image",
+            "mime_type": "image/png",
+            "relative_path": f"blobs/{question_id}-{i}.png",
+        }
+        for i in range(2)
+    ]
+
+
+def run(profile: str, questions: int) -> dict[str, float]:
+    """Time each import path on a fresh database; return questions/s."""
+    results = {}
+    for mode in ("add_question", "add_questions"):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_db_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", profile)
+            Base.metadata.create_all(engine)
+            with sessionmaker(bind=engine)() as session:
+                repo = QuestionRepository(session)
+                source_id = repo.get_or_create_source("Bench").source_id
+                repo.commit()
+                rows = make_rows(source_id, questions, seed=1)
+
+                start = time.perf_counter()
+                if mode == "add_question":
+                    for row in rows:
+                        question = repo.add_question(row)
+                        for media in media_for(question.question_id):
+                            question_id = media.pop("question_id")
+                            repo.add_media_to_question(question_id, media)
+                else:
+                    question_ids = repo.add_questions(rows)
+                    repo.add_media([m for q in question_ids for m in media_for(q)])
+                repo.commit()
+                results[mode] = questions / (time.perf_counter() - start)
+
+                if mode == "add_questions":
+                    start = time.perf_counter()
+                    repo.add_questions(rows)
+                    repo.commit()
+                    results["re-import"] = questions / (time.perf_counter() - start)
+            engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=10_000)
+    parser.add_argument(
+        "--profile", choices=list(SQLITE_PROFILES), default="production"
+    )
+    args = parser.parse_args()
+
+    print(f"{'path':<14} {'questions/s':>12}")
+    for mode, rate in run(args.profile, args.questions).items():
+        print(f"{mode:<14} {rate:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Benchmark JSON serialization of large question detail responses.
+
+Compares, for a QuestionDetailResponse carrying KB-sized HTML:
+
+- response_model: returning the model and letting FastAPI validate and
+  encode it again (how /questions/{id} used to respond)
+- model_response with JSON_ENCODER=default (pydantic-core serializer)
+- model_response with JSON_ENCODER=orjson (if orjson is installed)
+
+first on a bare route (serialization only), then end to end through
+GET /questions/{id} of the real app against a throwaway SQLite database.
+
+Usage:
+    python benchmarks/bench_json.py [--html-kb KB ...] [--runs N]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from doughub2.config import settings
+from doughub2.database import get_db
+from doughub2.main import api_app
+from doughub2.models import Base
+from doughub2.persistence import QuestionRepository
+from doughub2.responses import model_response, orjson
+from doughub2.schemas import QuestionDetailResponse
+
+WORDS = (
+    "patient presents with acute chest pain dyspnea fever history of "
+    "hypertension diabetes examination reveals tachycardia laboratory "
+    "studies show elevated troponin — “which” of the following is the most "
+    "appropriate next step in management"
+).split()
+
+
+def make_html(rng: random.Random, target_bytes: int) -> str:
+    """Build a page-like HTML document of roughly target_bytes."""
+    parts = ['<html><head><style>.q{margin:0}</style></head><body class="q">']
+    size = 0
+    while size < target_bytes:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 30)))
+        chunk = f'<div class="stem"><p>{sentence}.</p>\n<span>"{sentence}"</span></div>'
+        parts.append(chunk)
+        size += len(chunk)
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def time_requests(client: TestClient, url: str, runs: int) -> float:
+    """Return the median latency of GET url in milliseconds."""
+    for _ in range(3):
+        client.get(url)
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        response = client.get(url)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+    return statistics.median(latencies)
+
+
+def encoders() -> list[str]:
+    """Return the JSON_ENCODER values available here."""
+    return ["default", "orjson"] if orjson is not None else ["default"]
+
+
+def bench_serialization(html: str, runs: int) -> dict[str, float]:
+    """Time the response paths on bare routes returning a prebuilt model."""
+    model = QuestionDetailResponse(
+        question_id=1, source_name="MKSAP", source_question_key="q1", raw_html=html
+    )
+    app = FastAPI()
+
+    @app.get("/model", response_model=QuestionDetailResponse)
+    def with_response_model() -> QuestionDetailResponse:
+        return model.model_copy()
+
+    @app.get("/fast", response_model=QuestionDetailResponse)
+    def with_model_response():
+        return model_response(model.model_copy())
+
+    client = TestClient(app)
+    results = {"response_model": time_requests(client, "/model", runs)}
+    for encoder in encoders():
+        settings.JSON_ENCODER = encoder
+        results[encoder] = time_requests(client, "/fast", runs)
+    return results
+
+
+def bench_endpoint(html: str, runs: int) -> dict[str, float]:
+    """Time GET /questions/{id} of the app for each encoder."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        repo = QuestionRepository(session)
+        source = repo.get_or_create_source("MKSAP")
+        question = repo.add_question(
+            {
+                "source_id": source.source_id,
+                "source_question_key": "q1",
+                "raw_html": html,
+                "raw_metadata_json": json.dumps({"bodyText": html[:200]}),
+            }
+        )
+        repo.commit()
+
+        def override_get_db():
+            yield session
+
+        api_app.dependency_overrides[get_db] = override_get_db
+        try:
+            client = TestClient(api_app)
+            results = {}
+            for encoder in encoders():
+                settings.JSON_ENCODER = encoder
+                url = f"/questions/{question.question_id}"
+                results[encoder] = time_requests(client, url, runs)
+        finally:
+            api_app.dependency_overrides.clear()
+            session.close()
+            engine.dispose()
+    return results
+
+
+def main() -> None:
+    # Measure rendering, not the question detail cache
+    settings.QUESTION_CACHE_BYTES = 0
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--html-kb", type=int, nargs="+", default=[50, 250, 1000])
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    columns = ["response_model", *encoders()]
+    print(f"{'html KB':>8} {'path':<14} " + " ".join(f"{c:>15}" for c in columns))
+    for kb in args.html_kb:
+        html = make_html(rng, kb * 1024)
+        serialization = bench_serialization(html, args.runs)
+        endpoint = bench_endpoint(html, args.runs)
+        print(
+            f"{kb:>8} {'serialize':<14} "
+            + " ".join(f"{serialization[c]:>12.2f} ms" for c in columns)
+        )
+        print(
+            f"{kb:>8} {'GET detail':<14} {'':>15} "
+            + " ".join(f"{endpoint[c]:>12.2f} ms" for c in encoders())
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Benchmark /questions/search query latency on a large question bank.
+
+Fills a throwaway SQLite database with synthetic questions, builds the
+full-text index, and times representative browser queries through
+QuestionRepository (first page plus total count, as the endpoint runs them).
+
+Usage:
+    python benchmarks/bench_search.py [--questions N] [--runs R]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from doughub2.models import Base, Question
+from doughub2.persistence import QuestionRepository
+from doughub2.search import make_snippet, parse_search_query
+
+# Vocabulary: clinical terms the queries use, padded with filler words.
+# Word frequencies follow a Zipf-like distribution, as in real text.
+TERMS = (
+    "patient presents acute chest pain dyspnea fever cough hypertension "
+    "diabetes tachycardia troponin anemia thyroid nodule renal failure "
+    "pneumonia sepsis murmur syncope stroke seizure headache rash arthritis "
+    "hepatitis cirrhosis pancreatitis lymphoma leukemia asthma copd embolism"
+).split()
+WORDS = TERMS + [f"word{i}" for i in range(20_000)]
+WEIGHTS = [1 / (rank + 10) for rank in range(len(WORDS))]
+TAGS = ["cardio", "pulm", "renal", "heme", "neuro", "gi", "endo", "id"]
+QUERIES = [
+    "chest",
+    '"chest pain"',
+    "deck:MKSAP troponin",
+    "tag:cardio murmur",
+    "front:anemia back:thyroid",
+    "pneum is:new",
+    "deck:UWorld",
+]
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choices(WORDS, WEIGHTS, k=words))
+
+
+def populate(session, questions: int, seed: int) -> None:
+    """Insert synthetic questions in bulk and index them."""
+    rng = random.Random(seed)
+    repo = QuestionRepository(session)
+    sources = [repo.get_or_create_source(name) for name in ("MKSAP", "UWorld")]
+    session.commit()
+
+    batch = []
+    for i in range(questions):
+        batch.append(
+            {
+                "source_id": sources[i % 2].source_id,
+                "source_question_key": f"q{i}",
+                "raw_html": f"<html><body><p>{_text(rng, 200)}</p></body></html>",
+                "raw_metadata_json": json.dumps({"bodyText": _text(rng, 60)}),
+                "tags": json.dumps(rng.sample(TAGS, 2)),
+                "status": "extracted",
+            }
+        )
+        if len(batch) == 5000:
+            session.execute(insert(Question), batch)
+            batch = []
+    if batch:
+        session.execute(insert(Question), batch)
+    session.commit()
+    repo.rebuild_search_index(batch_size=2000)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+
+        start = time.perf_counter()
+        populate(session, args.questions, args.seed)
+        print(
+            f"Indexed {args.questions} questions in "
+            f"{time.perf_counter() - start:.1f}s\n"
+            f"{'query':<28} {'matches':>8} {'p50 ms':>8} {'p95 ms':>8}"
+        )
+
+        repo = QuestionRepository(session)
+        for text_query in QUERIES:
+            query = parse_search_query(text_query)
+            latencies = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                for hit in repo.search_questions(query, limit=51):
+                    make_snippet(hit, query)
+                total = repo.count_search_results(query)
+                latencies.append((time.perf_counter() - start) * 1000)
+            print(
+                f"{text_query:<28} {total:>8} "
+                f"{statistics.median(latencies):>8.1f} "
+                f"{statistics.quantiles(latencies, n=20)[-1]:>8.1f}"
+            )
+
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Benchmark concurrent reads and writes under each SQLite profile.
+
+Seeds a throwaway database with questions, then for a fixed duration runs
+writer threads (each upserting a question per transaction, like /extract)
+alongside reader threads (each loading a random question with its content,
+like GET /questions/{id}). Reports throughput, tail latency and
+"database is locked" errors for the "default" profile (rollback journal)
+and the "production" profile (WAL and tuned pragmas).
+
+Usage:
+    python benchmarks/bench_sqlite.py [--questions N] [--readers N]
+        [--writers N] [--seconds S]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from doughub2.database import SQLITE_PROFILES, create_db_engine
+from doughub2.models import Base
+from doughub2.persistence import QuestionRepository
+
+WORDS = (
+    "patient presents with acute chest pain dyspnea fever history of "
+    "hypertension diabetes examination reveals tachycardia laboratory"
+).split()
+
+
+def make_question(rng: random.Random, source_id: int, key: str) -> dict:
+    """Build add_question input with about 20 KB of HTML."""
+    text = " ".join(rng.choice(WORDS) for _ in range(2500))
+    return {
+        "source_id": source_id,
+        "source_question_key": key,
+        "raw_html": f"<html><body><p>{text}</p></body></html>",
+        "raw_metadata_json": json.dumps({"bodyText": text[:300]}),
+    }
+
+
+class Worker(threading.Thread):
+    """Repeats an operation until stopped, recording latencies and errors."""
+
+    def __init__(self, operation, stop: threading.Event) -> None:
+        super().__init__(daemon=True)
+        self.operation = operation
+        self.stop = stop
+        self.latencies: list[float] = []
+        self.errors = 0
+
+    def run(self) -> None:
+        while not self.stop.is_set():
+            start = time.perf_counter()
+            try:
+                self.operation()
+            except OperationalError:
+                self.errors += 1
+                continue
+            self.latencies.append((time.perf_counter() - start) * 1000)
+
+
+def bench_profile(profile: str, args: argparse.Namespace) -> dict[str, dict]:
+    """Run the mixed workload against a fresh database with a profile."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", profile)
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        rng = random.Random(1)
+
+        with Session() as session:
+            repo = QuestionRepository(session)
+            source_id = repo.get_or_create_source("Bench").source_id
+            for i in range(args.questions):
+                repo.add_question(make_question(rng, source_id, f"q{i}"))
+            repo.commit()
+
+        def read() -> None:
+            with Session() as session:
+                question_id = random.randint(1, args.questions)
+                QuestionRepository(session).get_question_by_id(
+                    question_id, include_content=True
+                ).raw_html
+
+        counter = iter(range(10**9))
+        payloads = [make_question(rng, source_id, "") for _ in range(20)]
+
+        def write() -> None:
+            data = {
+                **random.choice(payloads),
+                "source_question_key": f"w{next(counter)}",
+            }
+            with Session() as session:
+                repo = QuestionRepository(session)
+                try:
+                    repo.add_question(data)
+                    repo.commit()
+                except OperationalError:
+                    repo.rollback()
+                    raise
+
+        stop = threading.Event()
+        readers = [Worker(read, stop) for _ in range(args.readers)]
+        writers = [Worker(write, stop) for _ in range(args.writers)]
+        for worker in readers + writers:
+            worker.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for worker in readers + writers:
+            worker.join()
+        engine.dispose()
+
+    results = {}
+    for kind, workers in (("reads", readers), ("writes", writers)):
+        latencies = sorted(l for w in workers for l in w.latencies)
+        results[kind] = {
+            "per_sec": len(latencies) / args.seconds,
+            "p50": statistics.median(latencies) if latencies else float("nan"),
+            "p99": (
+                latencies[int(len(latencies) * 0.99)] if latencies else float("nan")
+            ),
+            "errors": sum(w.errors for w in workers),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=500)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(
+        f"{'profile':<11} {'op':<7} {'ops/s':>9} {'p50 ms':>9} {'p99 ms':>9} "
+        f"{'locked':>7}"
+    )
+    for profile in SQLITE_PROFILES:
+        for kind, r in bench_profile(profile, args).items():
+            print(
+                f"{profile:<11} {kind:<7} {r['per_sec']:>9.1f} {r['p50']:>9.2f} "
+                f"{r['p99']:>9.2f} {r['errors']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
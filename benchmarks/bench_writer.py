@@ -0,0 +1,116 @@
+"""Benchmark concurrent ingest with per-caller commits versus group commit.
+
+Bursts of concurrent callers each persist questions one at a time into a
+throwaway SQLite database, the way /extract workers do:
+
+- own-session: each caller opens a session and commits every question
+  itself (how persist_to_database worked before the writer)
+- group-commit: each caller submits the question to a GroupCommitWriter
+  and waits for its future
+
+Reports questions per second per burst size (number of concurrent
+callers) and SQLite profile.
+
+Usage:
+    python benchmarks/bench_writer.py [--questions N] [--bursts 1,4,16,64]
+        [--max-delay SECONDS]
+"""
+
+import argparse
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from doughub2.config import settings
+from doughub2.database import SQLITE_PROFILES, create_db_engine
+from doughub2.models import Base
+from doughub2.persistence import QuestionRepository
+from doughub2.writer import GroupCommitWriter
+
+HTML = "<html><body>" + "<p>patient presents with chest pain</p>" * 100 + "</body>"
+
+
+def question(source_id: int, key: str) -> dict:
+    """Build add_question input with about 4 KB of HTML."""
+    return {
+        "source_id": source_id,
+        "source_question_key": key,
+        "raw_html": HTML,
+        "raw_metadata_json": json.dumps({"bodyText": key}),
+    }
+
+
+def bench(
+    profile: str, mode: str, callers: int, questions: int, max_delay: float
+) -> float:
+    """Persist questions from concurrent callers; return questions/s."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(
+            f"sqlite:///{Path(tmp) / 'bench.db'}",
+            profile,
+            pool_size=callers + 1,
+            connect_args={"timeout": 60},
+        )
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        with Session() as session:
+            repo = QuestionRepository(session)
+            source_id = repo.get_or_create_source("Bench").source_id
+            repo.commit()
+        writer = GroupCommitWriter(Session, max_delay=max_delay)
+        per_caller = questions // callers
+
+        def call(caller: int) -> None:
+            for i in range(per_caller):
+                data = question(source_id, f"c{caller}-{i}")
+                if mode == "group-commit":
+                    writer.submit(
+                        lambda s, data=data: QuestionRepository(s).add_question(data)
+                    ).result()
+                    continue
+                while True:
+                    with Session() as session:
+                        try:
+                            QuestionRepository(session).add_question(data)
+                            session.commit()
+                            break
+                        except OperationalError:
+                            # Lock wait timed out; retry like a client would
+                            session.rollback()
+
+        threads = [threading.Thread(target=call, args=(c,)) for c in range(callers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        writer.shutdown()
+        engine.dispose()
+    return per_caller * callers / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=2000)
+    parser.add_argument("--bursts", default="1,4,16,64")
+    parser.add_argument("--max-delay", type=float, default=settings.WRITER_MAX_DELAY)
+    args = parser.parse_args()
+    bursts = [int(b) for b in args.bursts.split(",")]
+
+    print(f"{'profile':<11} {'mode':<13}" + "".join(f" {b:>8}" for b in bursts))
+    for profile in SQLITE_PROFILES:
+        for mode in ("own-session", "group-commit"):
+            rates = [
+                bench(profile, mode, b, args.questions, args.max_delay) for b in bursts
+            ]
+            print(f"{profile:<11} {mode:<13}" + "".join(f" {r:>8.0f}" for r in rates))
+
+
+if __name__ == "__main__":
+    main()
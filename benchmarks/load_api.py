@@ -0,0 +1,202 @@
+"""Load test the question endpoints with sync versus async database access.
+
+Serves a throwaway question bank with uvicorn and drives it with many
+concurrent clients issuing a mix of full-text searches (slow: tens of ms of
+SQLite work each) and question detail requests (fast). Two servers are
+compared:
+
+- sync: the endpoints as they were, async handlers querying through a
+  sync Session, so each query blocks the event loop and every other
+  request waits for it
+- async: the real application, querying through AsyncQuestionRepository
+  on aiosqlite, which runs each query on a worker thread
+
+Both read a WAL database, where readers never wait for a writer, so the
+queries are CPU-bound. On a single core the async server is slower (one
+CPU, 20k questions, 32 clients, 10% searches: sync 138 req/s, async 120
+req/s, detail p95 364 versus 537 ms): the worker threads cannot overlap
+SQLite work with the event loop, and every query pays for the hand-off.
+The benchmark measures that cost; it does not show a throughput gain for
+the async routers.
+
+The question detail cache is disabled so every request reaches the
+database.
+
+Usage:
+    python benchmarks/load_api.py [--questions N] [--clients C]
+        [--seconds S] [--search-ratio R]
+"""
+
+import argparse
+import asyncio
+import random
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import uvicorn
+from bench_search import populate
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy.orm import Session, sessionmaker
+
+from doughub2.api.conditional import make_etag, validator_headers
+from doughub2.api.questions import question_detail
+from doughub2.config import settings
+from doughub2.database import create_db_engine
+from doughub2.main import api_app
+from doughub2.models import Base
+from doughub2.persistence import QuestionRepository
+from doughub2.responses import model_response
+from doughub2.schemas import QuestionSearchResponse, QuestionSearchResult
+from doughub2.search import make_snippet, parse_search_query
+
+SEARCHES = ["chest", '"chest pain"', "tag:cardio murmur", "anemia"]
+
+
+def make_sync_app(Session_: sessionmaker) -> FastAPI:
+    """Build the search and detail endpoints on a blocking sync session."""
+    app = FastAPI()
+
+    def get_db():
+        with Session_() as session:
+            yield session
+
+    @app.get("/questions/search")
+    async def search(q: str, limit: int = 50, db: Session = Depends(get_db)):
+        query = parse_search_query(q)
+        repo = QuestionRepository(db)
+        hits = repo.search_questions(query, limit)
+        results = [
+            QuestionSearchResult(
+                question_id=hit.question_id,
+                source_name=hit.source_name,
+                source_question_key=hit.source_question_key,
+                snippet=make_snippet(hit, query),
+                score=hit.score,
+            )
+            for hit in hits
+        ]
+        total = repo.count_search_results(query)
+        return model_response(QuestionSearchResponse(results=results, total=total))
+
+    @app.get("/questions/{question_id}")
+    async def detail(question_id: int, db: Session = Depends(get_db)):
+        repo = QuestionRepository(db)
+        if repo.get_question_version(question_id) is None:
+            raise HTTPException(status_code=404)
+        question = repo.get_question_by_id(
+            question_id, include_content=True, include_media=True, include_source=True
+        )
+        headers = validator_headers(
+            make_etag("question", question_id, question.version),
+            question.updated_at,
+        )
+        return model_response(question_detail(question), headers=headers)
+
+    return app
+
+
+def serve(app: FastAPI) -> tuple[uvicorn.Server, threading.Thread, int]:
+    """Start uvicorn on a free local port in a background thread."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread, port
+
+
+async def drive(port: int, args: argparse.Namespace) -> dict[str, list[float]]:
+    """Issue requests from many clients for a fixed time; collect latencies."""
+    latencies: dict[str, list[float]] = {"search": [], "detail": []}
+    deadline = time.perf_counter() + args.seconds
+    limits = httpx.Limits(max_connections=args.clients)
+
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60
+    ) as client:
+
+        async def worker(rng: random.Random) -> None:
+            while time.perf_counter() < deadline:
+                if rng.random() < args.search_ratio:
+                    kind = "search"
+                    url, params = "/questions/search", {"q": rng.choice(SEARCHES)}
+                else:
+                    kind = "detail"
+                    url = f"/questions/{rng.randint(1, args.questions)}"
+                    params = None
+                start = time.perf_counter()
+                response = await client.get(url, params=params)
+                response.raise_for_status()
+                latencies[kind].append((time.perf_counter() - start) * 1000)
+
+        await asyncio.gather(*(worker(random.Random(i)) for i in range(args.clients)))
+    return latencies
+
+
+def report(mode: str, latencies: dict[str, list[float]], seconds: float) -> None:
+    total = sum(len(values) for values in latencies.values())
+    line = f"{mode:<6} {total / seconds:>9.1f}"
+    for kind in ("detail", "search"):
+        values = latencies[kind]
+        if len(values) < 2:
+            line += f" {'-':>11} {'-':>11}"
+            continue
+        p95 = statistics.quantiles(values, n=20)[-1]
+        line += f" {statistics.median(values):>11.1f} {p95:>11.1f}"
+    print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=50_000)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--search-ratio", type=float, default=0.1)
+    args = parser.parse_args()
+    settings.QUESTION_CACHE_BYTES = 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'load.db'}"
+        # The application's engines are created lazily from DATABASE_URL
+        settings.DATABASE_URL = url
+        engine = create_db_engine(url, "production")
+        Base.metadata.create_all(engine)
+        with sessionmaker(bind=engine)() as session:
+            populate(session, args.questions, seed=1)
+
+        print(
+            f"{'mode':<6} {'req/s':>9} {'detail p50':>11} {'detail p95':>11} "
+            f"{'search p50':>11} {'search p95':>11}  (ms)"
+        )
+
+        # Pool a connection per client: with fewer, the blocked event loop
+        # cannot run the session teardowns that would return connections,
+        # and requests stall until the pool times out
+        sync_engine = create_db_engine(
+            url, "production", pool_size=args.clients, max_overflow=0
+        )
+        server, thread, port = serve(make_sync_app(sessionmaker(bind=sync_engine)))
+        report("sync", asyncio.run(drive(port, args)), args.seconds)
+        server.should_exit = True
+        thread.join()
+        sync_engine.dispose()
+
+        server, thread, port = serve(api_app)
+        report("async", asyncio.run(drive(port, args)), args.seconds)
+        server.should_exit = True
+        thread.join()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
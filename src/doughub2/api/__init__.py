@@ -5,6 +5,8 @@ This package contains the FastAPI routers for the application endpoints.
 """
 
 from doughub2.api.extractions import router as extractions_router
+from doughub2.api.logs import router as logs_router
+from doughub2.api.media import router as media_router
 from doughub2.api.questions import router as questions_router
 
-__all__ = ["questions_router", "extractions_router"]
+__all__ = ["questions_router", "extractions_router", "media_router", "logs_router"]
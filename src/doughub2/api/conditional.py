@@ -0,0 +1,97 @@
+"""
+Conditional request helpers for the API routers.
+
+Responses carry validators (ETag, Last-Modified) so clients can revalidate
+their cached copies; a request whose validators still match is answered with
+an empty 304 before any expensive work is done.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request
+
+# Clients may keep responses but must revalidate them on every use
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Content-addressed responses never change, so they may be reused for a year
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a strong ETag from the values identifying a representation.
+
+    Args:
+        *parts: Values that change whenever the response body does.
+
+    Returns:
+        Quoted entity tag.
+    """
+    key = "\x1f".join(
+        p.isoformat() if isinstance(p, datetime) else str(p) for p in parts
+    )
+    return '"' + hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest() + '"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive database timestamps (SQLite CURRENT_TIMESTAMP) as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: datetime | None = None
+) -> bool:
+    """Evaluate a request's conditional headers against the current version.
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted when
+    the request has no If-None-Match, as RFC 9110 requires.
+
+    Args:
+        request: The incoming request.
+        etag: Current ETag of the resource.
+        last_modified: Current modification time of the resource, if known.
+
+    Returns:
+        True if the client's copy is current and a 304 can be sent.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # If-None-Match uses the weak comparison, so ignore W/ prefixes
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    # HTTP dates have one-second resolution
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def validator_headers(
+    etag: str, last_modified: datetime | None = None
+) -> dict[str, str]:
+    """Build the validator and caching headers for a response.
+
+    Args:
+        etag: ETag of the resource.
+        last_modified: Modification time of the resource, if known.
+
+    Returns:
+        Header name to value mapping.
+    """
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
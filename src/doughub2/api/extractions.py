@@ -4,36 +4,52 @@ DougHub2 Extractions API Router.
 This module contains the endpoints for receiving and managing extractions.
 """
 
+import asyncio
+import functools
 import json
 import logging
 import re
-import shutil
 import urllib.parse
-import urllib.request
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from doughub2.config import settings
-from doughub2.database import get_db
-from doughub2.persistence import QuestionRepository
+from doughub2.database import get_db, get_session_local
+from doughub2.downloader import get_downloader
+from doughub2.executors import run_db, run_io
+from doughub2.history import ExtractionHistory
+from doughub2.jobs import Job, JobQueue, QueueFullError, create_ingest_queue
+from doughub2.known_questions import known_questions
+from doughub2.media_store import store_file
+from doughub2.persistence import QuestionRepository, compute_body_hash
+from doughub2.responses import FastJSONResponse, model_response
 from doughub2.schemas import (
+    BatchExtractionResponse,
+    BatchItemResult,
     DatabaseInfo,
+    ExtractionExistsResponse,
+    ExtractionJobResponse,
+    ExtractionJobStatus,
     ExtractionRequest,
     ExtractionResponse,
     FileInfo,
     ImageInfo,
 )
+from doughub2.writer import GroupCommitWriter, get_writer
 
 logger = logging.getLogger("doughub2")
 
-router = APIRouter(tags=["extractions"])
+router = APIRouter(tags=["extractions"], default_response_class=FastJSONResponse)
 
-# Store extractions for review (in-memory)
-extractions: list[dict[str, Any]] = []
+# Recent extractions for review: summaries in memory, payloads on disk
+extractions = ExtractionHistory(capacity=settings.EXTRACTION_HISTORY_SIZE)
 
 
 # =============================================================================
@@ -72,45 +88,54 @@ def parse_source_and_key(data: dict[str, Any], base_filename: str) -> tuple[str,
     return site_name, question_key
 
 
-def copy_image_to_media_root(
-    source_path: Path, source_name: str, question_key: str, img_index: int
-) -> str:
-    """Copy an image file to the media storage directory.
+def write_extraction_html(
+    output_dir: Path, base_filename: str, html_content: str
+) -> Path:
+    """Create the extraction directories and save the page HTML.
 
     Args:
-        source_path: Path to the source image file in extractions/
-        source_name: Name of the source
-        question_key: Question key
-        img_index: Index of the image
+        output_dir: Directory for this extraction's files
+        base_filename: Base filename for saving (without extension)
+        html_content: The page HTML to save
 
     Returns:
-        Relative path to the copied file
+        Path to the saved HTML file
     """
-    source_path = Path(source_path)
-    media_root = Path(settings.MEDIA_ROOT)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Ensure media root exists
+    Path(settings.MEDIA_ROOT).mkdir(parents=True, exist_ok=True)
+
+    html_file = output_dir / f"{base_filename}.html"
+    html_file.write_text(html_content, encoding="utf-8")
+    return html_file
 
-    # Create source-specific directory
-    source_dir = media_root / source_name
-    source_dir.mkdir(parents=True, exist_ok=True)
 
-    # Create destination filename
-    ext = source_path.suffix
-    dest_filename = f"{question_key}_img{img_index}{ext}"
-    dest_path = source_dir / dest_filename
+def write_extraction_json(
+    output_dir: Path, base_filename: str, json_data: dict[str, Any]
+) -> Path:
+    """Save the extraction metadata JSON.
 
-    # Copy file if source exists
-    if source_path.exists():
-        shutil.copy2(source_path, dest_path)
-        logger.info(f"Copied to media_root: {source_name}/{dest_filename}")
+    Args:
+        output_dir: Directory for this extraction's files
+        base_filename: Base filename for saving (without extension)
+        json_data: Metadata to save
 
-    # Return relative path
-    return f"{source_name}/{dest_filename}"
+    Returns:
+        Path to the saved JSON file
+    """
+    json_file = output_dir / f"{base_filename}.json"
+    json_file.write_text(json.dumps(json_data, indent=2), encoding="utf-8")
+    return json_file
 
 
 def download_images(
     images: list[ImageInfo], base_filename: str, output_dir: Path
 ) -> list[dict[str, Any]]:
-    """Download images from URLs and save locally.
+    """Download images from URLs concurrently and save locally.
+
+    Downloads run in parallel through the shared pooled downloader; this
+    call blocks until all of them have finished or failed.
 
     Args:
         images: List of ImageInfo objects with url, title, etc.
@@ -118,60 +143,70 @@ def download_images(
         output_dir: Directory to save images to
 
     Returns:
-        List of dictionaries with local paths and metadata
+        List of dictionaries with local paths and metadata, one per image
+        with a URL, in the original order. Failed downloads carry an
+        "error" key instead of "local_path".
     """
-    downloaded = []
+    pending: list[tuple[int, ImageInfo, str]] = []
+    jobs: list[tuple[str, Path]] = []
 
     for idx, img in enumerate(images):
-        try:
-            url = img.url
-            if not url:
-                continue
+        url = img.url
+        if not url:
+            continue
 
-            # Parse URL to get file extension
-            parsed = urllib.parse.urlparse(url)
-            path = parsed.path
-            ext = Path(path).suffix or ".jpg"  # Default to .jpg if no extension
+        # Parse URL to get file extension
+        parsed = urllib.parse.urlparse(url)
+        ext = Path(parsed.path).suffix or ".jpg"  # Default to .jpg if no extension
 
-            # Generate filename
-            img_filename = f"{base_filename}_img{idx}{ext}"
-            img_path = output_dir / img_filename
+        # Generate filename
+        img_filename = f"{base_filename}_img{idx}{ext}"
+        pending.append((idx, img, img_filename))
+        jobs.append((url, output_dir / img_filename))
 
-            # Download the image
-            logger.info(f"Downloading image {idx + 1}/{len(images)}: {url}")
-            urllib.request.urlretrieve(url, img_path)
+    logger.info("Downloading %d image(s)", len(jobs))
+    results = get_downloader().download_many(jobs)
 
+    downloaded = []
+    for (idx, img, img_filename), result in zip(pending, results):
+        if result.ok:
             downloaded.append(
                 {
                     "index": idx,
-                    "url": url,
-                    "local_path": str(img_path),
+                    "url": result.url,
+                    "local_path": str(result.path),
+                    "sha256": result.sha256,
                     "filename": img_filename,
                     "title": img.title or "",
                     "type": img.type or "image",
                 }
             )
+        else:
+            downloaded.append({"index": idx, "url": result.url, "error": result.error})
 
-            logger.info(f"Saved: {img_filename}")
+    return downloaded
 
-        except Exception as e:
-            logger.warning(f"Failed to download image {idx}: {e}")
-            downloaded.append(
-                {"index": idx, "url": img.url if img.url else "", "error": str(e)}
-            )
 
-    return downloaded
+@dataclass
+class PreparedExtraction:
+    """An extraction whose files have been saved, ready to be persisted."""
 
+    data: dict[str, Any]
+    html_file: Path
+    json_file: Path
+    downloaded_images: list[dict[str, Any]]
+    base_filename: str
 
-def persist_to_database(
+
+def _persist_extraction(
     data: dict[str, Any],
     html_file: Path,
     json_file: Path,
     downloaded_images: list[dict[str, Any]],
     base_filename: str,
     session: Session,
-) -> tuple[bool, str | None]:
-    """Persist the extraction to the database.
+) -> tuple[str, str, str | None] | None:
+    """Add an extraction to the current transaction without committing.
 
     Args:
         data: Extraction data dictionary
@@ -182,111 +217,219 @@ def persist_to_database(
         session: Database session
 
     Returns:
-        Tuple of (success: bool, error_message: str or None)
+        (source_name, question_key, body_hash) of the added question, or
+        None if it was already stored
+
+    Raises:
+        Exception: Any database or file error; the caller rolls back.
     """
-    try:
-        repo = QuestionRepository(session)
+    repo = QuestionRepository(session)
 
-        # Parse source name and question key
-        source_name, question_key = parse_source_and_key(data, base_filename)
+    # Parse source name and question key
+    source_name, question_key = parse_source_and_key(data, base_filename)
 
-        logger.info(f"Persisting: {source_name}/{question_key}")
+    logger.info("Persisting: %s/%s", source_name, question_key)
 
-        # Get or create source
-        source = repo.get_or_create_source(name=source_name)
-        source_id: int = source.source_id  # type: ignore
+    # Get or create source
+    source = repo.get_or_create_source(name=source_name)
+    source_id: int = source.source_id  # type: ignore
 
-        # Check for duplicates based on question content (bodyText)
-        body_text = data.get("bodyText")
-        if body_text:
-            existing_question_by_content = repo.get_question_by_body_text(
-                source_id, body_text
-            )
-            if existing_question_by_content:
-                logger.info(
-                    "Duplicate question content detected. Skipping persistence."
-                )
-                return True, None
+    # Check for duplicates based on question content (bodyText)
+    body_text = data.get("bodyText")
+    body_hash = compute_body_hash(body_text) if body_text else None
+    if body_hash:
+        existing_question_by_content = repo.get_question_by_body_hash(
+            source_id, body_hash
+        )
+        if existing_question_by_content:
+            logger.info("Duplicate question content detected. Skipping persistence.")
+            return None
+
+    # Check if question already exists by source key (idempotency for same URL)
+    existing_question = repo.get_question_by_source_key(source_id, question_key)
+    if existing_question:
+        logger.info(
+            "Question already exists in database: %s/%s", source_name, question_key
+        )
+        return None
+
+    # Read HTML content
+    html_content = html_file.read_text(encoding="utf-8")
+
+    # Prepare metadata JSON
+    with open(json_file, encoding="utf-8") as f:
+        metadata = json.load(f)
+
+    # Create question data
+    question_data = {
+        "source_id": source_id,
+        "source_question_key": question_key,
+        "raw_html": html_content,
+        "raw_metadata_json": json.dumps(metadata),
+        "status": "extracted",
+        "extraction_path": str(json_file.parent / json_file.stem),
+        "body_hash": body_hash,
+    }
 
-        # Check if question already exists by source key (idempotency for same URL)
-        existing_question = repo.get_question_by_source_key(source_id, question_key)
-        if existing_question:
-            logger.info(
-                f"Question already exists in database: {source_name}/{question_key}"
-            )
-            repo.commit()
-            return True, None
-
-        # Read HTML content
-        html_content = html_file.read_text(encoding="utf-8")
-
-        # Prepare metadata JSON
-        with open(json_file, encoding="utf-8") as f:
-            metadata = json.load(f)
-
-        # Create question data
-        question_data = {
-            "source_id": source_id,
-            "source_question_key": question_key,
-            "raw_html": html_content,
-            "raw_metadata_json": json.dumps(metadata),
-            "status": "extracted",
-            "extraction_path": str(json_file.parent / json_file.stem),
+    # Add question to database
+    question = repo.add_question(question_data)
+    question_id: int = question.question_id  # type: ignore
+    logger.info("Added question to database (ID: %d)", question_id)
+
+    # Process and persist media files
+    for img_info in downloaded_images:
+        if "local_path" not in img_info:
+            continue
+
+        local_path = Path(img_info["local_path"])
+        if not local_path.exists():
+            logger.warning("Image file not found: %s", local_path)
+            continue
+
+        # Store the image once per distinct content under media_root
+        sha256, relative_path = store_file(
+            local_path, Path(settings.MEDIA_ROOT), img_info.get("sha256")
+        )
+
+        # Determine MIME type from extension
+        ext = local_path.suffix.lower()
+        mime_types = {
+            ".jpg": "image/jpeg",
+            ".jpeg": "image/jpeg",
+            ".png": "image/png",
+            ".gif": "image/gif",
+            ".webp": "image/webp",
+        }
+        mime_type = mime_types.get(ext, "application/octet-stream")
+
+        # Add media record
+        media_data = {
+            "media_role": "image",
+            "media_type": "question_image",
+            "mime_type": mime_type,
+            "relative_path": relative_path,
+            "sha256": sha256,
         }
+        media = repo.add_media_to_question(question_id, media_data)
+        media_id: int = media.media_id  # type: ignore
+        logger.info("Added media (ID: %d): %s", media_id, relative_path)
 
-        # Add question to database
-        question = repo.add_question(question_data)
-        question_id: int = question.question_id  # type: ignore
-        logger.info(f"Added question to database (ID: {question_id})")
+    return source_name, question_key, body_hash
 
-        # Process and persist media files
-        for img_info in downloaded_images:
-            if "local_path" not in img_info:
-                continue
 
-            local_path = Path(img_info["local_path"])
-            if not local_path.exists():
-                logger.warning(f"Image file not found: {local_path}")
-                continue
+def persist_to_database(
+    data: dict[str, Any],
+    html_file: Path,
+    json_file: Path,
+    downloaded_images: list[dict[str, Any]],
+    base_filename: str,
+    writer: GroupCommitWriter,
+) -> tuple[bool, str | None]:
+    """Persist the extraction to the database.
 
-            # Copy image to media_root
-            relative_path = copy_image_to_media_root(
-                local_path, source_name, question_key, img_info["index"]
-            )
+    The extraction is handed to the group-commit writer, which commits it
+    together with any other extractions submitted at the same time; this
+    call blocks until that transaction has committed.
 
-            # Determine MIME type from extension
-            ext = local_path.suffix.lower()
-            mime_types = {
-                ".jpg": "image/jpeg",
-                ".jpeg": "image/jpeg",
-                ".png": "image/png",
-                ".gif": "image/gif",
-                ".webp": "image/webp",
-            }
-            mime_type = mime_types.get(ext, "application/octet-stream")
-
-            # Add media record
-            media_data = {
-                "media_role": "image",
-                "media_type": "question_image",
-                "mime_type": mime_type,
-                "relative_path": relative_path,
-            }
-            media = repo.add_media_to_question(question_id, media_data)
-            media_id: int = media.media_id  # type: ignore
-            logger.info(f"Added media (ID: {media_id}): {relative_path}")
+    Args:
+        data: Extraction data dictionary
+        html_file: Path to saved HTML file
+        json_file: Path to saved JSON file
+        downloaded_images: List of downloaded image metadata
+        base_filename: Base filename for the extraction
+        writer: Group-commit writer to persist through
+
+    Returns:
+        Tuple of (success: bool, error_message: str or None)
+    """
+    future = writer.submit(
+        functools.partial(
+            _persist_extraction,
+            data,
+            html_file,
+            json_file,
+            downloaded_images,
+            base_filename,
+        )
+    )
+    try:
+        added = future.result()
+    except Exception as e:
+        error_msg = f"Database persistence failed: {e}"
+        logger.error(error_msg)
+        return False, error_msg
+
+    if added:
+        known_questions.add(*added)
+    logger.info("Successfully persisted to database")
+    return True, None
+
+
+def _persist_group(
+    items: list[PreparedExtraction], session: Session
+) -> list[tuple[str, str, str | None] | None]:
+    """Add several prepared extractions to the current transaction."""
+    return [
+        _persist_extraction(
+            item.data,
+            item.html_file,
+            item.json_file,
+            item.downloaded_images,
+            item.base_filename,
+            session,
+        )
+        for item in items
+    ]
 
-        # Commit the transaction
-        repo.commit()
-        logger.info("Successfully persisted to database")
-        return True, None
 
+async def _persist_alone(
+    item: PreparedExtraction, writer: GroupCommitWriter
+) -> tuple[bool, str | None]:
+    """Persist one prepared extraction as its own unit of work."""
+    future = writer.submit(functools.partial(_persist_group, [item]))
+    try:
+        (added,) = await asyncio.wrap_future(future)
     except Exception as e:
-        session.rollback()
         error_msg = f"Database persistence failed: {e}"
         logger.error(error_msg)
         return False, error_msg
 
+    if added:
+        known_questions.add(*added)
+    return True, None
+
+
+async def persist_extraction_group(
+    items: list[PreparedExtraction], writer: GroupCommitWriter
+) -> list[tuple[bool, str | None]]:
+    """Persist several prepared extractions in a single transaction.
+
+    The group is submitted to the group-commit writer as one unit of work.
+    If any item fails, the group is rolled back and each item is submitted
+    as a unit of its own instead, so one bad record cannot take down the
+    rest of the group.
+
+    Args:
+        items: Extractions whose files have already been saved
+        writer: Group-commit writer to persist through
+
+    Returns:
+        One (success, error_message) tuple per item, in order
+    """
+    future = writer.submit(functools.partial(_persist_group, items))
+    try:
+        added = await asyncio.wrap_future(future)
+    except Exception as e:
+        logger.warning("Group persistence failed, retrying individually: %s", e)
+        return list(
+            await asyncio.gather(*(_persist_alone(item, writer) for item in items))
+        )
+
+    for question in filter(None, added):
+        known_questions.add(*question)
+    logger.info("Persisted %d extraction(s) in one transaction", len(items))
+    return [(True, None)] * len(items)
+
 
 def sanitize_source_name(name: str) -> str:
     """Sanitize source name to create a valid directory name.
@@ -326,137 +469,507 @@ def parse_timestamp_for_path(timestamp_str: str | None) -> tuple[str, str]:
     return str(now.year), f"{now.month:02d}"
 
 
+def prepare_extraction(
+    request: ExtractionRequest, on_stage: Callable[[str], None] | None = None
+) -> PreparedExtraction:
+    """Save an extraction's HTML, images and metadata JSON to disk.
+
+    Files are organized into: extractions/<Source>/<Year>/<Month>/
+
+    Args:
+        request: The extraction request containing page data.
+        on_stage: Optional callback receiving the name of each stage.
+
+    Returns:
+        PreparedExtraction describing the saved files.
+    """
+
+    def set_stage(stage: str) -> None:
+        if on_stage is not None:
+            on_stage(stage)
+
+    data = request.model_dump()
+
+    # Parse source name and sanitize for directory creation
+    site_name_raw = data.get("siteName") or "unknown"
+    site_name = sanitize_source_name(site_name_raw)
+
+    # Parse timestamp from payload for year/month directory structure
+    timestamp_str = data.get("timestamp")
+    year, month = parse_timestamp_for_path(timestamp_str)
+
+    # Organized output directory: extractions/<Source>/<Year>/<Month>/
+    output_dir = settings.EXTRACTION_DIR / site_name / year / month
+
+    # Generate filename based on timestamp; microseconds keep concurrent
+    # extractions from overwriting each other's files
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S%f")
+    base_filename = f"{timestamp}"
+
+    # Save HTML to file
+    set_stage("saving_html")
+    html_content = data.get("pageHTML") or ""
+    html_file = write_extraction_html(output_dir, base_filename, html_content)
+
+    # Download images if present
+    downloaded_images: list[dict[str, Any]] = []
+    images = request.images or []
+    if images:
+        set_stage("downloading_images")
+        logger.info("Downloading %d image(s)...", len(images))
+        downloaded_images = download_images(images, base_filename, output_dir)
+
+    # Save JSON metadata (without the full HTML to keep it readable)
+    set_stage("saving_json")
+    json_data = {
+        "timestamp": data.get("timestamp"),
+        "url": data.get("url"),
+        "hostname": data.get("hostname"),
+        "siteName": data.get("siteName"),
+        "elementCount": data.get("elementCount"),
+        "imageCount": data.get("imageCount", 0),
+        "bodyText": data.get("bodyText"),
+        "elements": data.get("elements", []),
+        "images": downloaded_images,
+    }
+    json_file = write_extraction_json(output_dir, base_filename, json_data)
+
+    # Log extraction info
+    logger.info(
+        "Extraction received from %s (%s): %s element(s), %s image(s); "
+        "saved %s and %s",
+        data.get("siteName", "unknown"),
+        data.get("url", "unknown"),
+        data.get("elementCount", 0),
+        data.get("imageCount", 0),
+        html_file,
+        json_file,
+    )
+
+    return PreparedExtraction(
+        data=data,
+        html_file=html_file,
+        json_file=json_file,
+        downloaded_images=downloaded_images,
+        base_filename=base_filename,
+    )
+
+
+def build_extraction_response(
+    prepared: PreparedExtraction,
+    extraction_count: int,
+    db_success: bool,
+    db_error: str | None,
+) -> ExtractionResponse:
+    """Build the API response for a processed extraction."""
+    return ExtractionResponse(
+        status="success",
+        message="Data received successfully",
+        extraction_count=extraction_count,
+        files=FileInfo(
+            html=str(prepared.html_file),
+            json_file=str(prepared.json_file),
+            images=[
+                img.get("local_path", "")
+                for img in prepared.downloaded_images
+                if "local_path" in img
+            ],
+        ),
+        database=DatabaseInfo(
+            persisted=db_success,
+            error=db_error if not db_success else None,
+        ),
+    )
+
+
+def run_extraction(
+    request: ExtractionRequest,
+    writer: GroupCommitWriter,
+    job: Job | None = None,
+) -> ExtractionResponse:
+    """Save, download and persist a single extraction.
+
+    Args:
+        request: The extraction request containing page data.
+        writer: Group-commit writer to persist with.
+        job: The background job running this extraction, if any; its stage
+            is updated as the pipeline progresses.
+
+    Returns:
+        ExtractionResponse with status and file information.
+    """
+
+    def set_stage(stage: str) -> None:
+        if job is not None:
+            job.stage = stage
+
+    prepared = prepare_extraction(request, set_stage)
+
+    # Store the extraction
+    extractions.append(prepared.data, prepared.html_file, prepared.json_file)
+
+    # Persist to database
+    set_stage("persisting")
+    db_success, db_error = persist_to_database(
+        prepared.data,
+        prepared.html_file,
+        prepared.json_file,
+        prepared.downloaded_images,
+        prepared.base_filename,
+        writer,
+    )
+    set_stage("done")
+
+    return build_extraction_response(
+        prepared, extractions.received, db_success, db_error
+    )
+
+
+# =============================================================================
+# Ingest Queue
+# =============================================================================
+
+
+@dataclass
+class ExtractionWork:
+    """Input for a background extraction job."""
+
+    request: ExtractionRequest
+    writer: GroupCommitWriter
+
+
+def process_extraction_job(job: Job) -> ExtractionResponse:
+    """Run a queued extraction, persisting it through the writer."""
+    work: ExtractionWork = job.payload
+    return run_extraction(work.request, work.writer, job)
+
+
+# Ingest queue (lazy initialization)
+_ingest_queue: JobQueue | None = None
+
+
+def get_ingest_queue() -> JobQueue:
+    """Get or create the queue that processes submitted extractions."""
+    global _ingest_queue
+    if _ingest_queue is None:
+        _ingest_queue = create_ingest_queue(process_extraction_job)
+    return _ingest_queue
+
+
+def shutdown_ingest_queue() -> None:
+    """Finish queued extractions and stop the ingest workers."""
+    global _ingest_queue
+    if _ingest_queue is not None:
+        _ingest_queue.shutdown()
+        _ingest_queue = None
+
+
+def warm_known_questions() -> None:
+    """Load the known question index from the database.
+
+    Called at startup so the first /extract/exists request does not pay for
+    the warm-up query.
+    """
+    session = get_session_local()()
+    try:
+        known_questions.ensure_warm(session)
+    finally:
+        session.close()
+
+
+# =============================================================================
+# Batch Ingest
+# =============================================================================
+
+
+async def iter_ndjson_lines(request: Request) -> AsyncIterator[tuple[int, bytes]]:
+    """Yield the non-blank lines of an NDJSON request body as they arrive.
+
+    Args:
+        request: The incoming request whose body is NDJSON.
+
+    Yields:
+        Tuples of (1-based line number, raw line bytes).
+
+    Raises:
+        HTTPException: 413 if a single record exceeds BATCH_MAX_RECORD_BYTES.
+    """
+    pending: list[bytes] = []
+    pending_size = 0
+    line_number = 0
+    async for chunk in request.stream():
+        *complete, rest = chunk.split(b"\n")
+        for part in complete:
+            line = b"".join(pending) + part
+            pending, pending_size = [], 0
+            line_number += 1
+            if len(line) > settings.BATCH_MAX_RECORD_BYTES:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Record on line {line_number} is too large",
+                )
+            if line.strip():
+                yield line_number, line
+        pending.append(rest)
+        pending_size += len(rest)
+        if pending_size > settings.BATCH_MAX_RECORD_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Record on line {line_number + 1} is too large",
+            )
+    tail = b"".join(pending)
+    if tail.strip():
+        yield line_number + 1, tail
+
+
+async def ingest_batch_group(
+    group: list[tuple[int, ExtractionRequest]], writer: GroupCommitWriter
+) -> list[BatchItemResult]:
+    """Save files for a group of records, then persist them in one transaction.
+
+    Args:
+        group: Tuples of (line number, validated request).
+        writer: Group-commit writer to persist through.
+
+    Returns:
+        One BatchItemResult per record, in order.
+    """
+    prepared = await asyncio.gather(
+        *(run_io(prepare_extraction, item) for _, item in group),
+        return_exceptions=True,
+    )
+
+    results: dict[int, BatchItemResult] = {}
+    to_persist: list[tuple[int, ExtractionRequest, PreparedExtraction]] = []
+    for (line, item), outcome in zip(group, prepared):
+        if isinstance(outcome, BaseException):
+            results[line] = BatchItemResult(
+                line=line, url=item.url, status="error", error=str(outcome)
+            )
+        else:
+            to_persist.append((line, item, outcome))
+
+    if to_persist:
+        outcomes = await persist_extraction_group([p for _, _, p in to_persist], writer)
+        for (line, item, p), (db_success, db_error) in zip(to_persist, outcomes):
+            extractions.append(p.data, p.html_file, p.json_file)
+            results[line] = BatchItemResult(
+                line=line,
+                url=item.url,
+                status="success" if db_success else "error",
+                error=db_error,
+                result=build_extraction_response(
+                    p, extractions.received, db_success, db_error
+                ),
+            )
+
+    return [results[line] for line, _ in group]
+
+
 # =============================================================================
 # Endpoints
 # =============================================================================
 
 
-@router.post("/extract", response_model=ExtractionResponse)
+@router.post(
+    "/extract",
+    status_code=202,
+    response_model=ExtractionJobResponse,
+    responses={
+        200: {
+            "model": ExtractionResponse,
+            "description": "Extraction processed (only with wait=true)",
+        },
+        503: {"description": "Ingest queue is full; retry after Retry-After"},
+    },
+)
 async def extract(
-    request: ExtractionRequest, db: Session = Depends(get_db)
-) -> ExtractionResponse:
+    request: ExtractionRequest,
+    response: Response,
+    wait: bool = Query(
+        False, description="Wait for processing and return the ExtractionResponse"
+    ),
+    writer: GroupCommitWriter = Depends(get_writer),
+) -> ExtractionJobResponse | Response:
     """
-    Receive and persist extracted page data from Tampermonkey script.
+    Receive extracted page data from Tampermonkey script.
 
-    This endpoint receives HTML content and metadata from the browser extension,
-    saves the files locally, downloads any images, and persists everything
-    to the database.
-
-    Files are organized into: extractions/<Source>/<Year>/<Month>/
+    The payload is validated and queued, and the endpoint returns 202 with
+    a job ID straight away. Background workers save the HTML, download any
+    images and persist everything to the database; poll the job's
+    status_url for progress and the final ExtractionResponse.
 
     Args:
         request: The extraction request containing page data.
-        db: Database session (injected).
+        response: The outgoing response (used to set the Location header).
+        wait: If true, respond only once processing has finished.
+        writer: Group-commit writer the worker persists with (injected).
 
     Returns:
-        ExtractionResponse with status and file information.
+        ExtractionJobResponse with the job ID, or the ExtractionResponse
+        with status 200 when wait is true.
+
+    Raises:
+        HTTPException: 503 if the ingest queue is full, or 500 if processing
+            fails while waiting.
     """
+    queue = get_ingest_queue()
+    work = ExtractionWork(request=request, writer=writer)
     try:
-        data = request.model_dump()
-
-        # Store the extraction
-        extractions.append(data)
-        extraction_index = len(extractions) - 1
-
-        # Parse source name and sanitize for directory creation
-        site_name_raw = data.get("siteName") or "unknown"
-        site_name = sanitize_source_name(site_name_raw)
-
-        # Parse timestamp from payload for year/month directory structure
-        timestamp_str = data.get("timestamp")
-        year, month = parse_timestamp_for_path(timestamp_str)
-
-        # Extract question ID from URL (used for filename, not directory)
-        url = data.get("url", "")
-        parts = url.rstrip("/").split("/")
-        if parts and len(parts) > 0:
-            question_id = parts[-1]
-            # If it looks like a session ID (very long), use second-to-last
-            if not question_id or len(question_id) > 50:
-                question_id = parts[-2] if len(parts) > 1 else str(extraction_index)
-        else:
-            question_id = str(extraction_index)
-
-        # Create organized output directory: extractions/<Source>/<Year>/<Month>/
-        output_dir = settings.EXTRACTION_DIR / site_name / year / month
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        # Ensure media root exists
-        Path(settings.MEDIA_ROOT).mkdir(parents=True, exist_ok=True)
-
-        # Generate filename based on timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        base_filename = f"{timestamp}"
-
-        # Save HTML to file
-        html_file = output_dir / f"{base_filename}.html"
-        html_content = data.get("pageHTML") or ""
-        html_file.write_text(html_content, encoding="utf-8")
-
-        # Download images if present
-        downloaded_images: list[dict[str, Any]] = []
-        images = request.images or []
-        if images:
-            logger.info(f"Downloading {len(images)} image(s)...")
-            downloaded_images = download_images(images, base_filename, output_dir)
-
-        # Save JSON metadata (without the full HTML to keep it readable)
-        json_data = {
-            "timestamp": data.get("timestamp"),
-            "url": data.get("url"),
-            "hostname": data.get("hostname"),
-            "siteName": data.get("siteName"),
-            "elementCount": data.get("elementCount"),
-            "imageCount": data.get("imageCount", 0),
-            "bodyText": data.get("bodyText"),
-            "elements": data.get("elements", []),
-            "images": downloaded_images,
-        }
-        json_file = output_dir / f"{base_filename}.json"
-        json_file.write_text(json.dumps(json_data, indent=2), encoding="utf-8")
-
-        # Log extraction info
-        logger.info(f"Extraction received from {data.get('siteName', 'unknown')}")
-        logger.info(f"URL: {data.get('url', 'unknown')}")
-        logger.info(f"Elements: {data.get('elementCount', 0)}")
-        logger.info(f"Images: {data.get('imageCount', 0)}")
-        logger.info(f"HTML saved: {html_file}")
-        logger.info(f"JSON saved: {json_file}")
-
-        # Persist to database
-        db_success, db_error = persist_to_database(
-            data, html_file, json_file, downloaded_images, base_filename, db
+        job = queue.submit(work)
+    except QueueFullError as e:
+        logger.warning("Rejecting extraction: %s", e)
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(settings.INGEST_RETRY_AFTER)},
         )
 
-        return ExtractionResponse(
-            status="success",
-            message="Data received successfully",
-            extraction_count=len(extractions),
-            files=FileInfo(
-                html=str(html_file),
-                json_file=str(json_file),
-                images=[
-                    img.get("local_path", "")
-                    for img in downloaded_images
-                    if "local_path" in img
-                ],
-            ),
-            database=DatabaseInfo(
-                persisted=db_success,
-                error=db_error if not db_success else None,
-            ),
-        )
+    if wait:
+        try:
+            result = await asyncio.wrap_future(job.future)
+        except Exception as e:
+            logger.error("Error receiving extraction: %s", e)
+            raise HTTPException(status_code=500, detail=str(e))
+        return model_response(result)
+
+    status_url = f"/extract/jobs/{job.job_id}"
+    response.headers["Location"] = status_url
+    return ExtractionJobResponse(
+        job_id=job.job_id,
+        status=job.status,
+        status_url=status_url,
+        queue_depth=queue.depth,
+    )
+
+
+@router.get("/extract/jobs/{job_id}", response_model=ExtractionJobStatus)
+async def get_extraction_job(job_id: str) -> ExtractionJobStatus:
+    """
+    Report the progress of a queued extraction.
 
-    except Exception as e:
-        logger.error(f"Error receiving extraction: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    Args:
+        job_id: ID returned by POST /extract.
+
+    Returns:
+        ExtractionJobStatus including the ExtractionResponse once finished.
+
+    Raises:
+        HTTPException: 404 if the job is unknown or no longer remembered.
+    """
+    job = get_ingest_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return ExtractionJobStatus(
+        job_id=job.job_id,
+        status=job.status,
+        stage=job.stage,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        error=job.error,
+        result=job.result,
+    )
+
+
+@router.get("/extract/exists", response_model=ExtractionExistsResponse)
+async def extraction_exists(
+    url: str,
+    site_name: str = Query(..., alias="siteName"),
+    body_hash: str | None = None,
+    db: Session = Depends(get_db),
+) -> ExtractionExistsResponse:
+    """
+    Check whether a question is already stored before uploading it.
+
+    Answered from the in-memory known question index, using the same rules
+    as persistence: the question key derived from the URL, or the hash of
+    the normalized body text (see compute_body_hash), within the source.
+
+    Args:
+        url: Page URL the question would be extracted from.
+        site_name: Site name as sent in the extraction payload.
+        body_hash: Optional SHA-256 of the normalized body text.
+        db: Database session, used only to warm the index on first use.
+
+    Returns:
+        ExtractionExistsResponse saying whether and how the question matched.
+    """
+    if not known_questions.warmed:
+        await run_db(known_questions.ensure_warm, db)
+
+    source_name, question_key = parse_source_and_key(
+        {"url": url, "siteName": site_name}, ""
+    )
+    matched_by = known_questions.match(source_name, question_key, body_hash)
+    return ExtractionExistsResponse(
+        exists=matched_by is not None, matched_by=matched_by
+    )
+
+
+@router.post("/extract/batch", response_model=BatchExtractionResponse)
+async def extract_batch(
+    request: Request, writer: GroupCommitWriter = Depends(get_writer)
+) -> BatchExtractionResponse:
+    """
+    Ingest many extractions from a streamed NDJSON body.
+
+    Each line of the body is one ExtractionRequest object. Lines are parsed
+    as they arrive and persisted in groups of BATCH_GROUP_SIZE records per
+    transaction, so re-scraping a whole question set costs one request
+    instead of one per question. A record that fails validation or
+    persistence is reported without affecting the others.
+
+    Args:
+        request: The incoming request with an NDJSON body.
+        writer: Group-commit writer to persist through (injected).
+
+    Returns:
+        BatchExtractionResponse with one result per non-blank line.
+    """
+    results: list[BatchItemResult] = []
+    group: list[tuple[int, ExtractionRequest]] = []
+
+    async for line, raw in iter_ndjson_lines(request):
+        try:
+            item = ExtractionRequest.model_validate_json(raw)
+        except ValidationError as e:
+            results.append(
+                BatchItemResult(
+                    line=line,
+                    status="error",
+                    error=f"Invalid record: {e.errors(include_url=False)}",
+                )
+            )
+            continue
+
+        group.append((line, item))
+        if len(group) >= settings.BATCH_GROUP_SIZE:
+            results.extend(await ingest_batch_group(group, writer))
+            group = []
+
+    if group:
+        results.extend(await ingest_batch_group(group, writer))
+
+    results.sort(key=lambda r: r.line)
+    succeeded = sum(1 for r in results if r.status == "success")
+    logger.info("Batch extraction: %d/%d record(s) ingested", succeeded, len(results))
+
+    return BatchExtractionResponse(
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results,
+    )
 
 
 @router.get("/extractions")
-async def list_extractions() -> dict[str, Any]:
-    """List all received extractions."""
-    return {
-        "total": len(extractions),
+async def list_extractions() -> FastJSONResponse:
+    """List recently received extractions."""
+    summaries = extractions.summaries()
+    content = {
+        "total": len(summaries),
         "extractions": [
             {
                 "timestamp": ext.get("timestamp"),
@@ -464,17 +977,19 @@ async def list_extractions() -> dict[str, Any]:
                 "siteName": ext.get("siteName"),
                 "elementCount": ext.get("elementCount"),
             }
-            for ext in extractions
+            for ext in summaries
         ],
     }
+    return FastJSONResponse(content)
 
 
 @router.get("/extractions/{index}")
-async def get_extraction(index: int) -> dict[str, Any]:
-    """Get a specific extraction by index."""
-    if 0 <= index < len(extractions):
-        return extractions[index]
-    raise HTTPException(status_code=404, detail="Extraction not found")
+async def get_extraction(index: int) -> FastJSONResponse:
+    """Get a specific extraction by index, loading its payload from disk."""
+    data = await run_io(extractions.load, index)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Extraction not found")
+    return FastJSONResponse(data)
 
 
 @router.post("/clear")
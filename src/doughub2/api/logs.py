@@ -0,0 +1,82 @@
+"""
+DougHub2 Logs API Router.
+
+This module contains the endpoint for reading the application logs written
+to the logs table (see doughub2.log_sink).
+"""
+
+from datetime import datetime, timezone
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from doughub2.database import get_async_db
+from doughub2.persistence import AsyncLogRepository
+from doughub2.responses import FastJSONResponse, model_response
+from doughub2.schemas import LogEntry, LogListResponse
+
+router = APIRouter(tags=["logs"], default_response_class=FastJSONResponse)
+
+LogLevel = Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+
+
+@router.get("/logs", response_model=LogListResponse)
+async def list_logs(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = None,
+    level: LogLevel | None = Query(None, description="Minimum level"),
+    logger: str | None = Query(None, description="Only logs of this logger"),
+    since: datetime | None = Query(None, description="Only logs at or after"),
+    db: AsyncSession = Depends(get_async_db),
+) -> LogListResponse:
+    """
+    Retrieve recent application logs, newest first.
+
+    The filters are answered from the indexes on level, logger_name and
+    timestamp. Pass the next_cursor of one response as the cursor of the
+    next request, with the same filters, until next_cursor is null.
+
+    Args:
+        limit: Maximum number of logs per page.
+        cursor: next_cursor from the previous page; omit for the first page.
+        level: Only return logs of this level or a more severe one.
+        logger: Only return logs of this logger name.
+        since: Only return logs at or after this time; naive times are UTC.
+        db: Database session (injected).
+
+    Returns:
+        A page of logs with the cursor of the next page.
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid.
+    """
+    before_id = None
+    if cursor is not None:
+        try:
+            before_id = int(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from None
+    if since is not None and since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+
+    repo = AsyncLogRepository(db)
+    # Fetch one extra row to learn whether another page follows
+    logs = await repo.list_logs(
+        limit + 1, level=level, logger_name=logger, since=since, before_id=before_id
+    )
+    has_more = len(logs) > limit
+    logs = logs[:limit]
+
+    entries = [
+        LogEntry(
+            log_id=log.log_id,
+            level=log.level,
+            logger_name=log.logger_name,
+            message=log.message,
+            timestamp=log.timestamp,
+        )
+        for log in logs
+    ]
+    next_cursor = str(logs[-1].log_id) if has_more else None
+    return model_response(LogListResponse(logs=entries, next_cursor=next_cursor))
@@ -0,0 +1,100 @@
+"""
+DougHub2 Media API Router.
+
+This module contains the endpoint serving stored media files.
+"""
+
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from doughub2.api.conditional import (
+    IMMUTABLE_CACHE_CONTROL,
+    is_not_modified,
+    make_etag,
+    validator_headers,
+)
+from doughub2.config import settings
+from doughub2.database import get_async_db
+from doughub2.executors import run_io
+from doughub2.persistence import AsyncQuestionRepository
+
+router = APIRouter(tags=["media"])
+
+
+def resolve_media_path(relative_path: str) -> Path:
+    """Resolve a stored media path to a file under MEDIA_ROOT.
+
+    Args:
+        relative_path: Media.relative_path of the file.
+
+    Returns:
+        Absolute path of the file.
+
+    Raises:
+        HTTPException: 404 if the path points outside MEDIA_ROOT.
+    """
+    media_root = Path(settings.MEDIA_ROOT).resolve()
+    path = (media_root / relative_path).resolve()
+    if not path.is_relative_to(media_root):
+        raise HTTPException(status_code=404, detail="Media file not found")
+    return path
+
+
+@router.get("/media/{media_id}", response_class=FileResponse)
+async def get_media(
+    media_id: int, request: Request, db: AsyncSession = Depends(get_async_db)
+) -> Response:
+    """
+    Serve a stored media file.
+
+    The file is sent with FileResponse, which uses zero-copy sendfile where
+    the server supports it and answers Range requests (206) for partial
+    content. Content-addressed files (those with a sha256) never change, so
+    they are sent with their hash as ETag and an immutable, year-long
+    Cache-Control; other files must be revalidated and are identified by
+    their size and modification time.
+
+    Args:
+        media_id: The ID of the media to serve.
+        request: The incoming request (for conditional headers).
+        db: Database session (injected).
+
+    Returns:
+        The file, or an empty 304 response if the client's copy is current.
+
+    Raises:
+        HTTPException: 404 if the media or its file does not exist.
+    """
+    media = await AsyncQuestionRepository(db).get_media_by_id(media_id)
+    if media is None:
+        raise HTTPException(status_code=404, detail="Media not found")
+
+    path = resolve_media_path(str(media.relative_path))
+    try:
+        stat_result = await run_io(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Media file not found") from None
+
+    if media.sha256:
+        etag = f'"{media.sha256}"'
+        headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+        last_modified = None
+    else:
+        last_modified = datetime.fromtimestamp(stat_result.st_mtime, timezone.utc)
+        etag = make_etag("media", media_id, stat_result.st_mtime, stat_result.st_size)
+        headers = validator_headers(etag, last_modified)
+
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(
+        path,
+        headers=headers,
+        media_type=str(media.mime_type),
+        stat_result=stat_result,
+    )
@@ -4,69 +4,538 @@ DougHub2 Questions API Router.
 This module contains the endpoints for managing questions.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+import base64
+import binascii
+import json
+from collections.abc import Callable, Iterator
+from datetime import datetime
+from typing import Any, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from doughub2.database import get_db
-from doughub2.persistence import QuestionRepository
+from doughub2.api.conditional import is_not_modified, make_etag, validator_headers
+from doughub2.database import get_async_db, get_session_factory
+from doughub2.detail_cache import CachedResponse, question_detail_cache
+from doughub2.export import NDJSON_MEDIA_TYPE, coalesce, export_lines, gzip_chunks
+from doughub2.models import Question
+from doughub2.persistence import AsyncQuestionRepository, QuestionRepository
+from doughub2.responses import FastJSONResponse, model_response
 from doughub2.schemas import (
+    CacheStatsResponse,
+    MediaInfo,
+    QuestionBatchResponse,
     QuestionDetailResponse,
     QuestionInfo,
     QuestionListResponse,
+    QuestionSearchResponse,
+    QuestionSearchResult,
+    TagCount,
+    TagCountsResponse,
 )
+from doughub2.search import make_snippet, parse_search_query
+
+router = APIRouter(tags=["questions"], default_response_class=FastJSONResponse)
+
+QuestionSort = Literal["id", "created_at", "updated_at", "source"]
+
+# Most question IDs accepted by one /questions/batch request
+MAX_BATCH_IDS = 100
+
+
+# =============================================================================
+# Pagination Cursors
+# =============================================================================
+
+
+def _sort_value(row: Row, sort: str) -> Any:
+    """Get the value a question summary row is ordered by for a sort key."""
+    if sort == "created_at":
+        return row.created_at
+    if sort == "updated_at":
+        return row.updated_at
+    if sort == "source":
+        return row.source_name
+    return row.question_id
+
+
+def encode_cursor(sort: str, order: str, value: Any, question_id: int) -> str:
+    """Encode the position after a question as an opaque cursor.
+
+    Args:
+        sort: Sort key the listing uses.
+        order: Sort order, "asc" or "desc" (for searches, the query).
+        value: Sort value of the last question on the page.
+        question_id: ID of the last question on the page.
+
+    Returns:
+        URL-safe cursor string.
+    """
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort, order, value, question_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, order: str) -> tuple[Any, int]:
+    """Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor from a previous page.
+        sort: Sort key of the current request.
+        order: Sort order of the current request.
+
+    Returns:
+        Tuple of (sort value, question_id) to continue after.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or was issued for a
+            different sort.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, cursor_order, value, question_id = json.loads(
+            base64.urlsafe_b64decode(padded.encode("ascii"))
+        )
+        if sort in ("created_at", "updated_at"):
+            value = datetime.fromisoformat(value)
+        question_id = int(question_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+    if (cursor_sort, cursor_order) != (sort, order):
+        raise HTTPException(
+            status_code=400, detail="Cursor does not match the requested sort"
+        )
+    return value, question_id
+
+
+# =============================================================================
+# Response Builders
+# =============================================================================
+
+
+def question_etag(question_id: int, version: int) -> str:
+    """Build the ETag of a question's detail response.
+
+    Derived from the question's version rather than updated_at, since two
+    writes can share an updated_at second.
+
+    Args:
+        question_id: Primary key of the question.
+        version: The question's version column.
+
+    Returns:
+        Quoted entity tag.
+    """
+    return make_etag("question", question_id, version)
+
 
-router = APIRouter(tags=["questions"])
+def question_detail(question: Question) -> QuestionDetailResponse:
+    """Build the detail response of a question loaded with content and media.
+
+    Args:
+        question: The question, with its media eager-loaded.
+
+    Returns:
+        QuestionDetailResponse for the question.
+    """
+    return QuestionDetailResponse(
+        question_id=int(question.question_id),  # type: ignore[arg-type]
+        source_name=str(question.source.name),  # type: ignore[arg-type]
+        source_question_key=str(question.source_question_key),  # type: ignore[arg-type]
+        raw_html=str(question.raw_html),  # type: ignore[arg-type]
+        media=[
+            MediaInfo(
+                media_id=media.media_id,
+                media_role=media.media_role,
+                media_type=media.media_type,
+                mime_type=media.mime_type,
+                sha256=media.sha256,
+            )
+            for media in question.media
+        ],
+    )
+
+
+# =============================================================================
+# Endpoints
+# =============================================================================
 
 
 @router.get("/questions", response_model=QuestionListResponse)
-async def list_questions(db: Session = Depends(get_db)) -> QuestionListResponse:
+async def list_questions(
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = None,
+    sort: QuestionSort = "id",
+    order: Literal["asc", "desc"] = "asc",
+    hostname: str | None = Query(None, description="Only list this hostname"),
+    category: str | None = Query(None, description="Only list this category"),
+    tag: str | None = Query(None, description="Only list questions with this tag"),
+    db: AsyncSession = Depends(get_async_db),
+) -> QuestionListResponse | Response:
     """
-    Retrieve a list of all extracted questions.
+    Retrieve a page of extracted questions.
+
+    Pages are keyset-paginated: pass the next_cursor of one response as the
+    cursor of the next request, with the same sort, order and filters,
+    until next_cursor is null. The total number of questions is only counted for
+    the first page (no cursor), so paging through does not rescan the table.
+
+    Responses carry an ETag for the whole question collection; a request
+    whose If-None-Match still matches gets a 304 without the page being
+    queried.
+
+    Args:
+        request: The incoming request (for conditional headers).
+        limit: Maximum number of questions per page.
+        cursor: next_cursor from the previous page; omit for the first page.
+        sort: Sort key: id, created_at, updated_at or source (name).
+        order: Sort order, asc or desc.
+        hostname: Only list questions extracted from this hostname.
+        category: Only list questions in this category.
+        tag: Only list questions with this tag (case-insensitive).
+        db: Database session (injected).
 
     Returns:
-        A list of questions with their ID, source name, and source key.
+        A page of questions with their ID, source name, and source key, or
+        an empty 304 response.
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid.
     """
-    repo = QuestionRepository(db)
-    questions = repo.get_all_questions()
+    after = decode_cursor(cursor, sort, order) if cursor else None
+
+    repo = AsyncQuestionRepository(db)
+    version = await repo.get_questions_version()
+    etag = make_etag("questions", version.version, version.count)
+    headers = validator_headers(etag)
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    # Fetch one extra row to learn whether another page follows
+    rows = await repo.list_question_summaries(
+        limit + 1,
+        sort=sort,
+        descending=order == "desc",
+        after=after,
+        hostname=hostname,
+        category=category,
+        tag=tag,
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            sort, order, _sort_value(last, sort), last.question_id
+        )
+    total = None
+    if cursor is None:
+        filtered = hostname is not None or category is not None or tag is not None
+        total = (
+            await repo.count_questions(hostname, category, tag)
+            if filtered
+            else version.count
+        )
 
     question_infos = [
         QuestionInfo(
-            question_id=int(q.question_id),  # type: ignore[arg-type]
-            source_name=str(q.source.name),  # type: ignore[arg-type]
-            source_question_key=str(q.source_question_key),  # type: ignore[arg-type]
+            question_id=row.question_id,
+            source_name=row.source_name,
+            source_question_key=row.source_question_key,
+        )
+        for row in rows
+    ]
+
+    return model_response(
+        QuestionListResponse(
+            questions=question_infos, next_cursor=next_cursor, total=total
+        ),
+        headers=headers,
+    )
+
+
+@router.get("/questions/search", response_model=QuestionSearchResponse)
+async def search_questions(
+    q: str = "",
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> QuestionSearchResponse:
+    """
+    Search questions with the Card Browser query syntax.
+
+    Supports free-text words and "quoted phrases" plus the front:, back:,
+    tag:, deck: and is: operators (see doughub2.search). Text matches are
+    ranked best first and highlighted in a snippet. Pages are continued by
+    passing next_cursor back with the same q.
+
+    Args:
+        q: Search query.
+        limit: Maximum number of results per page.
+        cursor: next_cursor from the previous page; omit for the first page.
+        db: Database session (injected).
+
+    Returns:
+        A page of matching questions with snippets and scores.
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid or was issued for a
+            different query.
+    """
+    after = decode_cursor(cursor, "search", q) if cursor else None
+    query = parse_search_query(q)
+
+    repo = AsyncQuestionRepository(db)
+    hits = await repo.search_questions(query, limit + 1, after=after)
+    has_more = len(hits) > limit
+    hits = hits[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = hits[-1]
+        next_cursor = encode_cursor("search", q, last.score, last.question_id)
+    total = await repo.count_search_results(query) if cursor is None else None
+
+    results = [
+        QuestionSearchResult(
+            question_id=hit.question_id,
+            source_name=hit.source_name,
+            source_question_key=hit.source_question_key,
+            snippet=make_snippet(hit, query),
+            score=hit.score,
+        )
+        for hit in hits
+    ]
+    return model_response(
+        QuestionSearchResponse(results=results, next_cursor=next_cursor, total=total)
+    )
+
+
+@router.get("/tags", response_model=TagCountsResponse)
+async def list_tag_counts(
+    db: AsyncSession = Depends(get_async_db),
+) -> TagCountsResponse:
+    """
+    Count the questions carrying each tag.
+
+    Counted from the question_tags index, for the browser's tag sidebar.
+
+    Args:
+        db: Database session (injected).
+
+    Returns:
+        TagCountsResponse with every tag in use, most used first.
+    """
+    repo = AsyncQuestionRepository(db)
+    rows = await repo.count_questions_by_tag()
+    return model_response(
+        TagCountsResponse(
+            tags=[TagCount(name=row.name, count=row.count) for row in rows]
+        )
+    )
+
+
+def parse_question_ids(ids: str) -> list[int]:
+    """Parse a comma-separated list of question IDs.
+
+    Args:
+        ids: IDs separated by commas, e.g. "12,7,31".
+
+    Returns:
+        The IDs in the given order, without duplicates.
+
+    Raises:
+        HTTPException: 400 if an ID is not an integer or there are more than
+            MAX_BATCH_IDS of them.
+    """
+    try:
+        parsed = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid question ID") from None
+    unique = list(dict.fromkeys(parsed))
+    if len(unique) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_IDS} question IDs per request",
+        )
+    return unique
+
+
+@router.get("/questions/export", response_class=StreamingResponse)
+async def export_questions(
+    gzip: bool = Query(False, description="Compress the stream with gzip"),
+    source: str | None = Query(None, description="Only export this source"),
+    batch_size: int = Query(200, ge=1, le=5000),
+    session_factory: Callable[[], Session] = Depends(get_session_factory),
+) -> StreamingResponse:
+    """
+    Stream every stored question as NDJSON, one JSON object per line.
+
+    Questions are read batch_size at a time while the response is being
+    sent, so the export runs in constant memory whatever the size of the
+    question bank. Records carry the stored HTML and metadata and the
+    question's media.
+
+    Args:
+        gzip: Send the stream gzip-compressed (a .ndjson.gz download).
+        source: Only export questions of the source with this name.
+        batch_size: Questions fetched from the database per batch.
+        session_factory: Database session factory (injected); the stream
+            outlives the request-scoped session.
+
+    Returns:
+        StreamingResponse with the NDJSON (or gzipped NDJSON) body.
+    """
+
+    def generate() -> Iterator[bytes]:
+        session = session_factory()
+        try:
+            lines = export_lines(QuestionRepository(session), batch_size, source)
+            chunks = coalesce(lines)
+            yield from gzip_chunks(chunks) if gzip else chunks
+        finally:
+            session.close()
+
+    filename = "questions.ndjson.gz" if gzip else "questions.ndjson"
+    return StreamingResponse(
+        generate(),
+        media_type="application/gzip" if gzip else NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/questions/batch", response_model=QuestionBatchResponse)
+async def get_questions_batch(
+    ids: str = Query(..., description="Comma-separated question IDs"),
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    """
+    Retrieve the full details of several questions in one request.
+
+    Lets clients prefetch the previews they are about to show: all the
+    questions are read with one IN query, content and source included.
+    Each question's ETag is returned too, so a client can later revalidate
+    its copy with GET /questions/{id} and If-None-Match.
+
+    Args:
+        ids: Comma-separated question IDs (at most MAX_BATCH_IDS).
+        db: Database session (injected).
+
+    Returns:
+        QuestionBatchResponse with the questions in the requested order,
+        their ETags and the IDs that were not found.
+
+    Raises:
+        HTTPException: 400 if the IDs are invalid or too many.
+    """
+    question_ids = parse_question_ids(ids)
+
+    repo = AsyncQuestionRepository(db)
+    found = {
+        question.question_id: question
+        for question in await repo.get_questions_by_ids(
+            question_ids, include_content=True, include_media=True
         )
-        for q in questions
+    }
+
+    questions = [
+        question_detail(found[question_id])
+        for question_id in question_ids
+        if question_id in found
     ]
+    missing = [question_id for question_id in question_ids if question_id not in found]
+    etags = {
+        question_id: question_etag(question_id, question.version)
+        for question_id, question in found.items()
+    }
 
-    return QuestionListResponse(questions=question_infos)
+    return model_response(
+        QuestionBatchResponse(questions=questions, etags=etags, missing=missing)
+    )
 
 
 @router.get("/questions/{question_id}", response_model=QuestionDetailResponse)
 async def get_question(
-    question_id: int, db: Session = Depends(get_db)
-) -> QuestionDetailResponse:
+    question_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+) -> QuestionDetailResponse | Response:
     """
     Retrieve the full details of a single question by its ID.
 
+    The response carries an ETag derived from the question's version, which
+    every write increments, and a Last-Modified of its updated_at. A
+    request whose If-None-Match (or If-Modified-Since) shows the client's
+    copy is current gets a 304; only the version is read for it, never the
+    stored HTML.
+
+    Serialized responses are kept in question_detail_cache, which
+    QuestionRepository invalidates whenever it writes to the question, so
+    a repeat request for a cached question does not touch the database.
+
     Args:
         question_id: The ID of the question to retrieve.
+        request: The incoming request (for conditional headers).
         db: Database session (injected).
 
     Returns:
-        QuestionDetailResponse with the question's full details.
+        QuestionDetailResponse with the question's full details, or an
+        empty 304 response.
 
     Raises:
         HTTPException: 404 if the question is not found.
     """
-    repo = QuestionRepository(db)
-    question = repo.get_question_by_id(question_id)
+    cached = question_detail_cache.get(question_id)
+    if cached is not None:
+        headers = validator_headers(cached.etag, cached.last_modified)
+        if is_not_modified(request, cached.etag, cached.last_modified):
+            return Response(status_code=304, headers=headers)
+        return Response(cached.body, headers=headers, media_type="application/json")
+
+    # Read before loading, so a write made meanwhile keeps this copy out
+    generation = question_detail_cache.generation
+    repo = AsyncQuestionRepository(db)
+    stored = await repo.get_question_version(question_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Question not found")
+
+    etag = question_etag(question_id, stored.version)
+    headers = validator_headers(etag, stored.updated_at)
+    if is_not_modified(request, etag, stored.updated_at):
+        return Response(status_code=304, headers=headers)
 
+    question = await repo.get_question_by_id(
+        question_id, include_content=True, include_media=True, include_source=True
+    )
     if question is None:
         raise HTTPException(status_code=404, detail="Question not found")
+    # Describe the version actually loaded, in case it changed in between
+    updated_at = question.updated_at
+    etag = question_etag(question_id, question.version)  # type: ignore[arg-type]
+    headers = validator_headers(etag, updated_at)  # type: ignore[arg-type]
 
-    return QuestionDetailResponse(
-        question_id=int(question.question_id),  # type: ignore[arg-type]
-        source_name=str(question.source.name),  # type: ignore[arg-type]
-        source_question_key=str(question.source_question_key),  # type: ignore[arg-type]
-        raw_html=str(question.raw_html),  # type: ignore[arg-type]
+    response = model_response(question_detail(question), headers=headers)
+    question_detail_cache.put(
+        question_id, CachedResponse(response.body, etag, updated_at), generation
     )
+    return response
+
+
+@router.get("/cache/stats", response_model=CacheStatsResponse)
+async def get_cache_stats() -> Response:
+    """
+    Report the size and hit rate of the question detail cache.
+
+    Returns:
+        CacheStatsResponse with the cache's entries, bytes, budget, hits,
+        misses and evictions since the cache was last cleared.
+    """
+    return model_response(CacheStatsResponse(**question_detail_cache.stats()))
@@ -184,3 +184,203 @@ def dev():
         port=8000,
         reload=True,
     )
+
+
+@cli.command()
+def backfill_hashes(
+    batch_size: int = typer.Option(
+        500, "--batch-size", "-b", help="Questions to update per transaction"
+    ),
+):
+    """
+    Backfill body text hashes for existing questions.
+
+    Populates the body_hash column used for duplicate detection on rows
+    stored before it existed. Safe to re-run; already-hashed rows are skipped.
+    """
+    ensure_project_root()
+
+    from doughub2.database import get_session_local
+    from doughub2.persistence import QuestionRepository
+
+    typer.echo("🔑 Backfilling question body hashes...")
+    session = get_session_local()()
+    try:
+        updated = QuestionRepository(session).backfill_body_hashes(batch_size)
+    finally:
+        session.close()
+    typer.echo(f"✅ Updated {updated} question(s)")
+
+
+@cli.command()
+def backfill_metadata(
+    batch_size: int = typer.Option(
+        500, "--batch-size", "-b", help="Questions to update per transaction"
+    ),
+):
+    """
+    Backfill the metadata columns of existing questions.
+
+    Copies bodyText, url, hostname, timestamp, title and category out of the
+    stored metadata JSON into their columns for rows stored before the
+    columns existed. Safe to re-run; rows already filled are skipped.
+    """
+    ensure_project_root()
+
+    from doughub2.database import get_session_local
+    from doughub2.persistence import QuestionRepository
+
+    typer.echo("🗂️  Backfilling question metadata columns...")
+    session = get_session_local()()
+    try:
+        updated = QuestionRepository(session).backfill_metadata_columns(batch_size)
+    finally:
+        session.close()
+    typer.echo(f"✅ Updated {updated} question(s)")
+
+
+@cli.command()
+def reindex_search(
+    batch_size: int = typer.Option(
+        200, "--batch-size", "-b", help="Questions to index per transaction"
+    ),
+):
+    """
+    Rebuild the full-text search index used by /questions/search.
+
+    Needed once for questions stored before search was added; new and
+    updated questions are indexed automatically.
+    """
+    ensure_project_root()
+
+    from doughub2.database import get_session_local
+    from doughub2.persistence import QuestionRepository
+
+    typer.echo("🔎 Rebuilding the search index...")
+    session = get_session_local()()
+    try:
+        indexed = QuestionRepository(session).rebuild_search_index(batch_size)
+    finally:
+        session.close()
+    typer.echo(f"✅ Indexed {indexed} question(s)")
+
+
+@cli.command()
+def reindex_tags(
+    batch_size: int = typer.Option(
+        500, "--batch-size", "-b", help="Questions to sync per transaction"
+    ),
+):
+    """
+    Rebuild the tag tables used by tag: searches, tag filters and /tags.
+
+    Needed once for questions tagged before the tag tables were added; tags
+    written since are kept in sync automatically. Safe to re-run.
+    """
+    ensure_project_root()
+
+    from doughub2.database import get_session_local
+    from doughub2.persistence import QuestionRepository
+
+    typer.echo("🏷️  Rebuilding question tags...")
+    session = get_session_local()()
+    try:
+        synced = QuestionRepository(session).rebuild_question_tags(batch_size)
+    finally:
+        session.close()
+    typer.echo(f"✅ Synced the tags of {synced} question(s)")
+
+
+@cli.command()
+def export(
+    output: Path = typer.Argument(
+        ..., help="File to write, or '-' for stdout; a .gz name implies --gzip"
+    ),
+    gzip_output: bool = typer.Option(
+        False, "--gzip", "-z", help="Compress the output with gzip"
+    ),
+    source: str | None = typer.Option(
+        None, "--source", "-s", help="Only export questions of this source"
+    ),
+    batch_size: int = typer.Option(
+        200, "--batch-size", "-b", help="Questions fetched per database batch"
+    ),
+):
+    """
+    Export every stored question as NDJSON, one JSON object per line.
+
+    Questions are streamed from the database in batches, so memory use stays
+    constant however large the question bank is.
+    """
+    to_stdout = str(output) == "-"
+    gzip_output = gzip_output or output.suffix == ".gz"
+    # Resolve before switching to the project root
+    output = output.resolve()
+    ensure_project_root()
+
+    from doughub2.database import get_session_local
+    from doughub2.export import coalesce, export_lines, gzip_chunks
+    from doughub2.persistence import QuestionRepository
+
+    count = 0
+
+    def counted(lines):
+        nonlocal count
+        for line in lines:
+            count += 1
+            yield line
+
+    session = get_session_local()()
+    stream = sys.stdout.buffer if to_stdout else open(output, "wb")
+    try:
+        chunks = coalesce(
+            counted(export_lines(QuestionRepository(session), batch_size, source))
+        )
+        for chunk in gzip_chunks(chunks) if gzip_output else chunks:
+            stream.write(chunk)
+    finally:
+        if not to_stdout:
+            stream.close()
+        session.close()
+
+    destination = "stdout" if to_stdout else str(output)
+    typer.echo(f"✅ Exported {count} question(s) to {destination}", err=True)
+
+
+@cli.command()
+def compress_content(
+    batch_size: int = typer.Option(
+        200, "--batch-size", "-b", help="Questions to rewrite per transaction"
+    ),
+    vacuum: bool = typer.Option(
+        True, "--vacuum/--no-vacuum", help="Reclaim freed space afterwards"
+    ),
+):
+    """
+    Rewrite stored question HTML and metadata in the configured compression.
+
+    Compresses rows stored before RAW_CONTENT_COMPRESSION was enabled (or
+    decompresses them when it is set to "none"). Safe to re-run; rows already
+    in the configured form are skipped.
+    """
+    ensure_project_root()
+
+    from sqlalchemy import text
+
+    from doughub2.config import settings
+    from doughub2.database import get_engine, get_session_local
+    from doughub2.persistence import QuestionRepository
+
+    codec = settings.RAW_CONTENT_COMPRESSION
+    typer.echo(f"🗜️  Rewriting question content as {codec}...")
+    session = get_session_local()()
+    try:
+        rewritten = QuestionRepository(session).recompress_raw_content(batch_size)
+    finally:
+        session.close()
+    typer.echo(f"✅ Rewrote {rewritten} question(s)")
+
+    if vacuum and rewritten:
+        typer.echo("🧹 Vacuuming database...")
+        with get_engine().connect() as conn:
+            conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("VACUUM"))
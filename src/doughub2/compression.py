@@ -0,0 +1,132 @@
+"""Transparent compression for large text columns.
+
+Question rows keep the full page HTML and extraction metadata, which compress
+very well. CompressedText stores such values as compressed BLOBs and hands
+plain strings back to Python, so the rest of the code never sees the
+difference.
+
+Stored values are self-describing: a short codec prefix precedes the
+compressed bytes. Rows written before compression was enabled (or with
+RAW_CONTENT_COMPRESSION set to "none") stay plain TEXT and are read as-is,
+so compressed and uncompressed rows can coexist in the same column.
+
+Supported codecs:
+- "zlib": always available.
+- "zstd": faster and smaller, requires the optional ``zstandard`` package.
+"""
+
+import zlib
+from typing import Any
+
+from sqlalchemy import Text
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import TypeDecorator
+
+from doughub2.config import settings
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# Codec name -> prefix written before the compressed payload
+CODEC_PREFIXES = {"zlib": b"zl1:", "zstd": b"zs1:"}
+
+# Values shorter than this (in bytes) are stored uncompressed
+MIN_COMPRESS_BYTES = 256
+
+
+def _require_zstandard() -> Any:
+    if zstandard is None:
+        raise RuntimeError(
+            "zstd compression requires the 'zstandard' package "
+            "(pip install zstandard)"
+        )
+    return zstandard
+
+
+def compress_text(value: str, codec: str, level: int | None = None) -> bytes | str:
+    """Compress a string for storage.
+
+    Args:
+        value: Text to compress.
+        codec: One of "none", "zlib" or "zstd".
+        level: Compression level, or None for the codec default.
+
+    Returns:
+        The prefixed compressed bytes, or the original string if the codec
+        is "none" or the value is too small to be worth compressing.
+
+    Raises:
+        ValueError: If the codec is unknown.
+        RuntimeError: If zstd is requested but zstandard is not installed.
+    """
+    if codec == "none":
+        return value
+    if codec not in CODEC_PREFIXES:
+        raise ValueError(f"Unknown compression codec: {codec}")
+
+    data = value.encode("utf-8")
+    if len(data) < MIN_COMPRESS_BYTES:
+        return value
+
+    if codec == "zlib":
+        payload = zlib.compress(data, -1 if level is None else level)
+    else:
+        zstd = _require_zstandard()
+        payload = zstd.ZstdCompressor(level=3 if level is None else level).compress(
+            data
+        )
+    return CODEC_PREFIXES[codec] + payload
+
+
+def decompress_text(value: bytes | str) -> str:
+    """Restore a string stored by compress_text.
+
+    Args:
+        value: Stored value; plain strings are returned unchanged.
+
+    Returns:
+        The original text.
+
+    Raises:
+        ValueError: If the bytes do not carry a known codec prefix.
+    """
+    if isinstance(value, str):
+        return value
+
+    data = bytes(value)
+    if data.startswith(CODEC_PREFIXES["zlib"]):
+        raw = zlib.decompress(data[len(CODEC_PREFIXES["zlib"]) :])
+    elif data.startswith(CODEC_PREFIXES["zstd"]):
+        zstd = _require_zstandard()
+        raw = zstd.ZstdDecompressor().decompress(data[len(CODEC_PREFIXES["zstd"]) :])
+    else:
+        raise ValueError("Stored value has no known compression prefix")
+    return raw.decode("utf-8")
+
+
+class CompressedText(TypeDecorator):
+    """Text column stored compressed according to RAW_CONTENT_COMPRESSION.
+
+    The column keeps TEXT affinity so existing databases need no schema
+    change; SQLite stores the compressed values as BLOBs alongside any
+    uncompressed TEXT rows.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value: str | None, dialect: Dialect) -> Any:
+        if value is None:
+            return None
+        return compress_text(
+            value,
+            settings.RAW_CONTENT_COMPRESSION,
+            settings.RAW_CONTENT_COMPRESSION_LEVEL,
+        )
+
+    def process_result_value(self, value: Any, dialect: Dialect) -> str | None:
+        if value is None:
+            return None
+        return decompress_text(value)
@@ -21,12 +21,79 @@ class Settings(BaseSettings):
     # Database settings
     DATABASE_URL: str = "sqlite:///doughub.db"
 
+    # SQLite connection profile: "production" (WAL journal and tuned pragmas)
+    # or "default" (SQLite's own defaults). The SQLITE_* pragmas below
+    # override the profile's values when set
+    SQLITE_PROFILE: str = "production"
+    SQLITE_SYNCHRONOUS: str | None = None
+    SQLITE_MMAP_SIZE: int | None = None
+    SQLITE_CACHE_SIZE: int | None = None
+    SQLITE_BUSY_TIMEOUT_MS: int | None = None
+
+    # Seconds between background WAL checkpoints and PRAGMA optimize runs
+    # while the API is serving; 0 disables the maintenance task
+    SQLITE_MAINTENANCE_INTERVAL: float = 600.0
+
+    # Compression of stored question HTML and metadata: "none", "zlib" or
+    # "zstd" (requires the zstandard package). Level None uses the codec default
+    RAW_CONTENT_COMPRESSION: str = "zlib"
+    RAW_CONTENT_COMPRESSION_LEVEL: int | None = None
+
+    # Encoder for large JSON responses: "default" or "orjson" (requires the
+    # orjson package)
+    JSON_ENCODER: str = "default"
+
+    # Memory budget in bytes of the in-process cache of serialized question
+    # detail responses; 0 disables the cache
+    QUESTION_CACHE_BYTES: int = 32 * 1024 * 1024
+
     # Directory for saving extractions (organized by source/year/month)
     EXTRACTION_DIR: Path = Path("data/extractions")
 
+    # Number of recent extractions listed by /extractions
+    EXTRACTION_HISTORY_SIZE: int = 500
+
     # Media storage settings (under extractions)
     MEDIA_ROOT: str = "data/extractions/media"
 
+    # Batch extraction: records persisted per transaction, and the largest
+    # single NDJSON record accepted
+    BATCH_GROUP_SIZE: int = 50
+    BATCH_MAX_RECORD_BYTES: int = 32 * 1024 * 1024
+
+    # Worker pool sizes for blocking work in async endpoints
+    IO_WORKERS: int = 4
+    DB_WORKERS: int = 2
+
+    # Background ingest queue for /extract
+    INGEST_WORKERS: int = 8
+    INGEST_QUEUE_DEPTH: int = 100
+    INGEST_JOB_HISTORY: int = 1000
+    INGEST_RETRY_AFTER: int = 2
+
+    # Group-commit writer for ingest: most units committed per transaction,
+    # and seconds to wait for more units before committing (0: commit the
+    # units that arrived during the previous commit)
+    WRITER_MAX_BATCH: int = 64
+    WRITER_MAX_DELAY: float = 0.0
+
+    # Logs table: level of the "doughub2" records kept (empty disables the
+    # sink), most records inserted per transaction, seconds to wait for more
+    # records before inserting, records buffered in memory (beyond which new
+    # records are dropped rather than making the caller wait), and days of
+    # logs kept (0 keeps them all)
+    LOG_DB_LEVEL: str = "INFO"
+    LOG_BATCH_SIZE: int = 200
+    LOG_FLUSH_INTERVAL: float = 1.0
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_RETENTION_DAYS: float = 7.0
+
+    # Image download settings
+    DOWNLOAD_MAX_WORKERS: int = 8
+    DOWNLOAD_PER_HOST_LIMIT: int = 4
+    DOWNLOAD_TIMEOUT: float = 15.0
+    DOWNLOAD_RETRIES: int = 2
+
     # Notebook settings
     NOTES_DIR: str = os.path.join(os.path.expanduser("~"), ".doughub", "notes")
 
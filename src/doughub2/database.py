@@ -5,25 +5,232 @@ This module contains the database engine, session factory, and dependency
 for FastAPI endpoint database sessions.
 """
 
-from collections.abc import Generator
+import logging
+from collections.abc import AsyncGenerator, Callable, Generator
+from typing import Any
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine, event, inspect, make_url, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
 
 from doughub2.config import settings
 from doughub2.models import Base
 
+logger = logging.getLogger("doughub2")
+
 # Database engine (lazy initialization)
 _engine = None
 _SessionLocal = None
 
+# Async database engine for the API routers (lazy initialization)
+_async_engine = None
+_AsyncSessionLocal = None
+
+# Async driver used in place of each sync dialect's default driver
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite"}
+
+# Pragmas set on every new SQLite connection, by SQLITE_PROFILE. In WAL mode
+# readers no longer wait for writers (and vice versa), and synchronous=NORMAL
+# only syncs at checkpoints, which remains crash-safe in WAL mode. Negative
+# cache_size is in KiB.
+SQLITE_PROFILES: dict[str, dict[str, Any]] = {
+    "default": {},
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "foreign_keys": "ON",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def sqlite_pragmas(profile: str | None = None) -> dict[str, Any]:
+    """Get the pragmas of an SQLite profile with the SQLITE_* overrides applied.
+
+    Args:
+        profile: Profile name; defaults to SQLITE_PROFILE.
+
+    Returns:
+        Mapping of pragma name to value, in the order they are set.
+
+    Raises:
+        ValueError: If the profile is unknown.
+    """
+    profile = profile or settings.SQLITE_PROFILE
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile: {profile}")
+    pragmas = dict(SQLITE_PROFILES[profile])
+    overrides = {
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+    }
+    pragmas.update(
+        {name: value for name, value in overrides.items() if value is not None}
+    )
+    return pragmas
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: dict[str, Any]) -> None:
+    """Set pragmas on every connection the engine opens.
+
+    Args:
+        engine: Engine bound to an SQLite database; must not have connected
+            yet, or earlier connections keep their settings.
+        pragmas: Mapping of pragma name to value, as from sqlite_pragmas().
+    """
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def create_db_engine(
+    url: str | None = None, profile: str | None = None, **options: Any
+) -> Engine:
+    """Create an engine, applying the SQLite profile to SQLite databases.
+
+    Args:
+        url: Database URL; defaults to DATABASE_URL.
+        profile: SQLite profile name; defaults to SQLITE_PROFILE.
+        **options: Further create_engine() arguments.
+
+    Returns:
+        The new engine.
+
+    Raises:
+        ValueError: If the profile is unknown.
+    """
+    engine = create_engine(url or settings.DATABASE_URL, **options)
+    if engine.dialect.name == "sqlite":
+        apply_sqlite_pragmas(engine, sqlite_pragmas(profile))
+    return engine
+
+
+def upgrade_schema(engine: Engine) -> None:
+    """Bring an existing database up to date with the current models.
+
+    ``create_all`` only creates missing tables, so databases created by an
+    older version lack columns and indexes added since. This adds any missing
+    nullable columns, columns with a server default (existing rows take the
+    default) and indexes in place; it never drops or alters data.
+
+    Args:
+        engine: Engine bound to the database to upgrade.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            existing_columns = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                constraints = ""
+                if column.server_default is not None:
+                    default = column.server_default.arg.text
+                    constraints = f" DEFAULT {default}"
+                    if not column.nullable:
+                        constraints = f" NOT NULL{constraints}"
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {table.name} "
+                        f"ADD COLUMN {column.name} {column_type}{constraints}"
+                    )
+                )
+                logger.info(f"Added column {table.name}.{column.name}")
+
+            existing_indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(conn, checkfirst=True)
+                    logger.info(f"Created index {index.name}")
+
+
+def _check_search_index(engine: Engine) -> None:
+    """Warn if stored questions are missing from the full-text index."""
+    with engine.connect() as conn:
+        indexed = conn.execute(text("SELECT count(*) FROM questions_fts")).scalar()
+        if indexed:
+            return
+        stored = conn.execute(text("SELECT count(*) FROM questions")).scalar()
+    if stored:
+        logger.warning(
+            f"{stored} question(s) are not in the search index; "
+            "run 'doughub2 reindex-search'"
+        )
+
+
+def async_database_url(url: str) -> str:
+    """Rewrite a database URL to use its dialect's async driver.
+
+    Args:
+        url: Database URL, such as DATABASE_URL.
+
+    Returns:
+        The URL with an async driver; URLs that already name a driver
+        without an async counterpart are returned unchanged.
+    """
+    parsed = make_url(url)
+    if parsed.drivername in ASYNC_DRIVERS:
+        parsed = parsed.set(drivername=ASYNC_DRIVERS[parsed.drivername])
+    return parsed.render_as_string(hide_password=False)
+
+
+def create_async_db_engine(
+    url: str | None = None, profile: str | None = None, **options: Any
+) -> AsyncEngine:
+    """Create an async engine, applying the SQLite profile to SQLite databases.
+
+    Args:
+        url: Database URL; defaults to DATABASE_URL. Sync drivers are
+            replaced by their async counterparts (see ASYNC_DRIVERS).
+        profile: SQLite profile name; defaults to SQLITE_PROFILE.
+        **options: Further create_async_engine() arguments.
+
+    Returns:
+        The new async engine.
+
+    Raises:
+        ValueError: If the profile is unknown.
+    """
+    engine = create_async_engine(
+        async_database_url(url or settings.DATABASE_URL), **options
+    )
+    if engine.dialect.name == "sqlite":
+        apply_sqlite_pragmas(engine.sync_engine, sqlite_pragmas(profile))
+    return engine
+
 
 def get_engine():
     """Get or create the database engine."""
     global _engine
     if _engine is None:
-        _engine = create_engine(settings.DATABASE_URL)
+        _engine = create_db_engine()
         Base.metadata.create_all(_engine)
+        upgrade_schema(_engine)
+        _check_search_index(_engine)
     return _engine
 
 
@@ -35,6 +242,41 @@ def get_session_local():
     return _SessionLocal
 
 
+def get_async_engine() -> AsyncEngine:
+    """Get or create the async engine.
+
+    The schema is created and upgraded through the sync engine first.
+    """
+    global _async_engine
+    if _async_engine is None:
+        get_engine()
+        _async_engine = create_async_db_engine()
+    return _async_engine
+
+
+def get_async_session_local() -> async_sessionmaker[AsyncSession]:
+    """Get or create the async session factory.
+
+    Objects are not expired on commit, since reloading their attributes
+    lazily is not possible outside an awaited call.
+    """
+    global _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=get_async_engine(), expire_on_commit=False
+        )
+    return _AsyncSessionLocal
+
+
+async def dispose_async_engine() -> None:
+    """Close the async engine's connections, if it was created."""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _AsyncSessionLocal = None
+
+
 def get_db() -> Generator[Session, None, None]:
     """FastAPI dependency for database sessions."""
     SessionLocal = get_session_local()
@@ -43,3 +285,23 @@ def get_db() -> Generator[Session, None, None]:
         yield session
     finally:
         session.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency for async database sessions.
+
+    Queries made through the session wait for the database without
+    blocking the event loop.
+    """
+    async with get_async_session_local()() as session:
+        yield session
+
+
+def get_session_factory() -> Callable[[], Session]:
+    """FastAPI dependency for work that outlives the request.
+
+    Background jobs cannot use the request-scoped session from get_db, which
+    is closed when the response is sent; they open their own sessions from
+    this factory instead.
+    """
+    return get_session_local()
@@ -0,0 +1,168 @@
+"""In-process cache of serialized question detail responses.
+
+Studying opens the same few hundred cards over and over; each open used to
+re-query SQLite, decompress the stored HTML and serialize it again. The
+cache keeps the finished JSON bodies of /questions/{id}, together with their
+validators, so a repeat open is a dictionary lookup.
+
+The cache is bounded by the total size of the bodies it holds
+(QUESTION_CACHE_BYTES) rather than by entry count, because a question's HTML
+can be anything from a few KB to several MB. The least recently used
+entries are evicted first. Setting the budget to 0 disables the cache.
+
+QuestionRepository invalidates a question's entry whenever it writes to the
+question. Writers bump a generation counter, and put() drops entries whose
+read began before the latest invalidation, so a slow reader cannot store a
+body it loaded before a concurrent write committed.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from doughub2.config import settings
+
+# Approximate per-entry bookkeeping cost counted against the budget
+ENTRY_OVERHEAD_BYTES = 256
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A serialized response and the validators it was sent with."""
+
+    body: bytes
+    etag: str
+    last_modified: datetime | None = None
+
+    @property
+    def size(self) -> int:
+        """Bytes counted against the cache budget."""
+        return len(self.body) + ENTRY_OVERHEAD_BYTES
+
+
+class ResponseCache:
+    """A byte-budget LRU of CachedResponse entries, safe across threads."""
+
+    def __init__(self, max_bytes: int | None = None) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_bytes: Budget in bytes, or None to follow
+                QUESTION_CACHE_BYTES.
+        """
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[Any, CachedResponse] = OrderedDict()
+        self._bytes = 0
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_bytes(self) -> int:
+        """Current budget in bytes."""
+        if self._max_bytes is not None:
+            return self._max_bytes
+        return settings.QUESTION_CACHE_BYTES
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every invalidation; pass it to put()."""
+        return self._generation
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Any) -> CachedResponse | None:
+        """Look up an entry, marking it as recently used.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            The cached response, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(self, key: Any, entry: CachedResponse, generation: int) -> bool:
+        """Store an entry, evicting least recently used ones to fit the budget.
+
+        Args:
+            key: Cache key.
+            entry: Response to cache.
+            generation: Value of generation read before the data behind the
+                entry was loaded.
+
+        Returns:
+            True if the entry was stored; False if it is larger than the
+            budget or an invalidation happened since generation was read.
+        """
+        max_bytes = self.max_bytes
+        with self._lock:
+            if generation != self._generation or entry.size > max_bytes:
+                return False
+            self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._bytes > max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self._evictions += 1
+            return True
+
+    def _remove(self, key: Any) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def invalidate(self, key: Any) -> None:
+        """Drop an entry because the data behind it changed.
+
+        Args:
+            key: Cache key.
+        """
+        with self._lock:
+            self._generation += 1
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the statistics."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Report the cache's size and effectiveness.
+
+        Returns:
+            Dict with entries, bytes, max_bytes, hits, misses, hit_ratio and
+            evictions.
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+            }
+
+
+# Process-wide cache of /questions/{id} response bodies, keyed by question_id
+question_detail_cache = ResponseCache()
@@ -0,0 +1,209 @@
+"""Concurrent image downloader for extractions.
+
+Images referenced by an extraction are fetched in parallel through a single
+keep-alive connection pool shared by the whole process. Concurrency is
+bounded globally (worker threads) and per host (semaphores), and each
+request has a timeout and a bounded number of retries for transient errors.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+
+from doughub2.config import settings
+
+logger = logging.getLogger("doughub2")
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of downloading a single URL.
+
+    Attributes:
+        url: The URL that was requested.
+        path: Local path the file was written to, or None on failure.
+        error: Error message if the download failed.
+        attempts: Number of attempts made.
+        sha256: SHA-256 of the downloaded content, computed while streaming.
+    """
+
+    url: str
+    path: Path | None = None
+    error: str | None = None
+    attempts: int = 0
+    sha256: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the download succeeded."""
+        return self.error is None
+
+
+class _RetryableStatusError(Exception):
+    """Raised when a response status indicates a transient failure."""
+
+
+class ImageDownloader:
+    """Downloads files concurrently over a shared connection pool.
+
+    The underlying httpx client is thread-safe, so one instance is shared
+    by all extractions for the life of the process.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        per_host_limit: int = 4,
+        timeout: float = 15.0,
+        retries: int = 2,
+        backoff: float = 0.5,
+    ) -> None:
+        """Initialize the downloader.
+
+        Args:
+            max_workers: Maximum number of downloads running at once.
+            per_host_limit: Maximum concurrent downloads from a single host.
+            timeout: Connect/read timeout in seconds for each request.
+            retries: Number of retries after the first attempt for
+                transient failures (network errors, 429 and 5xx responses).
+            backoff: Base delay in seconds for exponential retry backoff.
+        """
+        self.per_host_limit = per_host_limit
+        self.retries = retries
+        self.backoff = backoff
+        self._client = httpx.Client(
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(
+                max_connections=max_workers,
+                max_keepalive_connections=max_workers,
+            ),
+            follow_redirects=True,
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="doughub2-download"
+        )
+        self._host_semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        """Get the concurrency semaphore for the host of a URL."""
+        host = urllib.parse.urlparse(url).netloc
+        with self._lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_semaphores[host] = semaphore
+            return semaphore
+
+    def _fetch(self, url: str, dest: Path) -> str:
+        """Stream a URL to disk, replacing dest atomically on success.
+
+        Returns:
+            SHA-256 hex digest of the downloaded content.
+        """
+        tmp_path = dest.with_name(dest.name + ".part")
+        digest = hashlib.sha256()
+        try:
+            with self._client.stream("GET", url) as response:
+                if response.status_code in RETRYABLE_STATUS_CODES:
+                    raise _RetryableStatusError(f"HTTP {response.status_code}")
+                response.raise_for_status()
+                with open(tmp_path, "wb") as f:
+                    for chunk in response.iter_bytes():
+                        f.write(chunk)
+                        digest.update(chunk)
+            os.replace(tmp_path, dest)
+            return digest.hexdigest()
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def download(self, url: str, dest: Path) -> DownloadResult:
+        """Download a single URL to a local path, retrying transient errors.
+
+        Args:
+            url: URL to download.
+            dest: Destination file path. Its parent directory must exist.
+
+        Returns:
+            DownloadResult describing the outcome. Never raises.
+        """
+        result = DownloadResult(url=url)
+        semaphore = self._host_semaphore(url)
+
+        for attempt in range(self.retries + 1):
+            result.attempts = attempt + 1
+            try:
+                with semaphore:
+                    result.sha256 = self._fetch(url, dest)
+                result.path = dest
+                result.error = None
+                return result
+            except (httpx.TransportError, _RetryableStatusError) as e:
+                result.error = str(e) or type(e).__name__
+            except Exception as e:
+                result.error = str(e) or type(e).__name__
+                break
+
+            if attempt < self.retries:
+                time.sleep(self.backoff * (2**attempt))
+
+        logger.warning("Failed to download %s: %s", url, result.error)
+        return result
+
+    def download_many(self, jobs: list[tuple[str, Path]]) -> list[DownloadResult]:
+        """Download several URLs concurrently.
+
+        Args:
+            jobs: List of (url, destination path) pairs.
+
+        Returns:
+            One DownloadResult per job, in the same order as jobs.
+        """
+        futures = [
+            self._executor.submit(self.download, url, dest) for url, dest in jobs
+        ]
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        """Shut down the worker threads and close pooled connections."""
+        self._executor.shutdown(wait=True)
+        self._client.close()
+
+
+# Shared downloader (lazy initialization)
+_downloader: ImageDownloader | None = None
+_downloader_lock = threading.Lock()
+
+
+def get_downloader() -> ImageDownloader:
+    """Get or create the process-wide image downloader."""
+    global _downloader
+    with _downloader_lock:
+        if _downloader is None:
+            _downloader = ImageDownloader(
+                max_workers=settings.DOWNLOAD_MAX_WORKERS,
+                per_host_limit=settings.DOWNLOAD_PER_HOST_LIMIT,
+                timeout=settings.DOWNLOAD_TIMEOUT,
+                retries=settings.DOWNLOAD_RETRIES,
+            )
+        return _downloader
+
+
+def close_downloader() -> None:
+    """Close the process-wide image downloader if it was created."""
+    global _downloader
+    with _downloader_lock:
+        if _downloader is not None:
+            _downloader.close()
+            _downloader = None
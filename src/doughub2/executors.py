@@ -0,0 +1,83 @@
+"""Bounded thread pools for blocking work called from async endpoints.
+
+Async endpoints must not run file I/O or synchronous SQLAlchemy work on the
+event loop thread. These helpers run such work on dedicated, size-limited
+pools so a burst of slow extractions queues up here instead of freezing
+every other request.
+
+- The I/O pool handles disk writes and image download batches.
+- The database pool handles SQLAlchemy sessions; it is kept small because
+  SQLite serializes writers anyway.
+"""
+
+import asyncio
+import functools
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import ParamSpec, TypeVar
+
+from doughub2.config import settings
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# Executors (lazy initialization)
+_io_executor: ThreadPoolExecutor | None = None
+_db_executor: ThreadPoolExecutor | None = None
+_lock = threading.Lock()
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Get or create the executor for blocking file I/O."""
+    global _io_executor
+    with _lock:
+        if _io_executor is None:
+            _io_executor = ThreadPoolExecutor(
+                max_workers=settings.IO_WORKERS, thread_name_prefix="doughub2-io"
+            )
+        return _io_executor
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Get or create the executor for blocking database work."""
+    global _db_executor
+    with _lock:
+        if _db_executor is None:
+            _db_executor = ThreadPoolExecutor(
+                max_workers=settings.DB_WORKERS, thread_name_prefix="doughub2-db"
+            )
+        return _db_executor
+
+
+async def _run_in(
+    executor: ThreadPoolExecutor,
+    func: Callable[P, T],
+    *args: P.args,
+    **kwargs: P.kwargs,
+) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, functools.partial(func, *args, **kwargs)
+    )
+
+
+async def run_io(func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """Run a blocking file I/O call on the I/O pool and await its result."""
+    return await _run_in(get_io_executor(), func, *args, **kwargs)
+
+
+async def run_db(func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """Run a blocking database call on the database pool and await its result."""
+    return await _run_in(get_db_executor(), func, *args, **kwargs)
+
+
+def shutdown_executors() -> None:
+    """Shut down the executors if they were created, waiting for running work."""
+    global _io_executor, _db_executor
+    with _lock:
+        for executor in (_io_executor, _db_executor):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        _io_executor = None
+        _db_executor = None
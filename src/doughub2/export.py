@@ -0,0 +1,126 @@
+"""Streaming export of the question bank as NDJSON.
+
+Each question becomes one JSON object per line, with its stored HTML and
+metadata and the list of its media. Questions are read in batches through
+QuestionRepository.iter_questions_for_export(), so exports of any size run in
+constant memory; the /questions/export endpoint and the ``doughub2 export``
+command both build on export_lines().
+"""
+
+import zlib
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.engine import Row
+
+from doughub2.persistence import QuestionRepository
+from doughub2.responses import dumps
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Size of the chunks handed to the HTTP response or file
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+def _timestamp(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def export_record(question: Row, media: list[Row]) -> dict[str, Any]:
+    """Build the exported record of a question.
+
+    Args:
+        question: Question row from iter_questions_for_export().
+        media: The question's media rows.
+
+    Returns:
+        JSON-serializable dict describing the question.
+    """
+    return {
+        "question_id": question.question_id,
+        "source_name": question.source_name,
+        "source_question_key": question.source_question_key,
+        "status": question.status,
+        "state": question.state,
+        "tags": question.tags,
+        "body_hash": question.body_hash,
+        "extraction_path": question.extraction_path,
+        "note_path": question.note_path,
+        "created_at": _timestamp(question.created_at),
+        "updated_at": _timestamp(question.updated_at),
+        "raw_html": question.raw_html,
+        "raw_metadata_json": question.raw_metadata_json,
+        "media": [
+            {
+                "media_role": m.media_role,
+                "media_type": m.media_type,
+                "mime_type": m.mime_type,
+                "relative_path": m.relative_path,
+                "sha256": m.sha256,
+            }
+            for m in media
+        ],
+    }
+
+
+def export_lines(
+    repo: QuestionRepository, batch_size: int = 200, source_name: str | None = None
+) -> Iterator[bytes]:
+    """Encode every question as an NDJSON line.
+
+    Args:
+        repo: Repository to read the questions from.
+        batch_size: Questions fetched from the database per batch.
+        source_name: Only export questions of this source.
+
+    Yields:
+        One UTF-8 JSON line, newline included, per question.
+    """
+    for question, media in repo.iter_questions_for_export(batch_size, source_name):
+        yield dumps(export_record(question, media)) + b"\n"
+
+
+def coalesce(
+    chunks: Iterable[bytes], size: int = EXPORT_CHUNK_BYTES
+) -> Iterator[bytes]:
+    """Join small chunks into chunks of at least size bytes.
+
+    Streaming responses pay a thread hop per chunk, so lines are sent in
+    blocks rather than one at a time.
+
+    Args:
+        chunks: Byte chunks to join.
+        size: Minimum size of each yielded chunk (except the last).
+
+    Yields:
+        The joined chunks, in order.
+    """
+    buffer: list[bytes] = []
+    buffered = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= size:
+            yield b"".join(buffer)
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a stream of chunks into a single gzip stream.
+
+    Args:
+        chunks: Uncompressed byte chunks.
+        level: zlib compression level.
+
+    Yields:
+        Chunks of the gzip stream; their concatenation is a valid .gz file.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
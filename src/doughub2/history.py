@@ -0,0 +1,123 @@
+"""Bounded in-memory history of received extractions.
+
+Only a few summary fields and the paths of the files written under
+EXTRACTION_DIR are kept per extraction, so memory stays flat no matter how
+many pages are extracted in a session. Full payloads are read back from
+those files on demand. Once the history is full, the least recently used
+entry is evicted.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# Fields of an extraction payload kept in memory
+SUMMARY_FIELDS = ("timestamp", "url", "hostname", "siteName", "elementCount")
+
+
+@dataclass
+class HistoryEntry:
+    """Summary of one received extraction."""
+
+    summary: dict[str, Any]
+    html_file: Path | None = None
+    json_file: Path | None = None
+
+
+class ExtractionHistory:
+    """An LRU-bounded mapping of extraction index to summary.
+
+    Indexes are assigned in arrival order and never reused until clear()
+    is called, so an evicted index simply stops resolving.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty history.
+
+        Args:
+            capacity: Maximum number of extractions to remember.
+        """
+        self.capacity = capacity
+        self._entries: OrderedDict[int, HistoryEntry] = OrderedDict()
+        self._received = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def received(self) -> int:
+        """Number of extractions recorded since the history was last cleared."""
+        return self._received
+
+    def append(
+        self,
+        data: dict[str, Any],
+        html_file: Path | None = None,
+        json_file: Path | None = None,
+    ) -> int:
+        """Record a received extraction.
+
+        Args:
+            data: Extraction payload; only SUMMARY_FIELDS are kept.
+            html_file: Path of the saved HTML, if any.
+            json_file: Path of the saved metadata JSON, if any.
+
+        Returns:
+            The index assigned to the extraction.
+        """
+        entry = HistoryEntry(
+            summary={field: data.get(field) for field in SUMMARY_FIELDS},
+            html_file=html_file,
+            json_file=json_file,
+        )
+        with self._lock:
+            index = self._received
+            self._received += 1
+            self._entries[index] = entry
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+        return index
+
+    def summaries(self) -> list[dict[str, Any]]:
+        """Get the summaries of all remembered extractions, oldest first."""
+        with self._lock:
+            return [
+                dict(entry.summary)
+                for _, entry in sorted(self._entries.items(), key=lambda kv: kv[0])
+            ]
+
+    def load(self, index: int) -> dict[str, Any] | None:
+        """Load the full payload of an extraction from its saved files.
+
+        Args:
+            index: Index returned by append().
+
+        Returns:
+            The payload as saved (metadata JSON plus pageHTML), the summary
+            alone if the entry has no files or they are missing, or None if
+            the index is unknown or evicted.
+        """
+        with self._lock:
+            entry = self._entries.get(index)
+            if entry is None:
+                return None
+            self._entries.move_to_end(index)
+
+        if entry.json_file is None or not entry.json_file.exists():
+            return dict(entry.summary)
+
+        data = json.loads(entry.json_file.read_text(encoding="utf-8"))
+        if entry.html_file is not None and entry.html_file.exists():
+            data["pageHTML"] = entry.html_file.read_text(encoding="utf-8")
+        return data
+
+    def clear(self) -> None:
+        """Forget all extractions and restart indexes at zero."""
+        with self._lock:
+            self._entries.clear()
+            self._received = 0
@@ -0,0 +1,215 @@
+"""Background job queue for ingest work.
+
+Requests that only need to hand work off (such as /extract) submit a job
+and return immediately. A fixed pool of worker threads processes jobs in
+submission order. The queue has a maximum depth: when it is full, submit()
+raises QueueFullError so the caller can push back on the client instead of
+accumulating unbounded work.
+
+Finished jobs are kept for a limited time so their status and result can be
+polled; the oldest finished jobs are forgotten once the history is full.
+"""
+
+import logging
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+from doughub2.config import settings
+
+logger = logging.getLogger("doughub2")
+
+# Job status values
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted to a queue that is at its depth limit."""
+
+
+@dataclass
+class Job:
+    """A unit of background work and its progress.
+
+    Attributes:
+        job_id: Unique identifier of the job.
+        payload: Handler-specific input for the job; cleared once it finishes.
+        status: One of queued, running, succeeded, failed.
+        stage: Free-form name of the step currently running, set by the handler.
+        created_at: When the job was submitted.
+        started_at: When a worker picked the job up.
+        finished_at: When the job succeeded or failed.
+        result: Value returned by the handler on success.
+        error: Error message on failure.
+        future: Resolved with the result (or exception) when the job finishes.
+    """
+
+    payload: Any
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = JOB_QUEUED
+    stage: str = JOB_QUEUED
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    result: Any = None
+    error: str | None = None
+    future: Future = field(default_factory=Future, repr=False)
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has finished, successfully or not."""
+        return self.status in (JOB_SUCCEEDED, JOB_FAILED)
+
+
+class JobQueue:
+    """A bounded FIFO of jobs processed by a pool of worker threads."""
+
+    def __init__(
+        self,
+        handler: Callable[[Job], Any],
+        workers: int = 2,
+        max_depth: int = 100,
+        history_size: int = 1000,
+        name: str = "doughub2-jobs",
+    ) -> None:
+        """Initialize the queue. Worker threads start on the first submit.
+
+        Args:
+            handler: Called with each job on a worker thread; its return
+                value becomes the job result, and any exception fails the job.
+            workers: Number of worker threads.
+            max_depth: Maximum number of jobs waiting to be processed.
+            history_size: Maximum number of jobs remembered for status lookups.
+            name: Thread name prefix for the workers.
+        """
+        self.handler = handler
+        self.workers = workers
+        self.max_depth = max_depth
+        self.history_size = history_size
+        self.name = name
+        self._queue: queue.Queue[Job | None] = queue.Queue(maxsize=max_depth)
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    @property
+    def depth(self) -> int:
+        """Number of jobs waiting to be processed."""
+        return self._queue.qsize()
+
+    def _start_workers(self) -> None:
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, name=f"{self.name}-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _remember(self, job: Job) -> None:
+        self._jobs[job.job_id] = job
+        # Forget the oldest finished jobs once the history is full
+        if len(self._jobs) > self.history_size:
+            for job_id in [j.job_id for j in self._jobs.values() if j.done]:
+                if len(self._jobs) <= self.history_size:
+                    break
+                del self._jobs[job_id]
+
+    def submit(self, payload: Any) -> Job:
+        """Queue a job for processing.
+
+        Args:
+            payload: Handler-specific input for the job.
+
+        Returns:
+            The queued Job.
+
+        Raises:
+            QueueFullError: If max_depth jobs are already waiting.
+        """
+        job = Job(payload=payload)
+        with self._lock:
+            self._start_workers()
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise QueueFullError(
+                    f"Queue is full ({self.max_depth} jobs waiting)"
+                ) from None
+            self._remember(job)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """Look up a job by ID.
+
+        Args:
+            job_id: ID returned by submit().
+
+        Returns:
+            The Job, or None if it is unknown or has been forgotten.
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+
+            job.status = JOB_RUNNING
+            job.started_at = datetime.now(timezone.utc)
+            try:
+                result = self.handler(job)
+            except Exception as e:
+                job.error = str(e) or type(e).__name__
+                job.finished_at = datetime.now(timezone.utc)
+                job.status = JOB_FAILED
+                logger.error("Job %s failed: %s", job.job_id, job.error)
+                job.future.set_exception(e)
+            else:
+                job.result = result
+                job.finished_at = datetime.now(timezone.utc)
+                job.status = JOB_SUCCEEDED
+                job.future.set_result(result)
+            finally:
+                # Finished jobs are kept for status lookups; drop their input
+                # so large payloads are not retained with them
+                job.payload = None
+
+    def shutdown(self) -> None:
+        """Stop the workers after the jobs already queued have been processed."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join()
+
+
+def create_ingest_queue(handler: Callable[[Job], Any]) -> JobQueue:
+    """Create a job queue sized by the INGEST_* settings.
+
+    Args:
+        handler: Function that processes each job.
+
+    Returns:
+        A new JobQueue.
+    """
+    return JobQueue(
+        handler,
+        workers=settings.INGEST_WORKERS,
+        max_depth=settings.INGEST_QUEUE_DEPTH,
+        history_size=settings.INGEST_JOB_HISTORY,
+        name="doughub2-ingest",
+    )
@@ -0,0 +1,126 @@
+"""In-memory index of questions already stored in the database.
+
+Lets clients ask "do you already have this question?" before uploading a
+full extraction. Questions are identified the same way persistence detects
+duplicates: by (source name, question key) and by (source name, body hash).
+
+The index is warmed from the database with a single projection query and
+kept current by adding each question after it is committed. Both sets hold
+only short strings, so even tens of thousands of questions take a few MB.
+"""
+
+import logging
+import threading
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from doughub2.models import Question, Source
+
+logger = logging.getLogger("doughub2")
+
+# Values for KnownQuestions.match()
+MATCH_SOURCE_KEY = "source_key"
+MATCH_BODY_HASH = "body_hash"
+
+
+class KnownQuestions:
+    """Set-backed lookup of stored question keys and body hashes."""
+
+    def __init__(self) -> None:
+        self._keys: set[tuple[str, str]] = set()
+        self._hashes: set[tuple[str, str]] = set()
+        self._warmed = False
+        self._lock = threading.Lock()
+
+    @property
+    def warmed(self) -> bool:
+        """Whether the index has been loaded from the database."""
+        return self._warmed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._keys)
+
+    def warm(self, session: Session) -> None:
+        """Load all stored question keys and body hashes.
+
+        Args:
+            session: Database session to read from.
+        """
+        stmt = select(
+            Source.name, Question.source_question_key, Question.body_hash
+        ).join(Source, Question.source_id == Source.source_id)
+
+        keys: set[tuple[str, str]] = set()
+        hashes: set[tuple[str, str]] = set()
+        for source_name, question_key, body_hash in session.execute(stmt):
+            keys.add((source_name, question_key))
+            if body_hash:
+                hashes.add((source_name, body_hash))
+
+        with self._lock:
+            # Merge rather than replace so inserts made while warming are kept
+            self._keys |= keys
+            self._hashes |= hashes
+            self._warmed = True
+        logger.info("Known question index warmed with %d question(s)", len(keys))
+
+    def ensure_warm(self, session: Session) -> None:
+        """Warm the index from the database if that has not happened yet.
+
+        Args:
+            session: Database session to read from.
+        """
+        if not self._warmed:
+            self.warm(session)
+
+    def add(
+        self, source_name: str, question_key: str, body_hash: str | None = None
+    ) -> None:
+        """Record a newly stored question.
+
+        Args:
+            source_name: Name of the question's source.
+            question_key: Question key within the source.
+            body_hash: Body text hash of the question, if known.
+        """
+        with self._lock:
+            self._keys.add((source_name, question_key))
+            if body_hash:
+                self._hashes.add((source_name, body_hash))
+
+    def match(
+        self,
+        source_name: str,
+        question_key: str | None = None,
+        body_hash: str | None = None,
+    ) -> str | None:
+        """Check whether a question is already stored.
+
+        Args:
+            source_name: Name of the question's source.
+            question_key: Question key within the source.
+            body_hash: Body text hash of the question.
+
+        Returns:
+            MATCH_SOURCE_KEY or MATCH_BODY_HASH describing what matched, or
+            None if the question is not known.
+        """
+        with self._lock:
+            if question_key and (source_name, question_key) in self._keys:
+                return MATCH_SOURCE_KEY
+            if body_hash and (source_name, body_hash) in self._hashes:
+                return MATCH_BODY_HASH
+        return None
+
+    def clear(self) -> None:
+        """Forget all questions; the next ensure_warm() reloads them."""
+        with self._lock:
+            self._keys.clear()
+            self._hashes.clear()
+            self._warmed = False
+
+
+# Process-wide index shared by the extraction endpoints
+known_questions = KnownQuestions()
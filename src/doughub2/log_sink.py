@@ -0,0 +1,274 @@
+"""Non-blocking logging into the logs table.
+
+Code on the request path should not wait for its log records: neither to
+format them nor to write them anywhere. DatabaseLogSink attaches a
+LazyQueueHandler to the "doughub2" logger, so logging a record only puts it
+on an in-memory queue. The message is not formatted there (its %-style
+arguments are merged later), and when the queue is full the record is
+dropped and counted rather than making the caller wait.
+
+A listener thread takes the records off the queue, formats them and
+inserts them into the logs table in batches: it waits up to
+LOG_FLUSH_INTERVAL after a record arrives for more, then inserts up to
+LOG_BATCH_SIZE records in one transaction. Every so often the same thread
+deletes the logs older than LOG_RETENTION_DAYS, a range delete on the
+timestamp index.
+
+Because formatting is deferred, arguments passed to a log call must not be
+mutated afterwards; log immutable values (numbers, strings, paths).
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from logging.handlers import QueueHandler
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from doughub2.config import settings
+from doughub2.database import get_session_local
+from doughub2.persistence.log_repository import LogRepository
+
+logger = logging.getLogger("doughub2")
+
+# Seconds between deletions of expired logs
+PRUNE_INTERVAL = 3600.0
+
+
+class LazyQueueHandler(QueueHandler):
+    """A QueueHandler that neither formats records nor blocks on a full queue.
+
+    The stock QueueHandler merges each record's message and arguments on
+    the logging thread; this one leaves that to the listener.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord | None]") -> None:
+        """Initialize the handler.
+
+        Args:
+            log_queue: Bounded queue the listener reads records from.
+        """
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Queue the record as it is; the listener formats it."""
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Queue the record, dropping it if the queue is full."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class DatabaseLogSink:
+    """Writes the records of a logger to the logs table from a thread."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        level: int = logging.INFO,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        queue_size: int = 10000,
+        retention: timedelta | None = None,
+        name: str = "doughub2-log-sink",
+    ) -> None:
+        """Initialize the sink. Records are collected once it is started.
+
+        Args:
+            session_factory: Creates the session each batch is written with.
+            level: Least severe level of the records written.
+            batch_size: Maximum number of records inserted together.
+            flush_interval: Seconds to wait for more records once one has
+                arrived; 0 inserts only the records already queued.
+            queue_size: Records held in memory before new ones are dropped.
+            retention: How long records are kept; None keeps them all.
+            name: Name of the listener thread.
+        """
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retention = retention
+        self.name = name
+        self.written = 0
+        self.failed = 0
+        self.pruned = 0
+        self._queue: queue.Queue[logging.LogRecord | None] = queue.Queue(queue_size)
+        self.handler = LazyQueueHandler(self._queue)
+        self.handler.setLevel(level)
+        self._formatter = logging.Formatter()
+        # Loggers the handler is attached to, with the level each had before
+        self._loggers: list[tuple[logging.Logger, int]] = []
+        self._thread: threading.Thread | None = None
+
+    @property
+    def dropped(self) -> int:
+        """Number of records dropped because the queue was full."""
+        return self.handler.dropped
+
+    def start(self, *loggers: logging.Logger) -> None:
+        """Start the listener thread and collect the records of loggers.
+
+        Loggers that would discard records at the sink's level (such as
+        the "doughub2" logger, which has no level of its own) are lowered
+        to it until the sink is stopped.
+        """
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._work, name=self.name, daemon=True)
+        self._thread.start()
+        for target in loggers:
+            self._loggers.append((target, target.level))
+            if not target.isEnabledFor(self.handler.level):
+                target.setLevel(self.handler.level)
+            target.addHandler(self.handler)
+
+    def _collect(
+        self, first: logging.LogRecord
+    ) -> tuple[list[logging.LogRecord], bool]:
+        """Gather the records queued within flush_interval of the first one.
+
+        Returns:
+            The batch, and whether stop was requested while collecting.
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                record = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if record is None:
+                return batch, True
+            batch.append(record)
+        return batch, False
+
+    def _work(self) -> None:
+        next_prune = time.monotonic()
+        stopping = False
+        while not stopping:
+            if self.retention is not None and time.monotonic() >= next_prune:
+                self._prune()
+                next_prune = time.monotonic() + PRUNE_INTERVAL
+            try:
+                first = self._queue.get(timeout=PRUNE_INTERVAL)
+            except queue.Empty:
+                continue
+            if first is None:
+                break
+            batch, stopping = self._collect(first)
+            self._write(batch)
+
+    def _row(self, record: logging.LogRecord) -> dict[str, Any]:
+        """Format a record into a logs table row."""
+        message = record.getMessage()
+        if record.exc_info:
+            message = f"{message}\n{self._formatter.formatException(record.exc_info)}"
+        if record.stack_info:
+            message = f"{message}\n{self._formatter.formatStack(record.stack_info)}"
+        timestamp = datetime.fromtimestamp(record.created, timezone.utc)
+        return {
+            "level": record.levelname,
+            "logger_name": record.name,
+            "message": message,
+            "timestamp": timestamp.replace(tzinfo=None),
+        }
+
+    def _write(self, batch: list[logging.LogRecord]) -> None:
+        """Insert a batch of records in one transaction."""
+        rows = []
+        for record in batch:
+            try:
+                rows.append(self._row(record))
+            except Exception:
+                self.handler.handleError(record)
+        session = self.session_factory()
+        try:
+            LogRepository(session).add_logs(rows)
+            session.commit()
+        except Exception:
+            # Not logged through the sink, which would feed the failure back in
+            session.rollback()
+            self.failed += len(rows)
+            self.handler.handleError(batch[0])
+        else:
+            self.written += len(rows)
+        finally:
+            session.close()
+
+    def _prune(self) -> None:
+        """Delete the records older than the retention period."""
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - self.retention
+        session = self.session_factory()
+        try:
+            self.pruned += LogRepository(session).delete_logs_before(cutoff)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.warning(f"Could not delete expired logs: {e}")
+        finally:
+            session.close()
+
+    def stop(self) -> None:
+        """Detach from the loggers and write the records already queued."""
+        for target, level in self._loggers:
+            target.removeHandler(self.handler)
+            target.setLevel(level)
+        self._loggers.clear()
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        # Wait for room rather than drop the stop request
+        self._queue.put(None)
+        thread.join()
+
+
+# Sink of the application logs (started by start_log_sink)
+_log_sink: DatabaseLogSink | None = None
+
+
+def start_log_sink() -> DatabaseLogSink | None:
+    """Start writing the "doughub2" logs to the logs table.
+
+    Does nothing when LOG_DB_LEVEL is empty.
+
+    Returns:
+        The running DatabaseLogSink, or None if the sink is disabled.
+
+    Raises:
+        ValueError: If LOG_DB_LEVEL is not a level name.
+    """
+    global _log_sink
+    if _log_sink is not None:
+        return _log_sink
+    if not settings.LOG_DB_LEVEL:
+        return None
+    level = logging.getLevelName(settings.LOG_DB_LEVEL.upper())
+    if not isinstance(level, int):
+        raise ValueError(f"Unknown LOG_DB_LEVEL: {settings.LOG_DB_LEVEL}")
+    days = settings.LOG_RETENTION_DAYS
+    _log_sink = DatabaseLogSink(
+        get_session_local(),
+        level=level,
+        batch_size=settings.LOG_BATCH_SIZE,
+        flush_interval=settings.LOG_FLUSH_INTERVAL,
+        queue_size=settings.LOG_QUEUE_SIZE,
+        retention=timedelta(days=days) if days > 0 else None,
+    )
+    _log_sink.start(logger)
+    return _log_sink
+
+
+def stop_log_sink() -> None:
+    """Write the queued logs and stop the sink started by start_log_sink."""
+    global _log_sink
+    if _log_sink is not None:
+        _log_sink.stop()
+        _log_sink = None
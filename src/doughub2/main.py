@@ -9,13 +9,27 @@ For CLI commands, see doughub2.cli module.
 
 import logging
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 
-from doughub2.api import extractions_router, questions_router
+from doughub2.api import (
+    extractions_router,
+    logs_router,
+    media_router,
+    questions_router,
+)
+from doughub2.api.extractions import shutdown_ingest_queue, warm_known_questions
+from doughub2.database import dispose_async_engine, get_engine
+from doughub2.downloader import close_downloader
+from doughub2.executors import run_db, shutdown_executors
+from doughub2.log_sink import start_log_sink, stop_log_sink
+from doughub2.maintenance import start_maintenance, stop_maintenance
+from doughub2.writer import shutdown_writer
 
 # =============================================================================
 # Project Root Configuration
@@ -40,10 +54,36 @@ logger = logging.getLogger("doughub2")
 # FastAPI Application
 # =============================================================================
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Manage process-wide resources for the lifetime of the application.
+
+    Shared resources are created lazily on first use; this releases them
+    on shutdown. The known question index is warmed up front so duplicate
+    pre-checks are answered from memory right away, and SQLite maintenance
+    (WAL checkpoints, planner statistics) runs in the background until
+    shutdown. Application logs are written to the logs table throughout,
+    and flushed last.
+    """
+    start_log_sink()
+    await run_db(warm_known_questions)
+    start_maintenance(get_engine())
+    yield
+    stop_maintenance()
+    shutdown_ingest_queue()
+    shutdown_writer()
+    await dispose_async_engine()
+    shutdown_executors()
+    close_downloader()
+    stop_log_sink()
+
+
 api_app = FastAPI(
     title="DougHub2 Extraction API",
     description="API for extracting questions from HTML/documents",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Enable CORS for all routes (needed for Tampermonkey userscript)
@@ -58,6 +98,8 @@ api_app.add_middleware(
 # Include API routers
 api_app.include_router(questions_router)
 api_app.include_router(extractions_router)
+api_app.include_router(media_router)
+api_app.include_router(logs_router)
 
 # =============================================================================
 # Static File Serving (Production)
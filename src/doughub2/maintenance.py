@@ -0,0 +1,158 @@
+"""Scheduled SQLite maintenance.
+
+In WAL mode SQLite copies committed pages back into the database file at
+checkpoints. It checkpoints automatically, but only passively, so under a
+steady stream of readers the -wal file keeps growing and reads slow down as
+they search it. The query planner similarly relies on statistics gathered
+by ANALYZE, which go stale as the question bank grows.
+
+A MaintenanceTask thread therefore periodically truncates the WAL with a
+full checkpoint and refreshes the planner statistics: ANALYZE the first time
+(when the database has none), PRAGMA optimize afterwards, which only
+re-analyzes tables whose statistics are out of date.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+
+from sqlalchemy import Engine, text
+
+from doughub2.config import settings
+
+logger = logging.getLogger("doughub2")
+
+
+@dataclass
+class MaintenanceResult:
+    """Outcome of one maintenance run.
+
+    Attributes:
+        checkpoint_busy: True if readers or writers kept the checkpoint from
+            completing; it is retried on the next run.
+        wal_pages: Pages in the WAL when the checkpoint started.
+        checkpointed_pages: Pages copied back into the database.
+        analyzed: True if a full ANALYZE was run instead of PRAGMA optimize.
+    """
+
+    checkpoint_busy: bool
+    wal_pages: int
+    checkpointed_pages: int
+    analyzed: bool
+
+
+def run_maintenance(engine: Engine) -> MaintenanceResult:
+    """Checkpoint the WAL and refresh the query planner statistics.
+
+    Args:
+        engine: Engine bound to an SQLite database.
+
+    Returns:
+        MaintenanceResult describing what was done.
+    """
+    with engine.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        # A passive checkpoint reports the WAL's size; TRUNCATE then resets
+        # the file, but reports it as empty
+        _, wal_pages, checkpointed = conn.execute(
+            text("PRAGMA wal_checkpoint(PASSIVE)")
+        ).one()
+        busy = conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)")).scalar()
+        has_stats = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+        ).scalar()
+        if has_stats:
+            conn.execute(text("PRAGMA optimize"))
+        else:
+            conn.execute(text("ANALYZE"))
+    return MaintenanceResult(
+        checkpoint_busy=bool(busy),
+        wal_pages=wal_pages,
+        checkpointed_pages=checkpointed,
+        analyzed=not has_stats,
+    )
+
+
+class MaintenanceTask:
+    """Runs run_maintenance on a background thread at a fixed interval."""
+
+    def __init__(self, engine: Engine, interval: float) -> None:
+        """Initialize the task. The thread starts with start().
+
+        Args:
+            engine: Engine bound to the SQLite database to maintain.
+            interval: Seconds between runs.
+        """
+        self.engine = engine
+        self.interval = interval
+        self.runs = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the maintenance thread; the first run is one interval away."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="doughub2-db-maintenance", daemon=True
+        )
+        self._thread.start()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                result = run_maintenance(self.engine)
+            except Exception as e:
+                logger.error(f"Database maintenance failed: {e}")
+                continue
+            self.runs += 1
+            logger.debug(
+                f"Database maintenance: checkpointed {result.checkpointed_pages}"
+                f"/{result.wal_pages} WAL pages"
+                f"{' (busy)' if result.checkpoint_busy else ''}, "
+                f"{'analyzed' if result.analyzed else 'optimized'}"
+            )
+
+    def stop(self) -> None:
+        """Stop the thread, waiting for a run in progress to finish."""
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join()
+
+
+# Maintenance of the application database (started by start_maintenance)
+_maintenance: MaintenanceTask | None = None
+
+
+def start_maintenance(engine: Engine) -> MaintenanceTask | None:
+    """Start maintaining the application database in the background.
+
+    Does nothing for non-SQLite databases or when SQLITE_MAINTENANCE_INTERVAL
+    is 0.
+
+    Args:
+        engine: The application's database engine.
+
+    Returns:
+        The running MaintenanceTask, or None if maintenance is disabled.
+    """
+    global _maintenance
+    if _maintenance is not None:
+        return _maintenance
+    interval = settings.SQLITE_MAINTENANCE_INTERVAL
+    if engine.dialect.name != "sqlite" or interval <= 0:
+        return None
+    _maintenance = MaintenanceTask(engine, interval)
+    _maintenance.start()
+    return _maintenance
+
+
+def stop_maintenance() -> None:
+    """Stop the background maintenance started by start_maintenance."""
+    global _maintenance
+    if _maintenance is not None:
+        _maintenance.stop()
+        _maintenance = None
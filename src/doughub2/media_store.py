@@ -0,0 +1,117 @@
+"""Content-addressed storage for media files.
+
+Each distinct file is stored once under MEDIA_ROOT, named by the SHA-256 of
+its content alone:
+
+    MEDIA_ROOT/blobs/<first two hex digits>/<sha256>
+
+Images shared by many questions (figures, logos) therefore take up disk
+space only once, whatever extension each download was saved with. The MIME
+type is kept on the Media row, not in the blob name. (Blobs stored before
+this carry their extension; their rows keep pointing at them.) Blobs are created by hardlinking the downloaded file rather
+than copying it; a copy is made only when linking is not possible (e.g. the
+extraction directory is on a different filesystem). When a blob already
+exists, the downloaded duplicate is replaced by a link to it so the
+extraction directory does not keep a second physical copy either.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+logger = logging.getLogger("doughub2")
+
+# Directory under MEDIA_ROOT holding the blobs
+BLOB_DIR = "blobs"
+
+# Read size used when hashing files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: Path) -> str:
+    """Compute the SHA-256 of a file's content.
+
+    Args:
+        path: Path to the file.
+
+    Returns:
+        Hex digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def blob_relative_path(sha256: str) -> str:
+    """Get the path of a blob relative to MEDIA_ROOT.
+
+    Args:
+        sha256: Hex digest of the blob content.
+
+    Returns:
+        Relative path using forward slashes.
+    """
+    return f"{BLOB_DIR}/{sha256[:2]}/{sha256}"
+
+
+def _link_or_copy(source_path: Path, dest_path: Path) -> None:
+    """Create dest_path as a hardlink to source_path, copying if linking fails."""
+    tmp_path = dest_path.with_name(f"{dest_path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        try:
+            os.link(source_path, tmp_path)
+        except OSError:
+            shutil.copy2(source_path, tmp_path)
+        os.replace(tmp_path, dest_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _relink_duplicate(source_path: Path, blob_path: Path) -> None:
+    """Replace a duplicate file with a hardlink to the existing blob."""
+    try:
+        if os.path.samefile(source_path, blob_path):
+            return
+        tmp_path = source_path.with_name(f"{source_path.name}.{uuid.uuid4().hex}.tmp")
+        os.link(blob_path, tmp_path)
+        os.replace(tmp_path, source_path)
+    except OSError as e:
+        # Not fatal: the duplicate just keeps its own copy
+        logger.debug("Could not relink %s to blob: %s", source_path, e)
+
+
+def store_file(
+    source_path: Path, media_root: Path, sha256: str | None = None
+) -> tuple[str, str]:
+    """Store a file in the content-addressed media store.
+
+    Args:
+        source_path: File to store. It is left in place.
+        media_root: Root directory of the media store.
+        sha256: Hex digest of the file content, if already known (the
+            downloader computes it while streaming); hashed here otherwise.
+
+    Returns:
+        Tuple of (sha256, path of the blob relative to media_root).
+    """
+    source_path = Path(source_path)
+    if sha256 is None:
+        sha256 = hash_file(source_path)
+
+    relative_path = blob_relative_path(sha256)
+    blob_path = Path(media_root) / relative_path
+
+    if blob_path.exists():
+        _relink_duplicate(source_path, blob_path)
+        logger.info("Media already stored: %s", relative_path)
+    else:
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        _link_or_copy(source_path, blob_path)
+        logger.info("Stored media: %s", relative_path)
+
+    return sha256, relative_path
@@ -3,18 +3,41 @@
 This module contains SQLAlchemy models for the question extraction feature.
 """
 
+from datetime import datetime
+
 from sqlalchemy import (
+    DDL,
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
+    event,
+    literal_column,
+    text,
 )
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
+from doughub2.compression import CompressedText
+
+# Question timestamps are stored on SQLite the way CURRENT_TIMESTAMP (the
+# func.now() defaults) writes them, in whole seconds. Values bound from
+# Python, such as keyset pagination cursors, then compare as equal strings
+# to server-written ones instead of sorting after them for the ".000000".
+Timestamp = DateTime().with_variant(
+    sqlite.DATETIME(
+        storage_format=(
+            "%(year)04d-%(month)02d-%(day)02d " "%(hour)02d:%(minute)02d:%(second)02d"
+        )
+    ),
+    "sqlite",
+)
+
 
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy models."""
@@ -54,12 +77,24 @@ class Question(Base):
         question_id: Primary key.
         source_id: Foreign key to Source.
         source_question_key: Unique key within the source (for idempotency).
-        raw_html: The raw HTML content of the question.
-        raw_metadata_json: JSON metadata as a string.
+        raw_html: The raw HTML content of the question, stored compressed.
+            Deferred: loaded on first access (group "content").
+        raw_metadata_json: JSON metadata as a string, stored compressed.
+            Deferred like raw_html.
         status: Status of the question (e.g., 'extracted', 'processed').
         extraction_path: Original file path where the question was extracted.
+        body_hash: SHA-256 of the normalized body text, used for duplicate
+            detection through the (source_id, body_hash) index.
+        body_text, url, hostname, extracted_at, title, category: Fields of
+            raw_metadata_json (bodyText, url, hostname, timestamp, title,
+            category) copied into columns at ingest so they can be read,
+            filtered and sorted without parsing the JSON. body_text is
+            deferred with the content.
         created_at: Timestamp when the record was created.
         updated_at: Timestamp when the record was last updated.
+        version: Incremented by every write that changes the question's
+            detail, so its ETag changes even when two writes share an
+            updated_at second.
         source: Relationship to the Source.
         media: Relationship to associated Media files.
     """
@@ -67,6 +102,13 @@ class Question(Base):
     __tablename__ = "questions"
     __table_args__ = (
         UniqueConstraint("source_id", "source_question_key", name="uq_source_question"),
+        Index("ix_questions_source_body_hash", "source_id", "body_hash"),
+        # Keyset pagination orders: (sort column, question_id)
+        Index("ix_questions_created_at_id", "created_at", "question_id"),
+        Index("ix_questions_updated_at_id", "updated_at", "question_id"),
+        # Browser filters, paged by question_id
+        Index("ix_questions_hostname_id", "hostname", "question_id"),
+        Index("ix_questions_category_id", "category", "question_id"),
     )
 
     question_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -74,16 +116,38 @@ class Question(Base):
         Integer, ForeignKey("sources.source_id"), nullable=False, index=True
     )
     source_question_key = Column(String(255), nullable=False, index=True)
-    raw_html = Column(Text, nullable=False)
-    raw_metadata_json = Column(Text, nullable=False)
+    # Large columns are deferred so listing and lookups don't load them
+    raw_html: Mapped[str] = mapped_column(
+        CompressedText, nullable=False, deferred=True, deferred_group="content"
+    )
+    raw_metadata_json: Mapped[str] = mapped_column(
+        CompressedText, nullable=False, deferred=True, deferred_group="content"
+    )
     status = Column(String(50), default="extracted", nullable=False)
     extraction_path = Column(String(512), nullable=True)
     note_path: Mapped[str | None] = mapped_column(String, nullable=True)
     tags: Mapped[str | None] = mapped_column(String, nullable=True)
     state: Mapped[str | None] = mapped_column(String, nullable=True)
-    created_at = Column(DateTime, default=func.now(), nullable=False)
+    body_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Promoted from raw_metadata_json
+    body_text: Mapped[str | None] = mapped_column(
+        Text, nullable=True, deferred=True, deferred_group="content"
+    )
+    url: Mapped[str | None] = mapped_column(String(2048), nullable=True)
+    hostname: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    extracted_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    title: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    category: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    created_at = Column(Timestamp, default=func.now(), nullable=False)
     updated_at = Column(
-        DateTime, default=func.now(), onupdate=func.now(), nullable=False
+        Timestamp, default=func.now(), onupdate=func.now(), nullable=False
+    )
+    version: Mapped[int] = mapped_column(
+        Integer,
+        default=1,
+        server_default=text("1"),
+        onupdate=literal_column("questions.version", Integer) + 1,
+        nullable=False,
     )
 
     # Relationships
@@ -105,7 +169,10 @@ class Media(Base):
         media_role: Role of the media (e.g., 'image', 'audio').
         media_type: Type/subtype (e.g., 'question_image', 'explanation_image').
         mime_type: MIME type (e.g., 'image/jpeg').
-        relative_path: Path to the media file relative to MEDIA_ROOT.
+        relative_path: Path to the media file relative to MEDIA_ROOT. New
+            media resolves to a content-addressed blob shared by every
+            question that uses the same file.
+        sha256: SHA-256 of the file content, if stored by content.
         question: Relationship to the Question.
     """
 
@@ -119,6 +186,7 @@ class Media(Base):
     media_type = Column(String(100), nullable=True)
     mime_type = Column(String(100), nullable=False)
     relative_path = Column(String(512), nullable=False)
+    sha256: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
 
     # Relationships
     question = relationship("Question", back_populates="media")
@@ -127,6 +195,80 @@ class Media(Base):
         return f"<Media(id={self.media_id}, role='{self.media_role}', path='{self.relative_path}')>"
 
 
+class Tag(Base):
+    """A distinct tag name used by questions.
+
+    Names are compared case-insensitively (NOCASE), so "Cardio" and
+    "cardio" are the same tag and prefix matches can use the name index.
+
+    Attributes:
+        tag_id: Primary key.
+        name: Tag name as first written.
+    """
+
+    __tablename__ = "tags"
+
+    tag_id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(255, collation="NOCASE"), unique=True, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<Tag(id={self.tag_id}, name='{self.name}')>"
+
+
+class QuestionTag(Base):
+    """Associates a question with one of its tags.
+
+    The normalized, indexed form of Question.tags, kept in sync by
+    QuestionRepository. The primary key serves lookups by question; the
+    (tag_id, question_id) index serves tag filters and per-tag counts.
+
+    Attributes:
+        question_id: Foreign key to Question.
+        tag_id: Foreign key to Tag.
+    """
+
+    __tablename__ = "question_tags"
+    __table_args__ = (
+        Index("ix_question_tags_tag_question", "tag_id", "question_id"),
+        {"sqlite_with_rowid": False},
+    )
+
+    question_id = Column(
+        Integer,
+        ForeignKey("questions.question_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    tag_id = Column(
+        Integer, ForeignKey("tags.tag_id", ondelete="CASCADE"), primary_key=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<QuestionTag(question={self.question_id}, tag={self.tag_id})>"
+
+
+class QuestionStats(Base):
+    """Change counter and row count of the question listing.
+
+    A single row (stats_id 1) maintained by SQLite triggers (see below), so
+    listings can be validated and counted without scanning questions.
+
+    Attributes:
+        stats_id: Primary key; always 1.
+        version: Incremented by every insert, update and delete of a
+            question, and by every change to question_tags.
+        question_count: Number of rows in questions.
+    """
+
+    __tablename__ = "question_stats"
+
+    stats_id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    question_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<QuestionStats(version={self.version}, count={self.question_count})>"
+
+
 class Log(Base):
     """Represents a log entry persisted to the database.
 
@@ -148,3 +290,51 @@ class Log(Base):
 
     def __repr__(self) -> str:
         return f"<Log(id={self.log_id}, level='{self.level}', logger='{self.logger_name}')>"
+
+
+# Full-text search index over questions (SQLite FTS5). The rowid of each entry
+# is the question_id. Columns: body (question body text), content (text of
+# the stored HTML), tags (space-separated). It is not a mapped table, so it is
+# created and dropped alongside the metadata and kept in sync explicitly by
+# QuestionRepository.
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5("
+        "body, content, tags, "
+        "tokenize='porter unicode61 remove_diacritics 2')"
+    ).execute_if(dialect="sqlite"),
+)
+event.listen(
+    Base.metadata,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS questions_fts").execute_if(dialect="sqlite"),
+)
+
+# Triggers keeping question_stats current. The row is seeded with the
+# count of questions the first time, so existing databases start right.
+_QUESTION_STATS_DDL = [
+    "INSERT OR IGNORE INTO question_stats (stats_id, version, question_count) "
+    "SELECT 1, 0, count(*) FROM questions",
+    "CREATE TRIGGER IF NOT EXISTS question_stats_insert AFTER INSERT ON questions "
+    "BEGIN UPDATE question_stats SET version = version + 1, "
+    "question_count = question_count + 1 WHERE stats_id = 1; END",
+    "CREATE TRIGGER IF NOT EXISTS question_stats_delete AFTER DELETE ON questions "
+    "BEGIN UPDATE question_stats SET version = version + 1, "
+    "question_count = question_count - 1 WHERE stats_id = 1; END",
+    "CREATE TRIGGER IF NOT EXISTS question_stats_update AFTER UPDATE ON questions "
+    "BEGIN UPDATE question_stats SET version = version + 1 WHERE stats_id = 1; END",
+    "CREATE TRIGGER IF NOT EXISTS question_stats_tag_insert "
+    "AFTER INSERT ON question_tags "
+    "BEGIN UPDATE question_stats SET version = version + 1 WHERE stats_id = 1; END",
+    "CREATE TRIGGER IF NOT EXISTS question_stats_tag_delete "
+    "AFTER DELETE ON question_tags "
+    "BEGIN UPDATE question_stats SET version = version + 1 WHERE stats_id = 1; END",
+]
+for _statement in _QUESTION_STATS_DDL:
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
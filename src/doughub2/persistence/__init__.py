@@ -1,5 +1,16 @@
 """Persistence layer for DougHub2."""
 
-from doughub2.persistence.repository import QuestionRepository
+from doughub2.persistence.async_repository import (
+    AsyncLogRepository,
+    AsyncQuestionRepository,
+)
+from doughub2.persistence.log_repository import LogRepository
+from doughub2.persistence.repository import QuestionRepository, compute_body_hash
 
-__all__ = ["QuestionRepository"]
+__all__ = [
+    "AsyncLogRepository",
+    "AsyncQuestionRepository",
+    "LogRepository",
+    "QuestionRepository",
+    "compute_body_hash",
+]
@@ -0,0 +1,215 @@
+"""Async access to the question repository for the API routers.
+
+The queries themselves live in QuestionRepository. AsyncQuestionRepository
+runs them on an AsyncSession through ``AsyncSession.run_sync``: the
+repository code runs unchanged, but every database round trip is awaited
+through the async driver (aiosqlite), so a query does not block the event
+loop while it runs. This does not make queries faster: SQLite's work is
+CPU-bound and aiosqlite adds a thread hand-off per query, so on a single
+core throughput is lower than querying on the loop (see
+benchmarks/load_api.py).
+
+Objects returned here are detached from any further lazy loading: only the
+attributes loaded by the query (see the include_* options) can be read once
+a method returns.
+"""
+
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any, Concatenate, ParamSpec, TypeVar
+
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from doughub2.models import Log, Media, Question, Source
+from doughub2.persistence.log_repository import LogRepository
+from doughub2.persistence.repository import QuestionRepository
+from doughub2.search import SearchHit, SearchQuery
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+class AsyncQuestionRepository:
+    """Async counterpart of QuestionRepository for use on the event loop."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize the repository with an async database session.
+
+        Args:
+            session: SQLAlchemy async session for database operations.
+        """
+        self.session = session
+
+    async def _run(
+        self,
+        method: Callable[Concatenate[QuestionRepository, P], T],
+        *args: P.args,
+        **kwargs: P.kwargs,
+    ) -> T:
+        """Call a QuestionRepository method on this session's sync session."""
+        return await self.session.run_sync(
+            lambda session: method(QuestionRepository(session), *args, **kwargs)
+        )
+
+    async def get_or_create_source(
+        self, name: str, description: str | None = None
+    ) -> Source:
+        """Find a source by name or create it (see QuestionRepository)."""
+        return await self._run(
+            QuestionRepository.get_or_create_source, name, description
+        )
+
+    async def add_question(self, question_data: dict[str, Any]) -> Question:
+        """Add or update a question (see QuestionRepository)."""
+        return await self._run(QuestionRepository.add_question, question_data)
+
+    async def add_questions(self, questions_data: list[dict[str, Any]]) -> list[int]:
+        """Add or update many questions (see QuestionRepository)."""
+        return await self._run(QuestionRepository.add_questions, questions_data)
+
+    async def add_media(self, media_rows: list[dict[str, Any]]) -> list[int]:
+        """Add many media records (see QuestionRepository)."""
+        return await self._run(QuestionRepository.add_media, media_rows)
+
+    async def update_question_from_metadata(self, metadata: dict[str, Any]) -> bool:
+        """Update a question's tags and state (see QuestionRepository)."""
+        return await self._run(
+            QuestionRepository.update_question_from_metadata, metadata
+        )
+
+    async def get_media_by_id(self, media_id: int) -> Media | None:
+        """Retrieve a media record by its ID."""
+        return await self._run(QuestionRepository.get_media_by_id, media_id)
+
+    async def get_question_by_id(
+        self,
+        question_id: int,
+        include_content: bool = False,
+        include_media: bool = False,
+        include_source: bool = False,
+    ) -> Question | None:
+        """Retrieve a question by its ID (see QuestionRepository)."""
+        return await self._run(
+            QuestionRepository.get_question_by_id,
+            question_id,
+            include_content=include_content,
+            include_media=include_media,
+            include_source=include_source,
+        )
+
+    async def get_questions_by_ids(
+        self,
+        question_ids: list[int],
+        include_content: bool = False,
+        include_media: bool = False,
+    ) -> list[Question]:
+        """Retrieve several questions by ID (see QuestionRepository)."""
+        return await self._run(
+            QuestionRepository.get_questions_by_ids,
+            question_ids,
+            include_content=include_content,
+            include_media=include_media,
+        )
+
+    async def list_question_summaries(
+        self,
+        limit: int,
+        sort: str = "id",
+        descending: bool = False,
+        after: tuple[Any, int] | None = None,
+        hostname: str | None = None,
+        category: str | None = None,
+        tag: str | None = None,
+    ) -> list[Row]:
+        """Get a page of question summaries (see QuestionRepository)."""
+        return await self._run(
+            QuestionRepository.list_question_summaries,
+            limit,
+            sort=sort,
+            descending=descending,
+            after=after,
+            hostname=hostname,
+            category=category,
+            tag=tag,
+        )
+
+    async def count_questions(
+        self,
+        hostname: str | None = None,
+        category: str | None = None,
+        tag: str | None = None,
+    ) -> int:
+        """Count stored questions (see QuestionRepository)."""
+        return await self._run(
+            QuestionRepository.count_questions,
+            hostname=hostname,
+            category=category,
+            tag=tag,
+        )
+
+    async def count_questions_by_tag(self) -> list[Row]:
+        """Count the questions carrying each tag (see QuestionRepository)."""
+        return await self._run(QuestionRepository.count_questions_by_tag)
+
+    async def get_question_version(self, question_id: int) -> Row | None:
+        """Get which version of a question is stored (see QuestionRepository)."""
+        return await self._run(QuestionRepository.get_question_version, question_id)
+
+    async def get_questions_version(self) -> Row:
+        """Summarize the question collection's state (see QuestionRepository)."""
+        return await self._run(QuestionRepository.get_questions_version)
+
+    async def search_questions(
+        self,
+        query: SearchQuery,
+        limit: int,
+        after: tuple[float | None, int] | None = None,
+    ) -> list[SearchHit]:
+        """Search questions (see QuestionRepository)."""
+        return await self._run(
+            QuestionRepository.search_questions, query, limit, after=after
+        )
+
+    async def count_search_results(self, query: SearchQuery) -> int:
+        """Count the questions a search matches (see QuestionRepository)."""
+        return await self._run(QuestionRepository.count_search_results, query)
+
+    async def commit(self) -> None:
+        """Commit the current transaction."""
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        """Rollback the current transaction."""
+        await self.session.rollback()
+
+
+class AsyncLogRepository:
+    """Async counterpart of LogRepository for use on the event loop."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize the repository with an async database session.
+
+        Args:
+            session: SQLAlchemy async session for database operations.
+        """
+        self.session = session
+
+    async def list_logs(
+        self,
+        limit: int,
+        level: str | None = None,
+        logger_name: str | None = None,
+        since: datetime | None = None,
+        before_id: int | None = None,
+    ) -> list[Log]:
+        """Retrieve recent log records (see LogRepository)."""
+        return await self.session.run_sync(
+            lambda session: LogRepository(session).list_logs(
+                limit,
+                level=level,
+                logger_name=logger_name,
+                since=since,
+                before_id=before_id,
+            )
+        )
@@ -0,0 +1,107 @@
+"""Repository for the log records persisted in the logs table."""
+
+import logging
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from doughub2.models import Log
+
+# Level names stored in Log.level, from least to most severe
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+
+def levels_at_or_above(level: str) -> list[str]:
+    """Get the level names at least as severe as a level.
+
+    Args:
+        level: One of LOG_LEVELS.
+
+    Returns:
+        The level names from level up.
+
+    Raises:
+        ValueError: If the level is unknown.
+    """
+    if level not in LOG_LEVELS:
+        raise ValueError(f"Unknown log level: {level}")
+    threshold = logging.getLevelName(level)
+    return [name for name in LOG_LEVELS if logging.getLevelName(name) >= threshold]
+
+
+class LogRepository:
+    """Handles database operations for persisted log records."""
+
+    def __init__(self, session: Session) -> None:
+        """Initialize the repository with a database session.
+
+        Args:
+            session: SQLAlchemy session for database operations.
+        """
+        self.session = session
+
+    def add_logs(self, rows: list[dict[str, Any]]) -> None:
+        """Insert many log records with one executemany.
+
+        Args:
+            rows: Dictionaries with level, logger_name, message and
+                timestamp.
+        """
+        if rows:
+            self.session.execute(insert(Log), rows)
+
+    def delete_logs_before(self, cutoff: datetime) -> int:
+        """Delete the log records older than a cutoff.
+
+        Args:
+            cutoff: Records with an earlier timestamp are deleted.
+
+        Returns:
+            Number of records deleted.
+        """
+        result = self.session.execute(
+            delete(Log).where(Log.timestamp < cutoff),
+            execution_options={"synchronize_session": False},
+        )
+        return result.rowcount
+
+    def list_logs(
+        self,
+        limit: int,
+        level: str | None = None,
+        logger_name: str | None = None,
+        since: datetime | None = None,
+        before_id: int | None = None,
+    ) -> list[Log]:
+        """Retrieve recent log records, newest first.
+
+        Each filter is answered from the index on its column (level,
+        logger_name, timestamp). Pages continue below the log_id of the
+        previous page's last record.
+
+        Args:
+            limit: Maximum number of records to return.
+            level: Only return records of this level or a more severe one.
+            logger_name: Only return records of this logger.
+            since: Only return records logged at or after this time (UTC).
+            before_id: Only return records with a smaller log_id.
+
+        Returns:
+            Log records in descending log_id order.
+
+        Raises:
+            ValueError: If the level is unknown.
+        """
+        stmt = select(Log)
+        if level is not None:
+            stmt = stmt.where(Log.level.in_(levels_at_or_above(level)))
+        if logger_name is not None:
+            stmt = stmt.where(Log.logger_name == logger_name)
+        if since is not None:
+            stmt = stmt.where(Log.timestamp >= since)
+        if before_id is not None:
+            stmt = stmt.where(Log.log_id < before_id)
+        stmt = stmt.order_by(Log.log_id.desc()).limit(limit)
+        return list(self.session.execute(stmt).scalars())
@@ -1,18 +1,111 @@
 """Repository for managing question persistence operations."""
 
+import hashlib
 import json
 import logging
+import re
+import unicodedata
+from collections import defaultdict
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    LargeBinary,
+    and_,
+    bindparam,
+    cast,
+    delete,
+    event,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, joinedload, selectinload, undefer_group
 
 from doughub2 import config
-from doughub2.models import Media, Question, Source
+from doughub2.compression import CODEC_PREFIXES, MIN_COMPRESS_BYTES
+from doughub2.detail_cache import question_detail_cache
+from doughub2.models import (
+    Media,
+    Question,
+    QuestionStats,
+    QuestionTag,
+    Source,
+    Tag,
+)
+from doughub2.search import (
+    SearchHit,
+    SearchQuery,
+    body_text_from_metadata,
+    build_match_expression,
+    html_to_text,
+    parse_tags,
+    questions_fts,
+    tag_key,
+    tags_to_text,
+)
 
 logger = logging.getLogger(__name__)
 
+# Whitespace collapsed by compute_body_hash: the Unicode White_Space
+# characters, spelled out because str.split() and JavaScript's \s disagree
+# (on U+001C-U+001F and U+FEFF). The userscript's computeBodyHash uses this
+# exact class as BODY_WHITESPACE; change both together.
+BODY_WHITESPACE = re.compile(
+    r"[\t\n\v\f\r \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]+"
+)
+
+# Sort keys accepted by list_question_summaries, mapped to their order column.
+# Every order is made unique by question_id as a tie-breaker.
+QUESTION_SORT_COLUMNS = {
+    "id": Question.question_id,
+    "created_at": Question.created_at,
+    "updated_at": Question.updated_at,
+    "source": Source.name,
+}
+
+
+# Question columns copied out of raw_metadata_json at ingest, by metadata key
+METADATA_COLUMNS = {
+    "bodyText": "body_text",
+    "url": "url",
+    "hostname": "hostname",
+    "timestamp": "extracted_at",
+    "title": "title",
+    "category": "category",
+}
+
+# Session.info key of the questions written in the session's transaction
+_INVALIDATED_KEY = "invalidated_question_ids"
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_questions(session: Session) -> None:
+    """Invalidate cached details of the questions a transaction wrote.
+
+    Entries are already dropped when the write is made; dropping them again
+    once it is committed removes any copy a concurrent reader cached from
+    the previous version in between.
+    """
+    for question_id in session.info.pop(_INVALIDATED_KEY, ()):
+        question_detail_cache.invalidate(question_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_questions(session: Session) -> None:
+    """Discard the questions written by a transaction that was rolled back."""
+    session.info.pop(_INVALIDATED_KEY, None)
+
 
 def _serialize_tags(tags: Any) -> str | None:
     """Convert tags to a string representation for storage.
@@ -34,6 +127,115 @@ def _serialize_tags(tags: Any) -> str | None:
     return json.dumps(tags)
 
 
+def compute_body_hash(body_text: str) -> str:
+    """Compute the duplicate-detection hash for a question's body text.
+
+    The text is NFC-normalized and its runs of BODY_WHITESPACE collapsed to
+    single spaces before hashing, so re-scrapes that differ only in layout
+    whitespace hash identically.
+
+    Args:
+        body_text: The body text of the question.
+
+    Returns:
+        Hex-encoded SHA-256 digest of the normalized text.
+    """
+    words = BODY_WHITESPACE.split(unicodedata.normalize("NFC", body_text))
+    normalized = " ".join(word for word in words if word)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=32)
+def _upsert_questions(table: Any, fields: tuple[str, ...]) -> Any:
+    """Build an INSERT ... ON CONFLICT DO UPDATE of questions.
+
+    A question whose (source_id, source_question_key) already exists has the
+    given fields overwritten and its updated_at and version bumped; fields
+    that are not given keep their stored values. Statements are cached per
+    field set: resolving the ``excluded`` columns costs more than the insert
+    itself.
+
+    Args:
+        table: Question, or its Table for Core executemany.
+        fields: Fields the inserted rows provide, sorted.
+
+    Returns:
+        The insert statement.
+    """
+    stmt = sqlite_insert(table)
+    updates = {
+        field: stmt.excluded[field]
+        for field in fields
+        if field not in ("source_id", "source_question_key")
+    }
+    return stmt.on_conflict_do_update(
+        index_elements=["source_id", "source_question_key"],
+        set_={**updates, "updated_at": func.now(), "version": Question.version + 1},
+    )
+
+
+def _like_prefix(prefix: str) -> str:
+    """Build a LIKE pattern (escape character backslash) matching a prefix.
+
+    Built in Python rather than with startswith(autoescape=True) so that
+    SQLite sees a plain bound pattern and can use an index on the column.
+    """
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def _parse_timestamp(value: str) -> datetime | None:
+    """Parse an ISO 8601 extraction timestamp into naive UTC."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _metadata_columns(raw_metadata_json: str | None) -> dict[str, Any]:
+    """Derive the promoted Question columns from a question's metadata JSON.
+
+    Args:
+        raw_metadata_json: The stored metadata JSON string.
+
+    Returns:
+        A value for each column of METADATA_COLUMNS and for body_hash; None
+        where the metadata lacks the field or it is not a non-empty string.
+    """
+    values: dict[str, Any] = dict.fromkeys([*METADATA_COLUMNS.values(), "body_hash"])
+    try:
+        metadata = json.loads(raw_metadata_json) if raw_metadata_json else {}
+    except json.JSONDecodeError:
+        return values
+    if not isinstance(metadata, dict):
+        return values
+
+    for key, column in METADATA_COLUMNS.items():
+        value = metadata.get(key)
+        if isinstance(value, str) and value:
+            values[column] = value
+    if values["extracted_at"] is not None:
+        values["extracted_at"] = _parse_timestamp(values["extracted_at"])
+    if values["body_text"] is not None:
+        values["body_hash"] = compute_body_hash(values["body_text"])
+    return values
+
+
+def _body_hash_from_metadata(raw_metadata_json: str | None) -> str | None:
+    """Derive the body hash from a question's raw metadata JSON.
+
+    Args:
+        raw_metadata_json: The stored metadata JSON string.
+
+    Returns:
+        The body hash, or None if the metadata has no body text.
+    """
+    return _metadata_columns(raw_metadata_json)["body_hash"]
+
+
 class QuestionRepository:
     """Handles database operations for questions, sources, and media.
 
@@ -49,11 +251,22 @@ class QuestionRepository:
         """
         self.session = session
 
+    def _invalidate_detail(self, question_id: int) -> None:
+        """Drop a question's cached detail response after writing to it.
+
+        Args:
+            question_id: ID of the modified question.
+        """
+        question_detail_cache.invalidate(question_id)
+        self.session.info.setdefault(_INVALIDATED_KEY, set()).add(question_id)
+
     def get_or_create_source(self, name: str, description: str | None = None) -> Source:
         """Find a source by name or create it if it doesn't exist.
 
         This method is idempotent - calling it multiple times with the same
-        name will return the same source without creating duplicates.
+        name will return the same source without creating duplicates. The
+        insert is an INSERT ... ON CONFLICT DO NOTHING, so a writer creating
+        the same source concurrently cannot make it fail.
 
         Args:
             name: Unique name of the source.
@@ -66,18 +279,42 @@ class QuestionRepository:
         source = self.session.execute(stmt).scalar_one_or_none()
 
         if source is None:
-            source = Source(name=name, description=description)
-            self.session.add(source)
-            self.session.flush()  # Get the source_id without committing
+            self.session.execute(
+                sqlite_insert(Source)
+                .values(name=name, description=description)
+                .on_conflict_do_nothing(index_elements=[Source.name])
+            )
+            source = self.session.execute(stmt).scalar_one()
 
         return source
 
+    def _question_values(self, question_data: dict[str, Any]) -> dict[str, Any]:
+        """Validate add_question input and derive its metadata columns.
+
+        Columns given explicitly (such as a precomputed body_hash) take
+        precedence over the values derived from raw_metadata_json.
+        """
+        for field in (
+            "source_id",
+            "source_question_key",
+            "raw_html",
+            "raw_metadata_json",
+        ):
+            if field not in question_data:
+                raise ValueError(f"Missing required field: {field}")
+        return {
+            **_metadata_columns(question_data["raw_metadata_json"]),
+            **question_data,
+        }
+
     def add_question(self, question_data: dict[str, Any]) -> Question:
         """Add a new question or update if it already exists.
 
         Uses the combination of source_id and source_question_key for
         idempotency. If a question with the same keys exists, it updates
-        the existing record instead of creating a duplicate.
+        the existing record instead of creating a duplicate. Both cases are
+        one INSERT ... ON CONFLICT DO UPDATE statement, so concurrent ingest
+        of the same question cannot violate uq_source_question.
 
         Args:
             question_data: Dictionary containing:
@@ -87,6 +324,11 @@ class QuestionRepository:
                 - raw_metadata_json: JSON metadata as string
                 - status: (optional) Status of the question
                 - extraction_path: (optional) Original file path
+                - body_hash: (optional) Body text hash; derived from
+                  raw_metadata_json when omitted
+
+                The METADATA_COLUMNS (body_text, url, hostname, extracted_at,
+                title, category) are filled from raw_metadata_json.
 
         Returns:
             The created or updated Question instance.
@@ -94,36 +336,183 @@ class QuestionRepository:
         Raises:
             ValueError: If required fields are missing.
         """
-        required_fields = [
-            "source_id",
-            "source_question_key",
-            "raw_html",
-            "raw_metadata_json",
-        ]
-        for field in required_fields:
-            if field not in question_data:
-                raise ValueError(f"Missing required field: {field}")
+        values = self._question_values(question_data)
+        stmt = (
+            _upsert_questions(Question, tuple(sorted(values)))
+            .values(values)
+            .returning(Question)
+            .execution_options(populate_existing=True)
+        )
+        question = self.session.execute(stmt).scalar_one()
 
-        # Check if question already exists
-        stmt = select(Question).where(
-            Question.source_id == question_data["source_id"],
-            Question.source_question_key == question_data["source_question_key"],
+        self._index_question(
+            question.question_id,  # type: ignore[arg-type]
+            values["raw_html"],
+            values["raw_metadata_json"],
+            question.tags,
         )
-        question = self.session.execute(stmt).scalar_one_or_none()
+        if "tags" in values:
+            self._sync_question_tags({question.question_id: question.tags})
+        self._invalidate_detail(question.question_id)  # type: ignore[arg-type]
+        return question
 
-        if question is None:
-            # Create new question
-            question = Question(**question_data)
-            self.session.add(question)
-            self.session.flush()
-        else:
-            # Update existing question
-            for key, value in question_data.items():
-                if key not in ["source_id", "source_question_key"]:
-                    setattr(question, key, value)
-            self.session.flush()
+    def add_questions(self, questions_data: list[dict[str, Any]]) -> list[int]:
+        """Add or update many questions with one executemany per field set.
 
-        return question
+        The bulk form of add_question for imports: rows are upserted through
+        Core executemany (batched into multi-row INSERTs by the driver) and
+        indexed for search the same way, without building ORM objects.
+        Rows are grouped by the fields they provide, so an optional field
+        left out of one row never overwrites a stored value.
+
+        Args:
+            questions_data: Dictionaries as accepted by add_question.
+
+        Returns:
+            The question_id of each row, in order. A key given twice maps
+            both rows to the same question, updated by the later row.
+
+        Raises:
+            ValueError: If a row is missing a required field.
+        """
+        rows = [self._question_values(data) for data in questions_data]
+        groups: dict[tuple[str, ...], list[int]] = defaultdict(list)
+        for index, row in enumerate(rows):
+            groups[tuple(sorted(row))].append(index)
+
+        question_ids: list[int] = [0] * len(rows)
+        tags: dict[int, str | None] = {}
+        table = Question.__table__
+        for fields, indexes in groups.items():
+            stmt = _upsert_questions(table, fields).returning(
+                table.c.question_id, table.c.tags, sort_by_parameter_order=True
+            )
+            result = self.session.execute(stmt, [rows[i] for i in indexes])
+            for index, (question_id, question_tags) in zip(indexes, result):
+                question_ids[index] = question_id
+                tags[question_id] = question_tags
+
+        # Index the last version of each question
+        latest = {question_id: row for question_id, row in zip(question_ids, rows)}
+        if latest:
+            self.session.execute(
+                delete(questions_fts).where(questions_fts.c.rowid == bindparam("id")),
+                [{"id": question_id} for question_id in latest],
+            )
+            self.session.execute(
+                insert(questions_fts),
+                [
+                    self._search_row(
+                        question_id,
+                        row["raw_html"],
+                        row["raw_metadata_json"],
+                        tags[question_id],
+                    )
+                    for question_id, row in latest.items()
+                ],
+            )
+        self._sync_question_tags(
+            {
+                question_id: tags[question_id]
+                for question_id, row in latest.items()
+                if "tags" in row
+            }
+        )
+        for question_id in latest:
+            self._invalidate_detail(question_id)
+        return question_ids
+
+    def _sync_question_tags(self, tags: dict[int, str | None]) -> None:
+        """Bring question_tags in line with the tags stored on questions.
+
+        Only the differences are written: tags a question no longer has are
+        deleted, new ones inserted, and unchanged ones left alone. Tags are
+        created in the tags table on first use.
+
+        Args:
+            tags: Stored tags value (see parse_tags) by question_id.
+        """
+        if not tags:
+            return
+        names = {question_id: parse_tags(value) for question_id, value in tags.items()}
+        tag_ids = self._ensure_tags(
+            [name for value in names.values() for name in value]
+        )
+        wanted = {
+            (question_id, tag_ids[tag_key(name)])
+            for question_id, value in names.items()
+            for name in value
+        }
+        stmt = select(QuestionTag.question_id, QuestionTag.tag_id).where(
+            QuestionTag.question_id.in_(tags)
+        )
+        current = {
+            (question_id, tag_id) for question_id, tag_id in self.session.execute(stmt)
+        }
+        table = QuestionTag.__table__
+        if removed := current - wanted:
+            self.session.execute(
+                delete(table).where(
+                    table.c.question_id == bindparam("b_question_id"),
+                    table.c.tag_id == bindparam("b_tag_id"),
+                ),
+                [{"b_question_id": q, "b_tag_id": t} for q, t in removed],
+            )
+        if added := wanted - current:
+            self.session.execute(
+                insert(table), [{"question_id": q, "tag_id": t} for q, t in added]
+            )
+
+    def _ensure_tags(self, names: list[str]) -> dict[str, int]:
+        """Get the IDs of tags by name, creating the ones that don't exist.
+
+        Args:
+            names: Tag names; names equal under tag_key are the same tag.
+
+        Returns:
+            tag_id by tag_key of each name.
+        """
+        distinct = list({tag_key(name): name for name in names}.values())
+        if not distinct:
+            return {}
+        self.session.execute(
+            sqlite_insert(Tag).on_conflict_do_nothing(index_elements=["name"]),
+            [{"name": name} for name in distinct],
+        )
+        stmt = select(Tag.tag_id, Tag.name).where(Tag.name.in_(distinct))
+        return {tag_key(name): tag_id for tag_id, name in self.session.execute(stmt)}
+
+    def _search_row(
+        self,
+        question_id: int,
+        raw_html: str,
+        raw_metadata_json: str,
+        tags: str | None,
+    ) -> dict[str, Any]:
+        """Build the full-text index entry for a question."""
+        return {
+            "rowid": question_id,
+            "body": body_text_from_metadata(raw_metadata_json),
+            "content": html_to_text(raw_html),
+            "tags": tags_to_text(tags),
+        }
+
+    def _index_question(
+        self,
+        question_id: int,
+        raw_html: str,
+        raw_metadata_json: str,
+        tags: str | None,
+    ) -> None:
+        """Add or replace a question's entry in the full-text index."""
+        self.session.execute(
+            delete(questions_fts).where(questions_fts.c.rowid == question_id)
+        )
+        self.session.execute(
+            insert(questions_fts).values(
+                self._search_row(question_id, raw_html, raw_metadata_json, tags)
+            )
+        )
 
     def add_media_to_question(
         self, question_id: int, media_data: dict[str, Any]
@@ -137,6 +526,7 @@ class QuestionRepository:
                 - media_type: (optional) Type/subtype
                 - mime_type: MIME type of the media
                 - relative_path: Path relative to MEDIA_ROOT
+                - sha256: (optional) Content hash of the stored file
 
         Returns:
             The created Media instance.
@@ -151,22 +541,133 @@ class QuestionRepository:
 
         media = Media(question_id=question_id, **media_data)
         self.session.add(media)
+        # The question's detail lists its media, so adding one modifies it
+        question = self.session.get(Question, question_id)
+        if question is not None:
+            question.updated_at = func.now()  # type: ignore[assignment]
         self.session.flush()
+        self._invalidate_detail(question_id)
 
         return media
 
-    def get_question_by_id(self, question_id: int) -> Question | None:
+    def add_media(self, media_rows: list[dict[str, Any]]) -> list[int]:
+        """Add many media records with one executemany.
+
+        The bulk form of add_media_to_question: the media are inserted in
+        one statement and the updated_at of every question they belong to
+        is bumped in another.
+
+        Args:
+            media_rows: Dictionaries as accepted by add_media_to_question,
+                each with the question_id the media belongs to.
+
+        Returns:
+            The media_id of each row, in order.
+
+        Raises:
+            ValueError: If a row is missing a required field.
+        """
+        for row in media_rows:
+            for field in ("question_id", "media_role", "mime_type", "relative_path"):
+                if field not in row:
+                    raise ValueError(f"Missing required field: {field}")
+        if not media_rows:
+            return []
+
+        table = Media.__table__
+        result = self.session.execute(
+            insert(table).returning(table.c.media_id, sort_by_parameter_order=True),
+            media_rows,
+        )
+        media_ids = list(result.scalars())
+
+        question_ids = {row["question_id"] for row in media_rows}
+        self.session.execute(
+            update(Question)
+            .where(Question.question_id.in_(question_ids))
+            .values(updated_at=func.now())
+        )
+        for question_id in question_ids:
+            self._invalidate_detail(question_id)
+        return media_ids
+
+    def get_media_by_id(self, media_id: int) -> Media | None:
+        """Retrieve a media record by its ID.
+
+        Args:
+            media_id: Primary key of the media.
+
+        Returns:
+            The Media instance or None if not found.
+        """
+        return self.session.get(Media, media_id)
+
+    def get_question_by_id(
+        self,
+        question_id: int,
+        include_content: bool = False,
+        include_media: bool = False,
+        include_source: bool = False,
+    ) -> Question | None:
         """Retrieve a question by its ID.
 
         Args:
             question_id: Primary key of the question.
+            include_content: Load the deferred raw_html and raw_metadata_json
+                in the same query instead of on first access.
+            include_media: Eager-load the question's media with one extra
+                query instead of on first access.
+            include_source: Join the question's source into the same query
+                instead of loading it on first access.
 
         Returns:
             The Question instance or None if not found.
         """
         stmt = select(Question).where(Question.question_id == question_id)
+        if include_content:
+            stmt = stmt.options(undefer_group("content"))
+        if include_media:
+            stmt = stmt.options(selectinload(Question.media))
+        if include_source:
+            stmt = stmt.options(joinedload(Question.source))
         return self.session.execute(stmt).scalar_one_or_none()
 
+    def get_questions_by_ids(
+        self,
+        question_ids: list[int],
+        include_content: bool = False,
+        include_media: bool = False,
+    ) -> list[Question]:
+        """Retrieve several questions by ID in a single query.
+
+        Each question's source is loaded in the same query, so reading
+        question.source does not issue one more query per question.
+
+        Args:
+            question_ids: Primary keys of the questions. IDs that do not exist
+                are skipped.
+            include_content: Load the deferred raw_html and raw_metadata_json
+                in the same query instead of on first access.
+            include_media: Eager-load the media of all the questions with one
+                extra query.
+
+        Returns:
+            The questions found, in question_id order.
+        """
+        if not question_ids:
+            return []
+        stmt = (
+            select(Question)
+            .where(Question.question_id.in_(set(question_ids)))
+            .options(joinedload(Question.source))
+            .order_by(Question.question_id)
+        )
+        if include_content:
+            stmt = stmt.options(undefer_group("content"))
+        if include_media:
+            stmt = stmt.options(selectinload(Question.media))
+        return list(self.session.execute(stmt).scalars())
+
     def get_question_by_source_key(
         self, source_id: int, source_question_key: str
     ) -> Question | None:
@@ -185,13 +686,36 @@ class QuestionRepository:
         )
         return self.session.execute(stmt).scalar_one_or_none()
 
+    def get_question_by_body_hash(
+        self, source_id: int, body_hash: str
+    ) -> Question | None:
+        """Retrieve a question by its source and body text hash.
+
+        Uses the (source_id, body_hash) index, so the lookup cost does not
+        grow with the number of questions in the source.
+
+        Args:
+            source_id: ID of the source.
+            body_hash: Hash of the body text, from compute_body_hash().
+
+        Returns:
+            The first matching Question instance or None if not found.
+        """
+        stmt = (
+            select(Question)
+            .where(Question.source_id == source_id, Question.body_hash == body_hash)
+            .limit(1)
+        )
+        return self.session.execute(stmt).scalar_one_or_none()
+
     def get_question_by_body_text(
         self, source_id: int, body_text: str
     ) -> Question | None:
         """Retrieve a question by its source and body text.
 
         This method provides a way to detect duplicate questions based on
-        their actual text content.
+        their actual text content. Rows created before the body_hash column
+        existed are only found once backfill_body_hashes() has run.
 
         Args:
             source_id: ID of the source.
@@ -200,17 +724,204 @@ class QuestionRepository:
         Returns:
             The Question instance or None if not found.
         """
-        stmt = select(Question).where(Question.source_id == source_id)
-        questions = self.session.execute(stmt).scalars().all()
+        return self.get_question_by_body_hash(source_id, compute_body_hash(body_text))
 
-        for question in questions:
-            try:
-                metadata = json.loads(question.raw_metadata_json)
-                if metadata.get("bodyText") == body_text:
-                    return question
-            except (json.JSONDecodeError, AttributeError):
-                continue
-        return None
+    def backfill_body_hashes(self, batch_size: int = 500) -> int:
+        """Populate body_hash for questions stored before the column existed.
+
+        Rows are processed in primary-key order in batches, committing after
+        each batch, so the backfill can be interrupted and resumed.
+
+        Args:
+            batch_size: Number of questions to read and update per batch.
+
+        Returns:
+            Number of questions whose body_hash was set.
+        """
+        updated = 0
+        last_id = 0
+        update_stmt = (
+            update(Question)
+            .where(Question.question_id == bindparam("b_question_id"))
+            .values(
+                body_hash=bindparam("b_body_hash"),
+                # The question's content is unchanged; keep its validators
+                updated_at=Question.updated_at,
+                version=Question.version,
+            )
+        )
+
+        while True:
+            stmt = (
+                select(Question.question_id, Question.raw_metadata_json)
+                .where(Question.body_hash.is_(None), Question.question_id > last_id)
+                .order_by(Question.question_id)
+                .limit(batch_size)
+            )
+            rows = self.session.execute(stmt).all()
+            if not rows:
+                break
+            last_id = rows[-1].question_id
+
+            params = [
+                {"b_question_id": row.question_id, "b_body_hash": body_hash}
+                for row in rows
+                if (body_hash := _body_hash_from_metadata(row.raw_metadata_json))
+            ]
+            if params:
+                self.session.connection().execute(update_stmt, params)
+                updated += len(params)
+            self.session.commit()
+
+        logger.info(f"Backfilled body_hash for {updated} question(s)")
+        return updated
+
+    def backfill_metadata_columns(self, batch_size: int = 500) -> int:
+        """Populate the METADATA_COLUMNS of questions stored before they existed.
+
+        Questions whose metadata columns are all empty are read in
+        primary-key order in batches; each batch's metadata JSON is parsed
+        once and the columns (and body_hash) are written with one
+        executemany UPDATE, committing after each batch, so the backfill
+        can be interrupted and resumed.
+
+        Args:
+            batch_size: Number of questions to read and update per batch.
+
+        Returns:
+            Number of questions updated.
+        """
+        columns = [*METADATA_COLUMNS.values(), "body_hash"]
+        update_stmt = (
+            update(Question)
+            .where(Question.question_id == bindparam("b_question_id"))
+            .values({column: bindparam(f"b_{column}") for column in columns})
+            .values(
+                body_hash=func.coalesce(bindparam("b_body_hash"), Question.body_hash),
+                # The question's content is unchanged; keep its validators
+                updated_at=Question.updated_at,
+                version=Question.version,
+            )
+        )
+        unfilled = [
+            getattr(Question, column).is_(None) for column in METADATA_COLUMNS.values()
+        ]
+
+        updated = 0
+        last_id = 0
+        while True:
+            stmt = (
+                select(Question.question_id, Question.raw_metadata_json)
+                .where(*unfilled, Question.question_id > last_id)
+                .order_by(Question.question_id)
+                .limit(batch_size)
+            )
+            rows = self.session.execute(stmt).all()
+            if not rows:
+                break
+            last_id = rows[-1].question_id
+
+            params = []
+            for row in rows:
+                values = _metadata_columns(row.raw_metadata_json)
+                if any(values[column] is not None for column in columns):
+                    params.append(
+                        {"b_question_id": row.question_id}
+                        | {f"b_{column}": values[column] for column in columns}
+                    )
+            if params:
+                self.session.connection().execute(update_stmt, params)
+                updated += len(params)
+            self.session.commit()
+
+        logger.info(f"Backfilled metadata columns for {updated} question(s)")
+        return updated
+
+    def recompress_raw_content(self, batch_size: int = 200) -> int:
+        """Rewrite stored HTML and metadata in the configured compression.
+
+        Rows stored before compression was enabled, or with a different
+        codec, are rewritten in batches so CompressedText re-encodes them
+        with the current RAW_CONTENT_COMPRESSION setting. With the setting
+        at "none" this decompresses every row instead. Values shorter than
+        MIN_COMPRESS_BYTES are stored as text under any codec, so they are
+        left alone. Commits after each batch, so it can be interrupted and
+        re-run safely.
+
+        Args:
+            batch_size: Number of questions to read and rewrite per batch.
+
+        Returns:
+            Number of questions rewritten.
+        """
+        codec = config.settings.RAW_CONTENT_COMPRESSION
+        if codec == "none":
+            needs_rewrite = [
+                func.typeof(column) == "blob"
+                for column in (Question.raw_html, Question.raw_metadata_json)
+            ]
+        else:
+            prefix = CODEC_PREFIXES[codec]
+            needs_rewrite = [
+                or_(
+                    and_(
+                        func.typeof(column) == "text",
+                        func.length(cast(column, LargeBinary)) >= MIN_COMPRESS_BYTES,
+                    ),
+                    and_(
+                        func.typeof(column) == "blob",
+                        func.substr(column, 1, len(prefix)) != prefix,
+                    ),
+                )
+                for column in (Question.raw_html, Question.raw_metadata_json)
+            ]
+
+        rewritten = 0
+        last_id = 0
+        update_stmt = (
+            update(Question)
+            .where(Question.question_id == bindparam("b_question_id"))
+            .values(
+                raw_html=bindparam("b_raw_html", type_=Question.raw_html.type),
+                raw_metadata_json=bindparam(
+                    "b_raw_metadata_json", type_=Question.raw_metadata_json.type
+                ),
+                # Only the stored encoding changes; keep the question's validators
+                updated_at=Question.updated_at,
+                version=Question.version,
+            )
+        )
+
+        while True:
+            stmt = (
+                select(
+                    Question.question_id,
+                    Question.raw_html,
+                    Question.raw_metadata_json,
+                )
+                .where(or_(*needs_rewrite), Question.question_id > last_id)
+                .order_by(Question.question_id)
+                .limit(batch_size)
+            )
+            rows = self.session.execute(stmt).all()
+            if not rows:
+                break
+            last_id = rows[-1].question_id
+
+            params = [
+                {
+                    "b_question_id": row.question_id,
+                    "b_raw_html": row.raw_html,
+                    "b_raw_metadata_json": row.raw_metadata_json,
+                }
+                for row in rows
+            ]
+            self.session.connection().execute(update_stmt, params)
+            rewritten += len(params)
+            self.session.commit()
+
+        logger.info(f"Rewrote raw content of {rewritten} question(s) as {codec}")
+        return rewritten
 
     def get_all_questions(self, source_id: int | None = None) -> list[Question]:
         """Retrieve all questions, optionally filtered by source.
@@ -228,6 +939,478 @@ class QuestionRepository:
         result = self.session.execute(stmt)
         return list(result.scalars().all())
 
+    def iter_questions_for_export(
+        self, batch_size: int = 200, source_name: str | None = None
+    ) -> Iterator[tuple[Row, list[Row]]]:
+        """Stream every question with its media, in question_id order.
+
+        Rows are fetched batch_size at a time with yield_per and selected as
+        plain columns rather than ORM objects, so nothing accumulates in the
+        session's identity map: memory use depends on batch_size, not on the
+        number of questions. Media is read with one query per batch.
+
+        Args:
+            batch_size: Questions fetched per batch.
+            source_name: Only export questions of this source.
+
+        Yields:
+            (question row, media rows) pairs. Question rows carry every
+            Question column plus source_name, with raw_html and
+            raw_metadata_json decompressed.
+        """
+        stmt = (
+            select(
+                Question.question_id,
+                Source.name.label("source_name"),
+                Question.source_question_key,
+                Question.status,
+                Question.state,
+                Question.tags,
+                Question.body_hash,
+                Question.extraction_path,
+                Question.note_path,
+                Question.created_at,
+                Question.updated_at,
+                Question.raw_html,
+                Question.raw_metadata_json,
+            )
+            .join(Source, Question.source_id == Source.source_id)
+            .order_by(Question.question_id)
+            .execution_options(yield_per=batch_size)
+        )
+        if source_name is not None:
+            stmt = stmt.where(Source.name == source_name)
+
+        result = self.session.execute(stmt)
+        try:
+            for partition in result.partitions():
+                media: defaultdict[int, list[Row]] = defaultdict(list)
+                media_stmt = (
+                    select(
+                        Media.question_id,
+                        Media.media_role,
+                        Media.media_type,
+                        Media.mime_type,
+                        Media.relative_path,
+                        Media.sha256,
+                    )
+                    .where(
+                        Media.question_id.in_([row.question_id for row in partition])
+                    )
+                    .order_by(Media.media_id)
+                )
+                for media_row in self.session.execute(media_stmt):
+                    media[media_row.question_id].append(media_row)
+
+                for row in partition:
+                    yield row, media[row.question_id]
+        finally:
+            result.close()
+
+    def list_question_summaries(
+        self,
+        limit: int,
+        sort: str = "id",
+        descending: bool = False,
+        after: tuple[Any, int] | None = None,
+        hostname: str | None = None,
+        category: str | None = None,
+        tag: str | None = None,
+    ) -> list[Row]:
+        """Retrieve one page of question summaries using keyset pagination.
+
+        Rather than an OFFSET, each page starts strictly after the sort
+        position of the last row of the previous page, so every page is an
+        index range scan no matter how deep into the listing it is.
+
+        Only the listed columns are selected, with the source name joined
+        in, so a page is a single statement that never reads the stored
+        HTML or metadata.
+
+        Args:
+            limit: Maximum number of questions to return.
+            sort: One of QUESTION_SORT_COLUMNS.
+            descending: Whether to sort in descending order.
+            after: (sort value, question_id) of the last row of the previous
+                page, or None for the first page. For sort="id" the sort
+                value is the question_id itself.
+            hostname: Only list questions extracted from this hostname.
+            category: Only list questions in this category.
+            tag: Only list questions with this tag (case-insensitive).
+
+        Returns:
+            Rows with question_id, source_name, source_question_key,
+            created_at and updated_at, in sort order.
+
+        Raises:
+            ValueError: If the sort key is unknown.
+        """
+        if sort not in QUESTION_SORT_COLUMNS:
+            raise ValueError(f"Unknown sort key: {sort}")
+        sort_column = QUESTION_SORT_COLUMNS[sort]
+
+        stmt = select(
+            Question.question_id,
+            Source.name.label("source_name"),
+            Question.source_question_key,
+            Question.created_at,
+            Question.updated_at,
+        ).join(Source, Question.source_id == Source.source_id)
+        stmt = stmt.where(*self._metadata_filters(hostname, category, tag))
+
+        if sort == "id":
+            order_by = [sort_column.desc() if descending else sort_column.asc()]
+            if after is not None:
+                stmt = stmt.where(
+                    Question.question_id < after[1]
+                    if descending
+                    else Question.question_id > after[1]
+                )
+        else:
+            key = tuple_(sort_column, Question.question_id)
+            if after is not None:
+                # Bind the cursor with the columns' types, so a timestamp is
+                # rendered in the stored format rather than a generic one
+                cursor = tuple_(
+                    *after, types=[sort_column.type, Question.question_id.type]
+                )
+            if descending:
+                order_by = [sort_column.desc(), Question.question_id.desc()]
+                if after is not None:
+                    stmt = stmt.where(key < cursor)
+            else:
+                order_by = [sort_column.asc(), Question.question_id.asc()]
+                if after is not None:
+                    stmt = stmt.where(key > cursor)
+
+        stmt = stmt.order_by(*order_by).limit(limit)
+        return list(self.session.execute(stmt).all())
+
+    def _metadata_filters(
+        self, hostname: str | None, category: str | None, tag: str | None = None
+    ) -> list[Any]:
+        """Build the WHERE clauses of the list filters that were given."""
+        filters = []
+        if hostname is not None:
+            filters.append(Question.hostname == hostname)
+        if category is not None:
+            filters.append(Question.category == category)
+        if tag is not None:
+            filters.append(
+                Question.question_id.in_(
+                    select(QuestionTag.question_id)
+                    .join(Tag, QuestionTag.tag_id == Tag.tag_id)
+                    .where(Tag.name == tag)
+                )
+            )
+        return filters
+
+    def count_questions(
+        self,
+        hostname: str | None = None,
+        category: str | None = None,
+        tag: str | None = None,
+    ) -> int:
+        """Count stored questions, optionally only those matching filters.
+
+        Args:
+            hostname: Only count questions extracted from this hostname.
+            category: Only count questions in this category.
+            tag: Only count questions with this tag (case-insensitive).
+
+        Returns:
+            Number of questions.
+        """
+        stmt = (
+            select(func.count())
+            .select_from(Question)
+            .where(*self._metadata_filters(hostname, category, tag))
+        )
+        return self.session.execute(stmt).scalar_one()
+
+    def count_questions_by_tag(self) -> list[Row]:
+        """Count the questions carrying each tag.
+
+        Answered from the (tag_id, question_id) index of question_tags
+        without reading the questions. Tags no question uses are left out.
+
+        Returns:
+            Rows with name and count, most used tags first, then by name.
+        """
+        count = func.count().label("count")
+        stmt = (
+            select(Tag.name, count)
+            .join(QuestionTag, QuestionTag.tag_id == Tag.tag_id)
+            .group_by(Tag.tag_id)
+            .order_by(count.desc(), Tag.name)
+        )
+        return list(self.session.execute(stmt).all())
+
+    def get_question_version(self, question_id: int) -> Row | None:
+        """Get which version of a question is stored, without loading it.
+
+        Args:
+            question_id: Primary key of the question.
+
+        Returns:
+            Row with the question's version and updated_at, or None if the
+            question does not exist.
+        """
+        stmt = select(Question.version, Question.updated_at).where(
+            Question.question_id == question_id
+        )
+        return self.session.execute(stmt).one_or_none()
+
+    def get_questions_version(self) -> Row:
+        """Get the version and size of the question listing.
+
+        Read from the question_stats row kept by triggers, so it costs one
+        primary key lookup however many questions there are. The version
+        changes with every write to questions or question_tags, including
+        backfills that keep updated_at and several edits within a second.
+
+        Returns:
+            Row with version and count.
+        """
+        stmt = select(
+            QuestionStats.version.label("version"),
+            QuestionStats.question_count.label("count"),
+        ).where(QuestionStats.stats_id == 1)
+        return self.session.execute(stmt).one()
+
+    def rebuild_search_index(self, batch_size: int = 200) -> int:
+        """Rebuild the full-text index from the stored questions.
+
+        Needed once for databases whose questions were stored before the
+        index existed. Commits after each batch.
+
+        Args:
+            batch_size: Number of questions to read and index per batch.
+
+        Returns:
+            Number of questions indexed.
+        """
+        self.session.execute(delete(questions_fts))
+        self.session.commit()
+
+        indexed = 0
+        last_id = 0
+        while True:
+            stmt = (
+                select(
+                    Question.question_id,
+                    Question.raw_html,
+                    Question.raw_metadata_json,
+                    Question.tags,
+                )
+                .where(Question.question_id > last_id)
+                .order_by(Question.question_id)
+                .limit(batch_size)
+            )
+            rows = self.session.execute(stmt).all()
+            if not rows:
+                break
+            last_id = rows[-1].question_id
+
+            self.session.execute(
+                insert(questions_fts), [self._search_row(*row) for row in rows]
+            )
+            indexed += len(rows)
+            self.session.commit()
+
+        # Merge the index segments written batch by batch
+        self.session.execute(
+            text("INSERT INTO questions_fts(questions_fts) VALUES ('optimize')")
+        )
+        self.session.commit()
+        logger.info(f"Indexed {indexed} question(s) for search")
+        return indexed
+
+    def rebuild_question_tags(self, batch_size: int = 500) -> int:
+        """Rebuild question_tags from the tags stored on the questions.
+
+        Needed once for databases whose questions were tagged before the
+        tag tables existed; tags written since are kept in sync on write.
+        Only differences are written, so it is safe to re-run. Commits after
+        each batch.
+
+        Args:
+            batch_size: Number of questions to read and sync per batch.
+
+        Returns:
+            Number of questions synced.
+        """
+        synced = 0
+        last_id = 0
+        while True:
+            stmt = (
+                select(Question.question_id, Question.tags)
+                .where(Question.question_id > last_id)
+                .order_by(Question.question_id)
+                .limit(batch_size)
+            )
+            rows = self.session.execute(stmt).all()
+            if not rows:
+                break
+            last_id = rows[-1].question_id
+
+            self._sync_question_tags(dict(rows))  # type: ignore[arg-type]
+            synced += len(rows)
+            self.session.commit()
+
+        logger.info(f"Synced the tags of {synced} question(s)")
+        return synced
+
+    def _filter_search(self, stmt: Any, query: SearchQuery) -> Any:
+        """Apply the tag:, deck: and is: filters of a search to a statement."""
+        for tag in query.tags:
+            stmt = stmt.where(
+                Question.question_id.in_(
+                    select(QuestionTag.question_id)
+                    .join(Tag, QuestionTag.tag_id == Tag.tag_id)
+                    .where(Tag.name.like(_like_prefix(tag), escape="\\"))
+                )
+            )
+        if query.decks:
+            stmt = stmt.where(
+                or_(
+                    *(
+                        Source.name.icontains(deck, autoescape=True)
+                        for deck in query.decks
+                    )
+                )
+            )
+        for state in query.states:
+            if state == "new":
+                stmt = stmt.where(
+                    or_(Question.state.is_(None), func.lower(Question.state) == state)
+                )
+            else:
+                stmt = stmt.where(func.lower(Question.state) == state)
+        return stmt
+
+    def search_questions(
+        self,
+        query: SearchQuery,
+        limit: int,
+        after: tuple[float | None, int] | None = None,
+    ) -> list[SearchHit]:
+        """Search questions, best matches first.
+
+        Text terms are ranked by BM25 through the full-text index; queries
+        with only tag:/deck:/is: filters are returned in question_id order. Pages
+        continue after the (score, question_id) of the previous page's last
+        row.
+
+        Ranking reads nothing but the index (joining questions only when
+        tag:/deck:/is: filters need it); the listed columns and indexed text are
+        then fetched for the page's rows alone.
+
+        Args:
+            query: Parsed search query.
+            limit: Maximum number of results.
+            after: (score, question_id) of the last row of the previous page,
+                or None for the first page. score is None for queries
+                without text terms.
+
+        Returns:
+            SearchHits in rank order. For text queries they carry the BM25
+            score (lower is better) and the indexed body and content text.
+        """
+        match = build_match_expression(query)
+        if match is None:
+            stmt = self._filter_search(
+                select(
+                    Question.question_id,
+                    Source.name.label("source_name"),
+                    Question.source_question_key,
+                ).join(Source, Question.source_id == Source.source_id),
+                query,
+            )
+            if after is not None:
+                stmt = stmt.where(Question.question_id > after[1])
+            stmt = stmt.order_by(Question.question_id).limit(limit)
+            return [SearchHit(*row) for row in self.session.execute(stmt)]
+
+        fts = literal_column("questions_fts")
+        score = func.bm25(fts)
+        rowid = questions_fts.c.rowid
+        rank_stmt = (
+            select(rowid, score.label("score"))
+            .select_from(questions_fts)
+            .where(fts.op("MATCH")(match))
+        )
+        if query.has_filters:
+            rank_stmt = self._filter_search(
+                rank_stmt.join(Question, Question.question_id == rowid).join(
+                    Source, Question.source_id == Source.source_id
+                ),
+                query,
+            )
+        if after is not None:
+            rank_stmt = rank_stmt.where(
+                or_(score > after[0], (score == after[0]) & (rowid > after[1]))
+            )
+        rank_stmt = rank_stmt.order_by(literal_column("score"), rowid).limit(limit)
+        ranked = self.session.execute(rank_stmt).all()
+        if not ranked:
+            return []
+
+        detail_stmt = (
+            select(
+                Question.question_id,
+                Source.name,
+                Question.source_question_key,
+                questions_fts.c.body,
+                questions_fts.c.content,
+            )
+            .join(Source, Question.source_id == Source.source_id)
+            .join(questions_fts, rowid == Question.question_id)
+            .where(Question.question_id.in_([r.rowid for r in ranked]))
+        )
+        details = {row[0]: row for row in self.session.execute(detail_stmt)}
+        return [
+            SearchHit(
+                question_id=r.rowid,
+                source_name=details[r.rowid][1],
+                source_question_key=details[r.rowid][2],
+                score=r.score,
+                body=details[r.rowid][3],
+                content=details[r.rowid][4],
+            )
+            for r in ranked
+            if r.rowid in details
+        ]
+
+    def count_search_results(self, query: SearchQuery) -> int:
+        """Count the questions matching a search query.
+
+        Args:
+            query: Parsed search query.
+
+        Returns:
+            Number of matching questions.
+        """
+        match = build_match_expression(query)
+        fts = literal_column("questions_fts")
+        if match is None:
+            stmt = select(func.count()).select_from(Question)
+        else:
+            stmt = (
+                select(func.count())
+                .select_from(questions_fts)
+                .where(fts.op("MATCH")(match))
+            )
+        if query.has_filters:
+            if match is not None:
+                stmt = stmt.join(
+                    Question, Question.question_id == questions_fts.c.rowid
+                )
+            stmt = self._filter_search(
+                stmt.join(Source, Question.source_id == Source.source_id), query
+            )
+        return self.session.execute(stmt).scalar_one()
+
     def get_source_by_name(self, name: str) -> Source | None:
         """Retrieve a source by its name.
 
@@ -266,6 +1449,12 @@ class QuestionRepository:
         # Update tags if present
         if "tags" in metadata:
             question.tags = _serialize_tags(metadata["tags"])
+            self.session.execute(
+                update(questions_fts)
+                .where(questions_fts.c.rowid == question_id)
+                .values(tags=tags_to_text(question.tags))
+            )
+            self._sync_question_tags({question_id: question.tags})
 
         # Update state if present
         if "state" in metadata:
@@ -273,6 +1462,7 @@ class QuestionRepository:
             question.state = str(state_value) if state_value is not None else None
 
         self.session.flush()
+        self._invalidate_detail(question_id)
         logger.debug(f"Updated metadata for question {question_id}")
         return True
 
@@ -300,8 +1490,6 @@ class QuestionRepository:
         Raises:
             OSError: If note file creation fails.
         """
-        import json as json_module
-
         # Fetch the question
         question = self.get_question_by_id(question_id)
         if question is None:
@@ -330,16 +1518,6 @@ class QuestionRepository:
 
         # Create stub note with YAML frontmatter
         try:
-            # Parse metadata if available
-            metadata_dict = {}
-            if question.raw_metadata_json:
-                try:
-                    metadata_dict = json_module.loads(str(question.raw_metadata_json))
-                except json_module.JSONDecodeError:
-                    logger.warning(
-                        f"Failed to parse metadata JSON for question {question_id}"
-                    )
-
             # Build YAML frontmatter
             frontmatter_lines = [
                 "---",
@@ -350,10 +1528,15 @@ class QuestionRepository:
             ]
 
             # Add selected metadata fields if available
-            if "title" in metadata_dict:
-                frontmatter_lines.append(f"title: {metadata_dict['title']}")
-            if "category" in metadata_dict:
-                frontmatter_lines.append(f"category: {metadata_dict['category']}")
+            title, category = question.title, question.category
+            if title is None and category is None:
+                # Stored before the metadata columns and not backfilled yet
+                metadata = _metadata_columns(question.raw_metadata_json)
+                title, category = metadata["title"], metadata["category"]
+            if title:
+                frontmatter_lines.append(f"title: {title}")
+            if category:
+                frontmatter_lines.append(f"category: {category}")
 
             frontmatter_lines.append("---")
             frontmatter_lines.append("")  # Blank line after frontmatter
@@ -367,6 +1550,7 @@ class QuestionRepository:
             # Update the question's note_path
             question.note_path = str(note_path.absolute())
             self.session.flush()
+            self._invalidate_detail(question_id)
 
             logger.info(f"Created note for question {question_id}: {note_path}")
             return str(note_path.absolute())
@@ -0,0 +1,110 @@
+"""Fast JSON responses for large payloads.
+
+Endpoints declared with a ``response_model`` have their return value
+validated against the model again and walked by ``jsonable_encoder`` before
+being encoded with the standard ``json`` module. For question detail
+responses carrying hundreds of KB of HTML that second pass costs as much as
+building the response in the first place.
+
+model_response() instead serializes a model that was already validated when
+it was constructed, once, straight to bytes; FastJSONResponse does the same
+for plain dicts. The encoder is chosen by JSON_ENCODER:
+
+- "default": pydantic-core's serializer for models, ``json`` for dicts.
+- "orjson": orjson for both; requires the optional ``orjson`` package
+  (pip install doughub2[fast-json]). Models are encoded in the same single
+  pass, orjson reading their fields directly rather than from a
+  ``model_dump`` copy.
+
+The bytes produced are the same JSON document either way.
+"""
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from doughub2.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+JSON_ENCODERS = ("default", "orjson")
+
+# Encode timezone-aware UTC datetimes with a "Z" suffix, as pydantic does
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z if orjson is not None else 0
+
+
+def _use_orjson() -> bool:
+    encoder = settings.JSON_ENCODER
+    if encoder not in JSON_ENCODERS:
+        raise ValueError(f"Unknown JSON encoder: {encoder}")
+    if encoder == "orjson" and orjson is None:
+        raise RuntimeError(
+            "The orjson JSON encoder requires the 'orjson' package "
+            "(pip install orjson)"
+        )
+    return encoder == "orjson"
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Give orjson the fields of the models nested in a payload."""
+    if isinstance(obj, BaseModel):
+        return dict(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode JSON-compatible content to UTF-8 bytes.
+
+    Args:
+        content: Dicts, lists and scalars, as accepted by json.dumps.
+
+    Returns:
+        The compact JSON encoding.
+
+    Raises:
+        ValueError: If JSON_ENCODER is unknown.
+        RuntimeError: If orjson is requested but not installed.
+    """
+    if _use_orjson():
+        return orjson.dumps(content)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with the configured JSON_ENCODER."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def model_response(
+    model: BaseModel, status_code: int = 200, headers: dict[str, str] | None = None
+) -> Response:
+    """Serialize a validated response model once, bypassing response_model.
+
+    Args:
+        model: The response model, validated when it was constructed.
+        status_code: HTTP status code.
+        headers: Extra response headers.
+
+    Returns:
+        A JSON response with the serialized model.
+
+    Raises:
+        ValueError: If JSON_ENCODER is unknown.
+        RuntimeError: If orjson is requested but not installed.
+    """
+    if _use_orjson():
+        body = orjson.dumps(model, default=_orjson_default, option=_ORJSON_OPTIONS)
+    else:
+        body = model.__pydantic_serializer__.to_json(model)
+    return Response(
+        body, status_code=status_code, headers=headers, media_type="application/json"
+    )
@@ -4,6 +4,7 @@ DougHub2 Pydantic Schemas.
 This module contains all Pydantic models for API requests and responses.
 """
 
+from datetime import datetime
 from typing import Any
 
 from pydantic import BaseModel
@@ -57,6 +58,54 @@ class ExtractionResponse(BaseModel):
     database: DatabaseInfo
 
 
+class ExtractionExistsResponse(BaseModel):
+    """Response model for the extraction pre-check endpoint."""
+
+    exists: bool
+    matched_by: str | None = None
+
+
+class ExtractionJobResponse(BaseModel):
+    """Response model for an extraction accepted for background processing."""
+
+    job_id: str
+    status: str
+    status_url: str
+    queue_depth: int
+
+
+class ExtractionJobStatus(BaseModel):
+    """Response model for the progress of a background extraction."""
+
+    job_id: str
+    status: str
+    stage: str
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    error: str | None = None
+    result: ExtractionResponse | None = None
+
+
+class BatchItemResult(BaseModel):
+    """Result for one record of a batch extraction."""
+
+    line: int
+    url: str | None = None
+    status: str
+    error: str | None = None
+    result: ExtractionResponse | None = None
+
+
+class BatchExtractionResponse(BaseModel):
+    """Response model for the batch extraction endpoint."""
+
+    total: int
+    succeeded: int
+    failed: int
+    results: list[BatchItemResult]
+
+
 class QuestionInfo(BaseModel):
     """Summary information about a question."""
 
@@ -66,9 +115,61 @@ class QuestionInfo(BaseModel):
 
 
 class QuestionListResponse(BaseModel):
-    """Response model for listing questions."""
+    """Response model for listing questions.
+
+    next_cursor is null on the last page. total is only included on the
+    first page of a listing.
+    """
 
     questions: list[QuestionInfo]
+    next_cursor: str | None = None
+    total: int | None = None
+
+
+class QuestionSearchResult(QuestionInfo):
+    """A question matching a search, with the matching text highlighted.
+
+    snippet is HTML-escaped text with matches wrapped in <mark> tags; it and
+    score (BM25, lower is better) are null for filter-only searches.
+    """
+
+    snippet: str | None = None
+    score: float | None = None
+
+
+class QuestionSearchResponse(BaseModel):
+    """Response model for searching questions.
+
+    next_cursor is null on the last page. total is only included on the
+    first page of a search.
+    """
+
+    results: list[QuestionSearchResult]
+    next_cursor: str | None = None
+    total: int | None = None
+
+
+class TagCount(BaseModel):
+    """A tag and the number of questions carrying it."""
+
+    name: str
+    count: int
+
+
+class TagCountsResponse(BaseModel):
+    """Response model for the per-tag question counts, most used first."""
+
+    tags: list[TagCount]
+
+
+class MediaInfo(BaseModel):
+    """A media file of a question, served by GET /media/{media_id}."""
+
+    media_id: int
+    media_role: str
+    media_type: str | None = None
+    mime_type: str
+    sha256: str | None = None
 
 
 class QuestionDetailResponse(BaseModel):
@@ -78,3 +179,49 @@ class QuestionDetailResponse(BaseModel):
     source_name: str
     source_question_key: str
     raw_html: str
+    media: list[MediaInfo] = []
+
+
+class QuestionBatchResponse(BaseModel):
+    """Response model for fetching several questions at once.
+
+    questions follows the order of the requested IDs; requested IDs that do
+    not exist are listed in missing. etags maps each returned question_id
+    to the ETag GET /questions/{id} sends for it.
+    """
+
+    questions: list[QuestionDetailResponse]
+    etags: dict[int, str] = {}
+    missing: list[int] = []
+
+
+class LogEntry(BaseModel):
+    """A log record persisted in the logs table."""
+
+    log_id: int
+    level: str
+    logger_name: str
+    message: str
+    timestamp: datetime
+
+
+class LogListResponse(BaseModel):
+    """Response model for listing logs, newest first.
+
+    next_cursor is null on the last page.
+    """
+
+    logs: list[LogEntry]
+    next_cursor: str | None = None
+
+
+class CacheStatsResponse(BaseModel):
+    """Response model for the question detail cache statistics."""
+
+    entries: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
@@ -0,0 +1,322 @@
+"""Full-text search over questions.
+
+Implements the Card Browser query language on the server, backed by the
+``questions_fts`` FTS5 index (see models.py):
+
+- ``word`` / ``"a phrase"``: match anywhere (body, content or tags)
+- ``front:text``: match the question body text
+- ``back:text``: match the text of the stored page HTML
+- ``tag:name``: has a tag starting with name (case-insensitive), through
+  the indexed question_tags table
+- ``deck:name``: source name contains name (case-insensitive); several
+  deck: terms match any of the names
+- ``is:state``: question state equals state; ``is:new`` also matches
+  questions without a state. Like the browser, only the FILTER_STATES are
+  filtered on; other states (``is:due``) match every question
+
+Words are matched as prefixes, so ``card`` finds "cardiac" and
+"cardiology", close to the substring matching the browser used to do
+client-side.
+"""
+
+import html
+import json
+import re
+import string
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Any
+
+from sqlalchemy import column, table
+
+# Lightweight handle on the FTS table for building queries
+questions_fts = table(
+    "questions_fts",
+    column("rowid"),
+    column("body"),
+    column("content"),
+    column("tags"),
+)
+
+# Same tokenization as the browser: bare words, with quoted spans kept whole
+_TOKEN_RE = re.compile(r'(?:[^\s"]+|"[^"]*")+')
+
+# States is: filters on; the browser lets every question through for others
+FILTER_STATES = ("new", "learning", "review", "suspended")
+
+# Operator prefix -> FTS column
+_FIELD_COLUMNS = {"front": "body", "back": "content"}
+
+# SQLite's NOCASE collation folds ASCII letters only
+_NOCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# Elements whose text is not part of the readable page
+_SKIPPED_TAGS = {"script", "style", "noscript", "template", "head"}
+
+
+@dataclass
+class SearchHit:
+    """A question matching a search.
+
+    Attributes:
+        question_id: ID of the question.
+        source_name: Name of the question's source.
+        source_question_key: Question key within the source.
+        score: BM25 score (lower is better); None for filter-only searches.
+        body: Indexed body text; None for filter-only searches.
+        content: Indexed page text; None for filter-only searches.
+    """
+
+    question_id: int
+    source_name: str
+    source_question_key: str
+    score: float | None = None
+    body: str | None = None
+    content: str | None = None
+
+
+@dataclass
+class SearchQuery:
+    """A parsed browser search query.
+
+    Attributes:
+        terms: Free-text terms matched against every indexed column.
+        fields: (FTS column, text) pairs from front: and back:.
+        tags: Tag name prefixes from tag:.
+        decks: Source name fragments from deck:.
+        states: Lower-cased FILTER_STATES from is:.
+    """
+
+    terms: list[str] = field(default_factory=list)
+    fields: list[tuple[str, str]] = field(default_factory=list)
+    tags: list[str] = field(default_factory=list)
+    decks: list[str] = field(default_factory=list)
+    states: list[str] = field(default_factory=list)
+
+    @property
+    def has_text(self) -> bool:
+        """Whether the query needs the full-text index."""
+        return bool(self.terms or self.fields)
+
+    @property
+    def has_filters(self) -> bool:
+        """Whether the query filters on tags, decks or states."""
+        return bool(self.tags or self.decks or self.states)
+
+
+def parse_search_query(query: str) -> SearchQuery:
+    """Parse a browser search string into its operators and terms.
+
+    Args:
+        query: Search string, e.g. 'deck:MKSAP tag:cardio "chest pain"'.
+
+    Returns:
+        The parsed SearchQuery.
+    """
+    parsed = SearchQuery()
+    for token in _TOKEN_RE.findall(query):
+        prefix, sep, value = token.partition(":")
+        prefix = prefix.lower()
+        if sep and prefix in _FIELD_COLUMNS:
+            if value := value.replace('"', ""):
+                parsed.fields.append((_FIELD_COLUMNS[prefix], value))
+        elif sep and prefix == "tag":
+            if value := value.replace('"', ""):
+                parsed.tags.append(value)
+        elif sep and prefix == "deck":
+            if value := value.replace('"', ""):
+                parsed.decks.append(value)
+        elif sep and prefix == "is":
+            if (state := value.replace('"', "").lower()) in FILTER_STATES:
+                parsed.states.append(state)
+        elif term := token.replace('"', ""):
+            parsed.terms.append(term)
+    return parsed
+
+
+def _fts_phrase(text: str) -> str:
+    """Quote text as an FTS5 phrase matched as a prefix."""
+    return '"' + text.replace('"', '""') + '"*'
+
+
+def build_match_expression(query: SearchQuery) -> str | None:
+    """Build the FTS5 MATCH expression for the text parts of a query.
+
+    Every term and field filter must match (implicit AND).
+
+    Args:
+        query: Parsed search query.
+
+    Returns:
+        The MATCH expression, or None if the query has no text parts.
+    """
+    parts = [_fts_phrase(term) for term in query.terms]
+    parts += [f"{name} : {_fts_phrase(value)}" for name, value in query.fields]
+    return " ".join(parts) or None
+
+
+class _TextExtractor(HTMLParser):
+    """Collects the visible text of an HTML document."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def html_to_text(html: str) -> str:
+    """Extract the readable text of an HTML document for indexing.
+
+    Args:
+        html: HTML source.
+
+    Returns:
+        The text content with whitespace collapsed.
+    """
+    extractor = _TextExtractor()
+    extractor.feed(html)
+    extractor.close()
+    return " ".join(" ".join(extractor.parts).split())
+
+
+def tags_to_text(tags: str | None) -> str:
+    """Convert a stored tags value to space-separated text for indexing.
+
+    Args:
+        tags: Tags as stored on Question (JSON list or plain string).
+
+    Returns:
+        The tags separated by spaces.
+    """
+    if not tags:
+        return ""
+    try:
+        value: Any = json.loads(tags)
+    except ValueError:
+        value = tags
+    if isinstance(value, list):
+        return " ".join(str(tag) for tag in value)
+    return str(value).replace(",", " ")
+
+
+def parse_tags(tags: str | None) -> list[str]:
+    """Split a stored tags value into distinct tag names.
+
+    Args:
+        tags: Tags as stored on Question (JSON list or a string of names
+            separated by commas or whitespace).
+
+    Returns:
+        The tag names in order, without blanks or duplicates (names equal
+        under tag_key).
+    """
+    if not tags:
+        return []
+    try:
+        value: Any = json.loads(tags)
+    except ValueError:
+        value = tags
+    if isinstance(value, list):
+        names = [str(tag).strip() for tag in value]
+    else:
+        names = str(value).replace(",", " ").split()
+    distinct: dict[str, str] = {}
+    for name in names:
+        if name:
+            distinct.setdefault(tag_key(name), name)
+    return list(distinct.values())
+
+
+def tag_key(name: str) -> str:
+    """Fold a tag name the way the NOCASE collation of tags.name compares it."""
+    return name.translate(_NOCASE)
+
+
+def body_text_from_metadata(raw_metadata_json: str | None) -> str:
+    """Get the body text stored in a question's metadata JSON.
+
+    Args:
+        raw_metadata_json: The stored metadata JSON string.
+
+    Returns:
+        The bodyText value, or an empty string.
+    """
+    if not raw_metadata_json:
+        return ""
+    try:
+        return json.loads(raw_metadata_json).get("bodyText") or ""
+    except (ValueError, AttributeError):
+        return ""
+
+
+def make_snippet(hit: SearchHit, query: SearchQuery, words: int = 24) -> str | None:
+    """Build a highlighted excerpt of a search hit around its first match.
+
+    Snippets are cut in Python from the page's rows only; asking FTS5 for
+    snippet() would compute one for every match before ranking.
+
+    Args:
+        hit: Search hit with its indexed text.
+        query: The parsed query, whose words are highlighted.
+        words: Approximate length of the excerpt in words.
+
+    Returns:
+        HTML-escaped text with matching words wrapped in <mark> tags, or None
+        if the hit has no indexed text.
+    """
+    needles = {
+        word.lower()
+        for text in query.terms + [value for _, value in query.fields]
+        for word in re.findall(r"\w+", text)
+    }
+    texts = [t for t in (hit.body, hit.content) if t]
+    if not texts:
+        return None
+
+    pattern = None
+    if needles:
+        alternatives = "|".join(
+            re.escape(n) for n in sorted(needles, key=len, reverse=True)
+        )
+        pattern = re.compile(rf"(?<!\w)(?:{alternatives})\w*", re.IGNORECASE)
+
+    # Prefer the first text with a match, falling back to the body
+    tokens = texts[0].split()
+    start = 0
+    for text in texts:
+        candidate = text.split()
+        hits = [i for i, t in enumerate(candidate) if pattern and pattern.search(t)]
+        if hits:
+            tokens, start = candidate, max(hits[0] - words // 4, 0)
+            break
+
+    excerpt = tokens[start : start + words]
+    rendered = []
+    for token in excerpt:
+        # Match the raw token and escape around the match, so a needle such
+        # as "lt" cannot match inside an entity created by escaping
+        match = pattern.search(token) if pattern else None
+        if match is None:
+            rendered.append(html.escape(token))
+            continue
+        before, after = token[: match.start()], token[match.end() :]
+        rendered.append(
+            f"{html.escape(before)}<mark>{html.escape(match.group(0))}</mark>"
+            f"{html.escape(after)}"
+        )
+
+    prefix = "… " if start > 0 else ""
+    suffix = " …" if start + words < len(tokens) else ""
+    return prefix + " ".join(rendered) + suffix
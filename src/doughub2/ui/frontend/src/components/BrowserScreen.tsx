@@ -1,13 +1,20 @@
 import { useEffect, useMemo, useState } from "react";
-import { API_ENDPOINTS } from "../config/apiConfig";
-import { useApi } from "../hooks/useApi";
-import { Card, QuestionListResponse, SavedFilter } from "../types";
+import { prefetchQuestionDetails } from "../hooks/useQuestionDetail";
+import { useQuestionPages } from "../hooks/useQuestionPages";
+import { Card, SavedFilter } from "../types";
 import { CardPreview } from "./CardPreview";
 import { CardTable } from "./CardTable";
 import { FilterPanel } from "./FilterPanel";
 import { QuickEditDialog } from "./QuickEditDialog";
 import { SearchBar } from "./SearchBar";
 
+// Questions requested per page from /questions
+const PAGE_SIZE = 200;
+
+// Previews prefetched ahead of (and behind) the focused card
+const PREFETCH_AHEAD = 20;
+const PREFETCH_BEHIND = 5;
+
 export function BrowserScreen() {
   const [searchQuery, setSearchQuery] = useState("");
   const [selectedDecks, setSelectedDecks] = useState<number[]>(
@@ -33,16 +40,20 @@ export function BrowserScreen() {
     null,
   );
 
-  // Fetch questions from API
-  const { data: apiResponse, isLoading, error } = useApi<QuestionListResponse>(API_ENDPOINTS.questionsList);
+  // Fetch questions from API, one page at a time
+  const {
+    questions,
+    total,
+    hasMore,
+    isLoading,
+    isLoadingMore,
+    error,
+    loadMore,
+  } = useQuestionPages(PAGE_SIZE);
 
   // Transform API data to Card format
   const allCards = useMemo((): Card[] => {
-    if (!apiResponse?.questions) {
-      return [];
-    }
-
-    return apiResponse.questions.map((question): Card => ({
+    return questions.map((question): Card => ({
       id: question.question_id,
       deck: question.source_name,
       front: question.source_question_key,
@@ -56,7 +67,7 @@ export function BrowserScreen() {
       interval: 0, // Placeholder
       suspended: false, // Placeholder
     }));
-  }, [apiResponse]);
+  }, [questions]);
 
   // Advanced search parser
   const parseSearchQuery = (query: string) => {
@@ -251,6 +262,22 @@ export function BrowserScreen() {
     showSuspended,
   ]);
 
+  // Prefetch the previews around the focused card in one batch request, so
+  // moving through the table shows them without waiting on the server
+  useEffect(() => {
+    if (filteredCards.length === 0) return;
+    const index = focusedCard
+      ? filteredCards.findIndex((c) => c.id === focusedCard.id)
+      : -1;
+    const ahead = filteredCards.slice(index + 1, index + 1 + PREFETCH_AHEAD);
+    const behind = index > 0
+      ? filteredCards.slice(Math.max(0, index - PREFETCH_BEHIND), index)
+      : [];
+    prefetchQuestionDetails([...ahead, ...behind].map((c) => c.id)).catch(
+      (err) => console.warn("Prefetching previews failed:", err),
+    );
+  }, [filteredCards, focusedCard]);
+
   // Keyboard shortcuts
   useEffect(() => {
     const handleKeyDown = (e: KeyboardEvent) => {
@@ -291,6 +318,30 @@ export function BrowserScreen() {
         }
       }
 
+      // Arrow Up/Down: Move focus through the visible cards
+      if (
+        (e.key === "ArrowDown" || e.key === "ArrowUp") &&
+        !e.ctrlKey &&
+        !e.metaKey &&
+        filteredCards.length > 0
+      ) {
+        const activeElement = document.activeElement;
+        if (
+          activeElement?.tagName !== "INPUT" &&
+          activeElement?.tagName !== "TEXTAREA"
+        ) {
+          e.preventDefault();
+          const index = focusedCard
+            ? filteredCards.findIndex((c) => c.id === focusedCard.id)
+            : -1;
+          const next =
+            e.key === "ArrowDown"
+              ? Math.min(index + 1, filteredCards.length - 1)
+              : Math.max(index - 1, 0);
+          setFocusedCard(filteredCards[next]);
+        }
+      }
+
       // Ctrl/Cmd + E: Quick edit focused card
       if (
         (e.ctrlKey || e.metaKey) &&
@@ -348,7 +399,8 @@ export function BrowserScreen() {
           <div>
             <h1 className="text-[#F0DED3]">Card Browser</h1>
             <p className="text-[#A79385]">
-              {allCards.length.toLocaleString()} cards total •{" "}
+              {(total ?? allCards.length).toLocaleString()} cards total •{" "}
+              {hasMore && `${allCards.length.toLocaleString()} loaded • `}
               {filteredCards.length.toLocaleString()} shown
               {selectedCardIds.length > 0 &&
                 ` • ${selectedCardIds.length} selected`}
@@ -433,6 +485,18 @@ export function BrowserScreen() {
             onSortChange={handleToggleSort}
             searchQuery={searchQuery}
           />
+          {hasMore && (
+            <div className="flex justify-center mt-4">
+              <button
+                type="button"
+                onClick={loadMore}
+                disabled={isLoadingMore}
+                className="px-4 py-2 rounded bg-[#2F3A48] text-[#DEC28C] border border-[#506256] hover:bg-[#506256] disabled:opacity-50"
+              >
+                {isLoadingMore ? "Loading..." : "Load more"}
+              </button>
+            </div>
+          )}
         </div>
 
         {/* Preview */}
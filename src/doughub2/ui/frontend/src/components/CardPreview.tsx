@@ -1,9 +1,8 @@
 import DOMPurify from 'dompurify';
 import { BarChart3, Calendar, Clock, Edit2, Eye, Tag, TrendingUp } from 'lucide-react';
 import { useState } from 'react';
-import { API_ENDPOINTS } from '../config/apiConfig';
-import { useApi } from '../hooks/useApi';
-import type { Card, QuestionDetailResponse } from '../types';
+import { useQuestionDetail } from '../hooks/useQuestionDetail';
+import type { Card } from '../types';
 
 interface CardPreviewProps {
   card: Card | null;
@@ -13,10 +12,8 @@ interface CardPreviewProps {
 export function CardPreview({ card, onEdit }: CardPreviewProps) {
   const [showBack, setShowBack] = useState(false);
 
-  // Fetch detailed question data when a card is selected
-  const { data: questionDetail, isLoading } = useApi<QuestionDetailResponse>(
-    card ? API_ENDPOINTS.questionDetail(card.id) : null
-  );
+  // Detailed question data for the selected card, usually already prefetched
+  const { data: questionDetail, isLoading } = useQuestionDetail(card ? card.id : null);
 
   if (!card) {
     return (
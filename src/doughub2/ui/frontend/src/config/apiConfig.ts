@@ -11,6 +11,17 @@ export const API_ENDPOINTS = {
     /** List all questions */
     questionsList: `${BASE_URL}/questions`,
 
+    /** Get one keyset page of questions; pass the previous page's next_cursor */
+    questionsPage: (limit: number, cursor?: string | null) =>
+        `${BASE_URL}/questions?limit=${limit}` +
+        (cursor ? `&cursor=${encodeURIComponent(cursor)}` : ''),
+
     /** Get details for a specific question by ID */
     questionDetail: (id: number) => `${BASE_URL}/questions/${id}`,
+
+    /** Get details for several questions in one request */
+    questionsBatch: (ids: number[]) => `${BASE_URL}/questions/batch?ids=${ids.join(',')}`,
+
+    /** Get a stored media file (supports Range requests) */
+    mediaFile: (id: number) => `${BASE_URL}/media/${id}`,
 } as const;
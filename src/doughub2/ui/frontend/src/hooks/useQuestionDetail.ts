@@ -0,0 +1,185 @@
+import { useEffect, useState } from 'react';
+import { API_ENDPOINTS } from '../config/apiConfig';
+import { QuestionBatchResponse, QuestionDetailResponse } from '../types';
+
+// Most IDs the server accepts in one /questions/batch request
+const MAX_BATCH_IDS = 100;
+
+// Question details kept in memory, least recently used evicted first
+const CACHE_SIZE = 300;
+
+interface CachedDetail {
+    detail: QuestionDetailResponse;
+    etag: string | null; // As sent by GET /questions/{id}, for If-None-Match
+}
+
+const cache = new Map<number, CachedDetail>();
+const pending = new Map<number, Promise<void>>();
+const revalidating = new Map<number, Promise<QuestionDetailResponse | null>>();
+
+function remember(entry: CachedDetail) {
+    const id = entry.detail.question_id;
+    cache.delete(id);
+    cache.set(id, entry);
+    if (cache.size > CACHE_SIZE) {
+        const oldest = cache.keys().next().value;
+        if (oldest !== undefined) cache.delete(oldest);
+    }
+}
+
+function lookup(id: number): QuestionDetailResponse | undefined {
+    const entry = cache.get(id);
+    if (entry) remember(entry);
+    return entry?.detail;
+}
+
+async function fetchBatch(ids: number[]): Promise<void> {
+    const response = await fetch(API_ENDPOINTS.questionsBatch(ids));
+    if (!response.ok) {
+        throw new Error(`HTTP error! Status: ${response.status}`);
+    }
+    const batch = (await response.json()) as QuestionBatchResponse;
+    batch.questions.forEach((detail) =>
+        remember({ detail, etag: batch.etags[detail.question_id] ?? null })
+    );
+}
+
+async function fetchIfChanged(id: number): Promise<QuestionDetailResponse | null> {
+    const entry = cache.get(id);
+    const headers: Record<string, string> = entry?.etag ? { 'If-None-Match': entry.etag } : {};
+    const response = await fetch(API_ENDPOINTS.questionDetail(id), { headers });
+    if (response.status === 304 && entry) {
+        return entry.detail;
+    }
+    if (response.status === 404) {
+        cache.delete(id);
+        return null;
+    }
+    if (!response.ok) {
+        throw new Error(`HTTP error! Status: ${response.status}`);
+    }
+    const detail = (await response.json()) as QuestionDetailResponse;
+    remember({ detail, etag: response.headers.get('ETag') });
+    return detail;
+}
+
+/**
+ * Check a cached question against the server, replacing it if it changed.
+ *
+ * The stored ETag is sent as If-None-Match, so an unchanged question costs an
+ * empty 304. Concurrent checks of the same question share one request.
+ *
+ * @param id - The question ID.
+ * @returns The current details, or null if the question no longer exists.
+ */
+function revalidate(id: number): Promise<QuestionDetailResponse | null> {
+    let request = revalidating.get(id);
+    if (!request) {
+        request = fetchIfChanged(id).finally(() => revalidating.delete(id));
+        revalidating.set(id, request);
+    }
+    return request;
+}
+
+/**
+ * Load question details into the preview cache in as few requests as possible.
+ *
+ * IDs already cached or being fetched are skipped; the rest are fetched with
+ * /questions/batch, up to MAX_BATCH_IDS per request.
+ *
+ * @param ids - Question IDs, most wanted first.
+ * @returns A promise resolved when every requested batch has settled.
+ */
+export function prefetchQuestionDetails(ids: number[]): Promise<void> {
+    const wanted = [...new Set(ids)].filter((id) => !cache.has(id) && !pending.has(id));
+    const requests: Promise<void>[] = [];
+
+    for (let i = 0; i < wanted.length; i += MAX_BATCH_IDS) {
+        const chunk = wanted.slice(i, i + MAX_BATCH_IDS);
+        const request = fetchBatch(chunk).finally(() => {
+            chunk.forEach((id) => pending.delete(id));
+        });
+        chunk.forEach((id) => pending.set(id, request));
+        requests.push(request);
+    }
+
+    return Promise.all(requests).then(() => undefined);
+}
+
+interface UseQuestionDetailResult {
+    data: QuestionDetailResponse | null;
+    isLoading: boolean;
+    error: Error | null;
+}
+
+/**
+ * Custom hook for a question's details, served from the prefetch cache.
+ *
+ * Details prefetched with prefetchQuestionDetails() are returned at once and
+ * then revalidated with If-None-Match, so a question re-extracted or edited
+ * since it was cached is replaced by its current version; otherwise the
+ * question is fetched (joining an in-flight prefetch if any).
+ *
+ * @param id - The question ID, or null to fetch nothing.
+ * @returns The details, loading state and error.
+ */
+export function useQuestionDetail(id: number | null): UseQuestionDetailResult {
+    const [data, setData] = useState<QuestionDetailResponse | null>(
+        id !== null ? lookup(id) ?? null : null
+    );
+    const [isLoading, setIsLoading] = useState<boolean>(false);
+    const [error, setError] = useState<Error | null>(null);
+
+    useEffect(() => {
+        if (id === null) {
+            setData(null);
+            setIsLoading(false);
+            setError(null);
+            return;
+        }
+
+        let cancelled = false;
+        const cached = lookup(id);
+        if (cached) {
+            setData(cached);
+            setIsLoading(false);
+            setError(null);
+
+            revalidate(id)
+                .then((current) => {
+                    if (cancelled) return;
+                    setData(current);
+                    if (!current) setError(new Error('Question not found'));
+                })
+                .catch((err) => {
+                    // Keep showing the cached copy
+                    console.warn(`Could not revalidate question ${id}:`, err);
+                });
+            return () => {
+                cancelled = true;
+            };
+        }
+
+        setData(null);
+        setIsLoading(true);
+        setError(null);
+
+        (pending.get(id) ?? prefetchQuestionDetails([id]))
+            .then(() => {
+                if (!cancelled) setData(lookup(id) ?? null);
+            })
+            .catch((err) => {
+                if (cancelled) return;
+                setError(err instanceof Error ? err : new Error('An unknown error occurred'));
+            })
+            .finally(() => {
+                if (!cancelled) setIsLoading(false);
+            });
+
+        return () => {
+            cancelled = true;
+        };
+    }, [id]);
+
+    return { data, isLoading, error };
+}
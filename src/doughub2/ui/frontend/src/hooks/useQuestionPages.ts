@@ -0,0 +1,89 @@
+import { useCallback, useEffect, useState } from 'react';
+import { API_ENDPOINTS } from '../config/apiConfig';
+import { QuestionInfo, QuestionListResponse } from '../types';
+
+interface UseQuestionPagesResult {
+    questions: QuestionInfo[];
+    total: number | null;
+    hasMore: boolean;
+    isLoading: boolean;
+    isLoadingMore: boolean;
+    error: Error | null;
+    loadMore: () => void;
+}
+
+/**
+ * Custom hook for reading the question list one keyset page at a time.
+ *
+ * The first page is fetched on mount; loadMore() appends the next page
+ * using the cursor returned by the previous one.
+ *
+ * @param pageSize - Number of questions to request per page.
+ * @returns The questions loaded so far, the total count, and paging state.
+ */
+export function useQuestionPages(pageSize: number): UseQuestionPagesResult {
+    const [questions, setQuestions] = useState<QuestionInfo[]>([]);
+    const [total, setTotal] = useState<number | null>(null);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [isLoading, setIsLoading] = useState<boolean>(true);
+    const [isLoadingMore, setIsLoadingMore] = useState<boolean>(false);
+    const [error, setError] = useState<Error | null>(null);
+
+    const fetchPage = useCallback(async (cursor: string | null) => {
+        const response = await fetch(API_ENDPOINTS.questionsPage(pageSize, cursor));
+        if (!response.ok) {
+            throw new Error(`HTTP error! Status: ${response.status}`);
+        }
+        return (await response.json()) as QuestionListResponse;
+    }, [pageSize]);
+
+    useEffect(() => {
+        let cancelled = false;
+        setIsLoading(true);
+        setError(null);
+
+        fetchPage(null)
+            .then((page) => {
+                if (cancelled) return;
+                setQuestions(page.questions);
+                setTotal(page.total ?? null);
+                setNextCursor(page.next_cursor ?? null);
+            })
+            .catch((err) => {
+                if (cancelled) return;
+                setError(err instanceof Error ? err : new Error('An unknown error occurred'));
+            })
+            .finally(() => {
+                if (!cancelled) setIsLoading(false);
+            });
+
+        return () => {
+            cancelled = true;
+        };
+    }, [fetchPage]);
+
+    const loadMore = useCallback(() => {
+        if (!nextCursor || isLoadingMore) return;
+        setIsLoadingMore(true);
+
+        fetchPage(nextCursor)
+            .then((page) => {
+                setQuestions((prev) => [...prev, ...page.questions]);
+                setNextCursor(page.next_cursor ?? null);
+            })
+            .catch((err) => {
+                setError(err instanceof Error ? err : new Error('An unknown error occurred'));
+            })
+            .finally(() => setIsLoadingMore(false));
+    }, [fetchPage, nextCursor, isLoadingMore]);
+
+    return {
+        questions,
+        total,
+        hasMore: nextCursor !== null,
+        isLoading,
+        isLoadingMore,
+        error,
+        loadMore,
+    };
+}
@@ -40,6 +40,16 @@ export interface QuestionInfo {
 
 export interface QuestionListResponse {
   questions: QuestionInfo[];
+  next_cursor: string | null;
+  total: number | null; // Only set on the first page
+}
+
+export interface MediaInfo {
+  media_id: number;
+  media_role: string;
+  media_type: string | null;
+  mime_type: string;
+  sha256: string | null; // Set for content-addressed files, cached immutably
 }
 
 export interface QuestionDetailResponse {
@@ -47,4 +57,11 @@ export interface QuestionDetailResponse {
   source_name: string;
   source_question_key: string;
   raw_html: string;
+  media: MediaInfo[];
+}
+
+export interface QuestionBatchResponse {
+  questions: QuestionDetailResponse[]; // In the order the IDs were requested
+  etags: Record<number, string>; // ETag of each question, for If-None-Match
+  missing: number[];
 }
@@ -144,6 +144,18 @@
             const pageHTML = document.documentElement.outerHTML;
             const bodyText = document.body.innerText;
 
+            // Skip the full upload if the server already has this question
+            if (await isAlreadyStored(window.location.href, config.siteName, bodyText)) {
+                console.log('[Anki Extractor] Question already stored, skipping upload');
+                button.className = 'success';
+                button.innerHTML = '<span class="anki-extractor-icon">Γ£ô</span>Already saved';
+                setTimeout(() => {
+                    button.className = '';
+                    button.innerHTML = '<span class="anki-extractor-icon">≡ƒÄ┤</span>Debug Extract';
+                }, 3000);
+                return;
+            }
+
             // Extract ALL images from the page
             const imageData = [];
 
@@ -318,6 +330,64 @@
         return data;
     }
 
+    /**
+     * Whitespace collapsed before hashing: the Unicode White_Space characters.
+     * Must match BODY_WHITESPACE in doughub2/persistence/repository.py exactly;
+     * \s is not used because it differs from the server's (U+FEFF, U+001C-U+001F).
+     */
+    const BODY_WHITESPACE = /[\t\n\v\f\r \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]+/;
+
+    /**
+     * Hash body text the same way the server does (compute_body_hash):
+     * NFC-normalize, collapse BODY_WHITESPACE, then SHA-256 as hex.
+     */
+    async function computeBodyHash(bodyText) {
+        const normalized = bodyText.normalize('NFC').split(BODY_WHITESPACE).filter(Boolean).join(' ');
+        const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(normalized));
+        return Array.from(new Uint8Array(digest))
+            .map(b => b.toString(16).padStart(2, '0'))
+            .join('');
+    }
+
+    /**
+     * Ask the local server whether this question is already stored.
+     * Resolves false on any error so extraction falls back to a full upload.
+     */
+    async function isAlreadyStored(url, siteName, bodyText) {
+        let bodyHash = '';
+        try {
+            bodyHash = await computeBodyHash(bodyText);
+        } catch (err) {
+            console.warn('[Anki Extractor] Could not hash body text:', err);
+        }
+
+        const params = new URLSearchParams({ url: url, siteName: siteName });
+        if (bodyHash) {
+            params.set('body_hash', bodyHash);
+        }
+
+        return new Promise((resolve) => {
+            GM_xmlhttpRequest({
+                method: 'GET',
+                url: LOCAL_SERVER_URL + '/exists?' + params.toString(),
+                timeout: 2000,
+                onload: function (response) {
+                    if (response.status !== 200) {
+                        resolve(false);
+                        return;
+                    }
+                    try {
+                        resolve(JSON.parse(response.responseText).exists === true);
+                    } catch (err) {
+                        resolve(false);
+                    }
+                },
+                onerror: function () { resolve(false); },
+                ontimeout: function () { resolve(false); }
+            });
+        });
+    }
+
     /**
      * Send extracted data to local server
      */
@@ -333,7 +403,8 @@
                 },
                 data: JSON.stringify(payload),
                 onload: function (response) {
-                    if (response.status === 200) {
+                    // 202: queued for background processing (see status_url in the response)
+                    if (response.status === 200 || response.status === 202) {
                         console.log('[Anki Extractor] Γ£ô Data sent to server successfully');
                         console.log('[Anki Extractor] Server response:', response.responseText);
                         resolve(response);
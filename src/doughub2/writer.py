@@ -0,0 +1,197 @@
+"""Group-commit writer: one thread commits database writes in batches.
+
+Each commit on SQLite is a write to the journal (an fsync unless
+synchronous is relaxed), and concurrent writers queue on the database
+lock one commit at a time. Instead of every caller committing its own
+session, callers submit units of work (functions taking a Session) to a
+single writer thread. The writer takes every unit that has been submitted,
+up to WRITER_MAX_BATCH, runs them all in one transaction and commits once,
+then resolves each caller's future with its own unit's result. Units that
+arrive while a batch is being committed form the next batch, so batches
+grow with the load: a lone write is committed straight away, and a burst
+of N writes costs a handful of commits instead of N. WRITER_MAX_DELAY can
+make the writer wait a little for more units before each commit.
+
+If any unit of a batch fails, the batch is rolled back and each unit is
+retried in its own transaction, so one bad unit fails only its own caller.
+Units may therefore run twice and should not have side effects outside the
+session that are unsafe to repeat.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from sqlalchemy.orm import Session
+
+from doughub2.config import settings
+from doughub2.database import get_session_local
+
+logger = logging.getLogger("doughub2")
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Unit:
+    """A submitted unit of work and the future its caller waits on."""
+
+    work: Callable[[Session], Any]
+    future: Future = field(default_factory=Future)
+
+
+class GroupCommitWriter:
+    """Runs submitted database writes on one thread, committing in batches."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_batch: int = 64,
+        max_delay: float = 0.0,
+        name: str = "doughub2-writer",
+    ) -> None:
+        """Initialize the writer. Its thread starts on the first submit.
+
+        Args:
+            session_factory: Creates the session each batch is written with.
+            max_batch: Maximum number of units committed together.
+            max_delay: Seconds to wait for more units once one has arrived;
+                0 commits only the units already submitted.
+            name: Name of the writer thread.
+        """
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.name = name
+        self.commits = 0
+        self.units = 0
+        self._queue: queue.Queue[_Unit | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, work: Callable[[Session], T]) -> "Future[T]":
+        """Queue a unit of work for the next batch.
+
+        Args:
+            work: Called with the batch's session on the writer thread. It
+                must not commit or roll back; its return value becomes the
+                future's result, and any exception fails only this unit.
+
+        Returns:
+            A future resolved once the unit's transaction has committed.
+        """
+        unit = _Unit(work)
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._work, name=self.name, daemon=True
+                )
+                self._thread.start()
+            self._queue.put(unit)
+        return unit.future
+
+    def _collect(self, first: _Unit) -> tuple[list[_Unit], bool]:
+        """Gather the units submitted within max_delay of the first one.
+
+        Returns:
+            The batch, and whether shutdown was requested while collecting.
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                unit = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if unit is None:
+                return batch, True
+            batch.append(unit)
+        return batch, False
+
+    def _work(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stopping = self._collect(first)
+            self._write(batch)
+
+    def _write(self, batch: list[_Unit]) -> None:
+        """Run a batch in one transaction, or unit by unit if that fails."""
+        session = self.session_factory()
+        try:
+            try:
+                results = [unit.work(session) for unit in batch]
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                if len(batch) == 1:
+                    batch[0].future.set_exception(e)
+                    return
+                logger.warning(
+                    f"Group commit of {len(batch)} units failed, "
+                    f"retrying individually: {e}"
+                )
+                for unit in batch:
+                    self._write_alone(unit, session)
+            else:
+                self.commits += 1
+                self.units += len(batch)
+                for unit, result in zip(batch, results):
+                    unit.future.set_result(result)
+        finally:
+            session.close()
+
+    def _write_alone(self, unit: _Unit, session: Session) -> None:
+        try:
+            result = unit.work(session)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            unit.future.set_exception(e)
+        else:
+            self.commits += 1
+            self.units += 1
+            unit.future.set_result(result)
+
+    def shutdown(self) -> None:
+        """Stop the writer after the units already submitted are committed."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._queue.put(None)
+        if thread is not None:
+            thread.join()
+
+
+# Writer (lazy initialization)
+_writer: GroupCommitWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> GroupCommitWriter:
+    """Get or create the writer for the application database."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = GroupCommitWriter(
+                get_session_local(),
+                max_batch=settings.WRITER_MAX_BATCH,
+                max_delay=settings.WRITER_MAX_DELAY,
+            )
+        return _writer
+
+
+def shutdown_writer() -> None:
+    """Commit pending writes and stop the writer thread."""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.shutdown()
@@ -0,0 +1,84 @@
+"""
+Shared pytest fixtures for the DougHub2 test suite.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class StubImageServer:
+    """A local HTTP server serving canned responses for download tests.
+
+    Routes map a path to a list of (status, body) responses; each request to
+    the path consumes the next response, and the last one repeats.
+    """
+
+    def __init__(self) -> None:
+        self.routes: dict[str, list[tuple[int, bytes]]] = {}
+        self.hits: dict[str, int] = {}
+        self.delay = 0.0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    def add(self, path: str, *responses: tuple[int, bytes]) -> str:
+        self.routes[path] = list(responses)
+        return self.url(path)
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with stub._lock:
+                    stub.active += 1
+                    stub.max_active = max(stub.max_active, stub.active)
+                    count = stub.hits.get(self.path, 0)
+                    stub.hits[self.path] = count + 1
+                try:
+                    if stub.delay:
+                        time.sleep(stub.delay)
+                    responses = stub.routes.get(self.path, [(404, b"not found")])
+                    status, body = responses[min(count, len(responses) - 1)]
+                    self.send_response(status)
+                    self.send_header("Content-Type", "image/png")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with stub._lock:
+                        stub.active -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def image_server():
+    """Run a stub HTTP image server for the duration of a test."""
+    server = StubImageServer()
+    server.start()
+    yield server
+    server.stop()
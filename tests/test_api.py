@@ -5,27 +5,47 @@ This module contains tests for the FastAPI application and
 extraction endpoints including database persistence.
 """
 
+import asyncio
+import gzip
 import json
+import threading
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import event, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
-
-from doughub2.database import get_db
+from sqlalchemy.pool import NullPool
+
+from doughub2.api import media as media_api
+from doughub2.database import (
+    create_async_db_engine,
+    create_db_engine,
+    get_async_db,
+    get_db,
+    get_session_factory,
+)
+from doughub2.detail_cache import question_detail_cache
+from doughub2.jobs import JobQueue
+from doughub2.known_questions import known_questions
 from doughub2.main import api_app as app
-from doughub2.models import Base, Media, Question, Source
+from doughub2.models import Base, Log, Media, Question, Source
+from doughub2.persistence import QuestionRepository, compute_body_hash
+from doughub2.writer import GroupCommitWriter, get_writer
 
 
 # Test database setup
 @pytest.fixture
-def test_db_setup():
-    """Create an in-memory SQLite database and session for testing."""
-    # Use a named in-memory database to share across connections
-    engine = create_engine(
-        "sqlite:///file::memory:?cache=shared&uri=true",
+def test_db_setup(tmp_path):
+    """Create a temporary SQLite database and session for testing."""
+    engine = create_db_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        "production",
         connect_args={"check_same_thread": False},
     )
     Base.metadata.create_all(engine)
@@ -33,22 +53,50 @@ def test_db_setup():
     session = TestSessionLocal()
     yield engine, session
     session.close()
-    Base.metadata.drop_all(engine)
     engine.dispose()
 
 
 @pytest.fixture
-def client(test_db_setup):
-    """Create a test client with overridden database dependency."""
+def async_engine(test_db_setup):
+    """An async engine on the test database, as used by the async routers."""
+    engine, _ = test_db_setup
+    # Each TestClient request runs on its own event loop, so connections
+    # are not pooled across requests
+    return create_async_db_engine(
+        engine.url.render_as_string(hide_password=False),
+        "production",
+        poolclass=NullPool,
+    )
+
+
+@pytest.fixture
+def client(test_db_setup, async_engine):
+    """Create a test client with overridden database dependencies."""
     engine, session = test_db_setup
 
     def override_get_db():
         yield session
 
+    async def override_get_async_db():
+        async with AsyncSession(async_engine, expire_on_commit=False) as async_session:
+            yield async_session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    # Streamed exports open their own session; give them the test session
+    app.dependency_overrides[get_session_factory] = lambda: lambda: session
+    # Background extraction jobs persist through a writer on the test session
+    writer = GroupCommitWriter(lambda: session)
+    app.dependency_overrides[get_writer] = lambda: writer
+    # The known question index is process-wide; rebuild it from this database
+    known_questions.clear()
+    question_detail_cache.clear()
     test_client = TestClient(app)
     yield test_client, session
+    writer.shutdown()
     app.dependency_overrides.clear()
+    known_questions.clear()
+    question_detail_cache.clear()
 
 
 @pytest.fixture
@@ -98,7 +146,7 @@ class TestExtractEndpoint:
                 "images": [],
             }
 
-            response = test_client.post("/extract", json=payload)
+            response = test_client.post("/extract", json=payload, params={"wait": True})
 
             assert response.status_code == 200
             data = response.json()
@@ -125,29 +173,18 @@ class TestExtractEndpoint:
             assert question.status == "extracted"
             assert "<html>" in question.raw_html
 
-    def test_extract_with_images_mocked(self, client, temp_dirs):
-        """Test extraction with images uses urlretrieve and adds media records."""
+    def test_extract_with_images_downloaded(self, client, temp_dirs, image_server):
+        """Test extraction with images downloads them and adds media records."""
         test_client, test_session = client
         output_dir, media_root = temp_dirs
 
-        with (
-            patch("doughub2.api.extractions.settings") as mock_settings,
-            patch(
-                "doughub2.api.extractions.urllib.request.urlretrieve"
-            ) as mock_urlretrieve,
-        ):
+        image_url = image_server.add("/images/question1.jpg", (200, b"fake image data"))
+
+        with patch("doughub2.api.extractions.settings") as mock_settings:
             mock_settings.EXTRACTION_DIR = output_dir
             mock_settings.MEDIA_ROOT = str(media_root)
             mock_settings.DATABASE_URL = "sqlite:///:memory:"
 
-            # Make urlretrieve create a dummy file
-            def create_dummy_file(url, path):
-                path = Path(path)
-                path.parent.mkdir(parents=True, exist_ok=True)
-                path.write_bytes(b"fake image data")
-
-            mock_urlretrieve.side_effect = create_dummy_file
-
             payload = {
                 "timestamp": "2025-01-01T12:00:00Z",
                 "url": "https://example.com/questions/q456",
@@ -160,26 +197,92 @@ class TestExtractEndpoint:
                 "elements": [],
                 "images": [
                     {
-                        "url": "https://example.com/images/question1.jpg",
+                        "url": image_url,
                         "title": "Question Image",
                         "type": "image",
                     }
                 ],
             }
 
-            response = test_client.post("/extract", json=payload)
+            response = test_client.post("/extract", json=payload, params={"wait": True})
 
             assert response.status_code == 200
             data = response.json()
             assert data["status"] == "success"
 
-            # Verify urlretrieve was called with correct URL
-            mock_urlretrieve.assert_called_once()
-            call_args = mock_urlretrieve.call_args[0]
-            assert call_args[0] == "https://example.com/images/question1.jpg"
+            # Verify the image was fetched once and saved under the base filename
+            assert image_server.hits["/images/question1.jpg"] == 1
+            assert len(data["files"]["images"]) == 1
+            image_path = Path(data["files"]["images"][0])
             # The path should contain our base filename pattern
-            assert "Test_Site" in str(call_args[1])
-            assert "_img0.jpg" in str(call_args[1])
+            assert "Test_Site" in str(image_path)
+            assert image_path.name.endswith("_img0.jpg")
+            assert image_path.read_bytes() == b"fake image data"
+
+            media = test_session.query(Media).all()
+            assert len(media) == 1
+            assert media[0].mime_type == "image/jpeg"
+            assert media[0].relative_path.startswith(f"blobs/{media[0].sha256[:2]}/")
+            assert (media_root / media[0].relative_path).read_bytes() == (
+                b"fake image data"
+            )
+
+    def test_shared_images_are_stored_once(self, client, temp_dirs, image_server):
+        """Test that questions sharing an image reference a single stored blob."""
+        test_client, test_session = client
+        output_dir, media_root = temp_dirs
+
+        logo_url = image_server.add("/logo.png", (200, b"shared logo"))
+
+        with patch("doughub2.api.extractions.settings") as mock_settings:
+            mock_settings.EXTRACTION_DIR = output_dir
+            mock_settings.MEDIA_ROOT = str(media_root)
+
+            for key in ("shared1", "shared2"):
+                response = test_client.post(
+                    "/extract",
+                    json={
+                        "url": f"https://example.com/questions/{key}",
+                        "siteName": "Test_Site",
+                        "pageHTML": "<html></html>",
+                        "bodyText": f"Question {key}",
+                        "images": [{"url": logo_url}],
+                    },
+                    params={"wait": True},
+                )
+                assert response.status_code == 200
+
+        media = test_session.query(Media).all()
+        assert len(media) == 2
+        assert media[0].relative_path == media[1].relative_path
+        assert {m.mime_type for m in media} == {"image/png"}
+        assert len([p for p in media_root.rglob("*") if p.is_file()]) == 1
+
+    def test_extract_records_failed_image_downloads(
+        self, client, temp_dirs, image_server
+    ):
+        """Test that a failed image download is reported without failing the extraction."""
+        test_client, test_session = client
+        output_dir, media_root = temp_dirs
+
+        with patch("doughub2.api.extractions.settings") as mock_settings:
+            mock_settings.EXTRACTION_DIR = output_dir
+            mock_settings.MEDIA_ROOT = str(media_root)
+            mock_settings.DATABASE_URL = "sqlite:///:memory:"
+
+            payload = {
+                "url": "https://example.com/questions/q457",
+                "siteName": "Test_Site",
+                "images": [{"url": image_server.url("/images/missing.jpg")}],
+            }
+
+            response = test_client.post("/extract", json=payload, params={"wait": True})
+
+            assert response.status_code == 200
+            data = response.json()
+            assert data["status"] == "success"
+            assert data["files"]["images"] == []
+            assert test_session.query(Media).count() == 0
 
     def test_extract_requires_url_field(self, client):
         """Test that the extract endpoint requires a URL field."""
@@ -201,7 +304,7 @@ class TestExtractEndpoint:
                 "url": "https://minimal.example.com/test/item789",
             }
 
-            response = test_client.post("/extract", json=payload)
+            response = test_client.post("/extract", json=payload, params={"wait": True})
 
             assert response.status_code == 200
             data = response.json()
@@ -244,7 +347,7 @@ class TestExtractEndpoint:
             }
 
             # Make API call
-            response = test_client.post("/extract", json=payload)
+            response = test_client.post("/extract", json=payload, params={"wait": True})
             assert response.status_code == 200
 
             response_data = response.json()
@@ -275,6 +378,457 @@ class TestExtractEndpoint:
             assert len(html_files) >= 1, "Expected at least one HTML file to be created"
 
 
+class TestExtractionExistsEndpoint:
+    """Tests for the /extract/exists pre-check endpoint."""
+
+    def _extract(self, test_client, output_dir, media_root, url, body_text):
+        with patch("doughub2.api.extractions.settings") as mock_settings:
+            mock_settings.EXTRACTION_DIR = output_dir
+            mock_settings.MEDIA_ROOT = str(media_root)
+            response = test_client.post(
+                "/extract",
+                json={
+                    "url": url,
+                    "siteName": "Test Site",
+                    "pageHTML": "<html></html>",
+                    "bodyText": body_text,
+                },
+                params={"wait": True},
+            )
+        assert response.status_code == 200
+
+    def test_unknown_question(self, client):
+        """Test that an unseen question is reported as missing."""
+        test_client, _ = client
+
+        response = test_client.get(
+            "/extract/exists",
+            params={"url": "https://example.com/questions/new1", "siteName": "X"},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"exists": False, "matched_by": None}
+
+    def test_known_after_extraction(self, client, temp_dirs):
+        """Test that a stored question is found by URL and by body hash."""
+        test_client, _ = client
+        output_dir, media_root = temp_dirs
+        self._extract(
+            test_client,
+            output_dir,
+            media_root,
+            "https://example.com/questions/q900",
+            "Which drug is first line?",
+        )
+
+        by_url = test_client.get(
+            "/extract/exists",
+            params={
+                "url": "https://example.com/questions/q900/",
+                "siteName": "Test Site",
+            },
+        ).json()
+        by_hash = test_client.get(
+            "/extract/exists",
+            params={
+                "url": "https://example.com/questions/other",
+                "siteName": "Test Site",
+                "body_hash": compute_body_hash("Which  drug is\nfirst line?"),
+            },
+        ).json()
+        other_source = test_client.get(
+            "/extract/exists",
+            params={
+                "url": "https://example.com/questions/q900",
+                "siteName": "Other Site",
+            },
+        ).json()
+
+        assert by_url == {"exists": True, "matched_by": "source_key"}
+        assert by_hash == {"exists": True, "matched_by": "body_hash"}
+        assert other_source["exists"] is False
+
+    def test_warms_from_database(self, client):
+        """Test that questions stored before the first check are found."""
+        test_client, test_session = client
+        source = Source(name="Test_Site")
+        test_session.add(source)
+        test_session.flush()
+        test_session.add(
+            Question(
+                source_id=source.source_id,
+                source_question_key="q901",
+                raw_html="<html></html>",
+                raw_metadata_json="{}",
+                body_hash=compute_body_hash("Stored body"),
+            )
+        )
+        test_session.commit()
+
+        response = test_client.get(
+            "/extract/exists",
+            params={
+                "url": "https://example.com/questions/unrelated",
+                "siteName": "Test Site",
+                "body_hash": compute_body_hash("Stored body"),
+            },
+        )
+
+        assert response.json()["matched_by"] == "body_hash"
+
+
+class TestExtractionJobs:
+    """Tests for queued extraction processing."""
+
+    def _wait_for_job(self, test_client, status_url, timeout=5.0):
+        """Poll a job status URL until the job has finished."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            job = test_client.get(status_url).json()
+            if job["status"] in ("succeeded", "failed"):
+                return job
+            time.sleep(0.02)
+        raise AssertionError(f"Job did not finish: {job}")
+
+    def test_extract_returns_202_with_job(self, client, temp_dirs):
+        """Test that extraction is queued and its result can be polled."""
+        test_client, test_session = client
+        output_dir, media_root = temp_dirs
+
+        with patch("doughub2.api.extractions.settings") as mock_settings:
+            mock_settings.EXTRACTION_DIR = output_dir
+            mock_settings.MEDIA_ROOT = str(media_root)
+
+            response = test_client.post(
+                "/extract",
+                json={
+                    "url": "https://example.com/questions/queued1",
+                    "siteName": "Queue_Test",
+                    "bodyText": "Queued question",
+                },
+            )
+
+            assert response.status_code == 202
+            data = response.json()
+            assert data["status"] == "queued"
+            assert data["status_url"] == f"/extract/jobs/{data['job_id']}"
+            assert response.headers["Location"] == data["status_url"]
+
+            job = self._wait_for_job(test_client, data["status_url"])
+
+        assert job["status"] == "succeeded"
+        assert job["stage"] == "done"
+        assert job["finished_at"] is not None
+        assert job["result"]["status"] == "success"
+        assert job["result"]["database"]["persisted"] is True
+        assert (
+            test_session.query(Question)
+            .filter_by(source_question_key="queued1")
+            .count()
+            == 1
+        )
+
+    def test_failed_job_reports_error(self, client, temp_dirs):
+        """Test that a failing pipeline marks the job failed with its error."""
+        test_client, _ = client
+
+        with patch(
+            "doughub2.api.extractions.write_extraction_html",
+            side_effect=OSError("disk full"),
+        ):
+            response = test_client.post(
+                "/extract", json={"url": "https://example.com/questions/broken"}
+            )
+            job = self._wait_for_job(test_client, response.json()["status_url"])
+
+        assert job["status"] == "failed"
+        assert job["error"] == "disk full"
+        assert job["result"] is None
+
+    def test_wait_returns_500_on_failure(self, client):
+        """Test that a failing pipeline surfaces as 500 when waiting."""
+        test_client, _ = client
+
+        with patch(
+            "doughub2.api.extractions.write_extraction_html",
+            side_effect=OSError("disk full"),
+        ):
+            response = test_client.post(
+                "/extract",
+                json={"url": "https://example.com/questions/broken"},
+                params={"wait": True},
+            )
+
+        assert response.status_code == 500
+        assert response.json()["detail"] == "disk full"
+
+    def test_unknown_job_returns_404(self, client):
+        """Test that an unknown job ID returns 404."""
+        test_client, _ = client
+
+        response = test_client.get("/extract/jobs/does-not-exist")
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Job not found"
+
+    def test_full_queue_returns_503(self, client):
+        """Test that a full ingest queue pushes back with Retry-After."""
+        test_client, _ = client
+        release = threading.Event()
+        queue = JobQueue(lambda job: release.wait(5), workers=1, max_depth=1)
+
+        try:
+            with patch("doughub2.api.extractions.get_ingest_queue", return_value=queue):
+                statuses = [
+                    test_client.post(
+                        "/extract",
+                        json={"url": f"https://example.com/questions/burst{i}"},
+                    )
+                    for i in range(4)
+                ]
+        finally:
+            release.set()
+            queue.shutdown()
+
+        assert statuses[0].status_code == 202
+        assert statuses[-1].status_code == 503
+        assert "Retry-After" in statuses[-1].headers
+
+
+class TestBatchExtractEndpoint:
+    """Tests for the NDJSON batch extraction endpoint."""
+
+    @staticmethod
+    def _ndjson(*records):
+        """Encode records (dicts or raw strings) as an NDJSON body."""
+        return "\n".join(
+            r if isinstance(r, str) else json.dumps(r) for r in records
+        ).encode()
+
+    def test_batch_persists_records_and_reports_per_item(self, client, temp_dirs):
+        """Test that valid lines are persisted and invalid ones reported."""
+        test_client, test_session = client
+        output_dir, media_root = temp_dirs
+
+        body = self._ndjson(
+            {"url": "https://example.com/questions/b1", "siteName": "Batch"},
+            {"url": "https://example.com/questions/b2", "siteName": "Batch"},
+            "",
+            "{not json",
+            {"siteName": "Batch"},
+            {"url": "https://example.com/questions/b3", "siteName": "Batch"},
+        )
+
+        with patch("doughub2.api.extractions.settings") as mock_settings:
+            mock_settings.EXTRACTION_DIR = output_dir
+            mock_settings.MEDIA_ROOT = str(media_root)
+            mock_settings.BATCH_GROUP_SIZE = 50
+            mock_settings.BATCH_MAX_RECORD_BYTES = 1024 * 1024
+
+            response = test_client.post(
+                "/extract/batch",
+                content=body,
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 5
+        assert data["succeeded"] == 3
+        assert data["failed"] == 2
+
+        by_line = {r["line"]: r for r in data["results"]}
+        assert sorted(by_line) == [1, 2, 4, 5, 6]
+        assert by_line[1]["status"] == "success"
+        assert by_line[1]["result"]["database"]["persisted"] is True
+        assert by_line[4]["status"] == "error"
+        assert by_line[5]["status"] == "error"
+        assert by_line[6]["url"] == "https://example.com/questions/b3"
+
+        keys = {q.source_question_key for q in test_session.query(Question).all()}
+        assert keys == {"b1", "b2", "b3"}
+
+    def test_batch_commits_once_per_group(self, client, temp_dirs):
+        """Test that records are committed in groups, not one by one."""
+        test_client, test_session = client
+        output_dir, media_root = temp_dirs
+        commits = []
+        event.listen(test_session, "after_commit", lambda s: commits.append(1))
+
+        body = self._ndjson(
+            *(
+                {"url": f"https://example.com/questions/g{i}", "siteName": "Group"}
+                for i in range(5)
+            )
+        )
+
+        with patch("doughub2.api.extractions.settings") as mock_settings:
+            mock_settings.EXTRACTION_DIR = output_dir
+            mock_settings.MEDIA_ROOT = str(media_root)
+            mock_settings.BATCH_GROUP_SIZE = 2
+            mock_settings.BATCH_MAX_RECORD_BYTES = 1024 * 1024
+
+            response = test_client.post("/extract/batch", content=body)
+
+        assert response.json()["succeeded"] == 5
+        assert len(commits) == 3
+        assert test_session.query(Question).count() == 5
+
+    def test_batch_persists_through_the_writer(self, client, temp_dirs):
+        """Test that each group is one unit of work for the group-commit writer."""
+        test_client, test_session = client
+        output_dir, media_root = temp_dirs
+        writer = app.dependency_overrides[get_writer]()
+
+        body = self._ndjson(
+            *(
+                {"url": f"https://example.com/questions/w{i}", "siteName": "Writer"}
+                for i in range(3)
+            )
+        )
+
+        with patch("doughub2.api.extractions.settings") as mock_settings:
+            mock_settings.EXTRACTION_DIR = output_dir
+            mock_settings.MEDIA_ROOT = str(media_root)
+            mock_settings.BATCH_GROUP_SIZE = 2
+            mock_settings.BATCH_MAX_RECORD_BYTES = 1024 * 1024
+
+            response = test_client.post("/extract/batch", content=body)
+
+        assert response.json()["succeeded"] == 3
+        assert writer.units == 2
+        assert test_session.query(Question).count() == 3
+
+    def test_batch_isolates_failing_record(self, client, temp_dirs):
+        """Test that one failing record does not roll back its group."""
+        test_client, test_session = client
+        output_dir, media_root = temp_dirs
+
+        from doughub2.api import extractions as extractions_module
+
+        real_persist = extractions_module._persist_extraction
+
+        def flaky_persist(data, *args, **kwargs):
+            if data["url"].endswith("/bad"):
+                raise RuntimeError("constraint failed")
+            return real_persist(data, *args, **kwargs)
+
+        body = self._ndjson(
+            {"url": "https://example.com/questions/good1", "siteName": "Flaky"},
+            {"url": "https://example.com/questions/bad", "siteName": "Flaky"},
+            {"url": "https://example.com/questions/good2", "siteName": "Flaky"},
+        )
+
+        with (
+            patch("doughub2.api.extractions.settings") as mock_settings,
+            patch(
+                "doughub2.api.extractions._persist_extraction",
+                side_effect=flaky_persist,
+            ),
+        ):
+            mock_settings.EXTRACTION_DIR = output_dir
+            mock_settings.MEDIA_ROOT = str(media_root)
+            mock_settings.BATCH_GROUP_SIZE = 50
+            mock_settings.BATCH_MAX_RECORD_BYTES = 1024 * 1024
+
+            response = test_client.post("/extract/batch", content=body)
+
+        data = response.json()
+        assert [r["status"] for r in data["results"]] == ["success", "error", "success"]
+        assert "constraint failed" in data["results"][1]["error"]
+        keys = {q.source_question_key for q in test_session.query(Question).all()}
+        assert keys == {"good1", "good2"}
+
+    def test_batch_rejects_oversized_record(self, client, temp_dirs):
+        """Test that a record larger than the limit is rejected with 413."""
+        test_client, _ = client
+
+        with patch("doughub2.api.extractions.settings") as mock_settings:
+            mock_settings.BATCH_GROUP_SIZE = 50
+            mock_settings.BATCH_MAX_RECORD_BYTES = 100
+
+            response = test_client.post("/extract/batch", content=b"x" * 1000)
+
+        assert response.status_code == 413
+
+    def test_batch_rejects_oversized_record_within_one_chunk(self, client, temp_dirs):
+        """Test that a complete oversized line in a single chunk is rejected too."""
+        test_client, _ = client
+        body = b"\n".join([b"", b'{"url": "' + b"x" * 1000 + b'"}', b"{}"])
+
+        with patch("doughub2.api.extractions.settings") as mock_settings:
+            mock_settings.BATCH_GROUP_SIZE = 50
+            mock_settings.BATCH_MAX_RECORD_BYTES = 100
+
+            response = test_client.post("/extract/batch", content=body)
+
+        assert response.status_code == 413
+        assert response.json()["detail"] == "Record on line 2 is too large"
+
+
+class TestExtractionConcurrency:
+    """Tests that extraction work does not block other requests."""
+
+    def test_reads_stay_responsive_during_slow_ingest(self, client, temp_dirs):
+        """Read endpoints should answer while extractions are still persisting."""
+        output_dir, media_root = temp_dirs
+        release = threading.Event()
+
+        def slow_persist(*args, **kwargs):
+            # Simulates a long blocking SQLAlchemy commit
+            release.wait(timeout=10)
+            return True, None
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://testserver"
+            ) as async_client:
+                ingests = [
+                    asyncio.create_task(
+                        async_client.post(
+                            "/extract",
+                            params={"wait": True},
+                            json={
+                                "url": f"https://example.com/questions/big{i}",
+                                "siteName": "Concurrency_Test",
+                                "pageHTML": "<p>large</p>" * 50_000,
+                            },
+                        )
+                    )
+                    for i in range(3)
+                ]
+                await asyncio.sleep(0.2)
+
+                started = time.perf_counter()
+                read_response = await async_client.get("/questions")
+                read_elapsed = time.perf_counter() - started
+                ingests_pending = not any(task.done() for task in ingests)
+
+                release.set()
+                ingest_responses = await asyncio.gather(*ingests)
+            return read_response, read_elapsed, ingests_pending, ingest_responses
+
+        with (
+            patch("doughub2.api.extractions.settings") as mock_settings,
+            patch(
+                "doughub2.api.extractions.persist_to_database",
+                side_effect=slow_persist,
+            ),
+        ):
+            mock_settings.EXTRACTION_DIR = output_dir
+            mock_settings.MEDIA_ROOT = str(media_root)
+
+            read_response, read_elapsed, ingests_pending, ingest_responses = (
+                asyncio.run(scenario())
+            )
+
+        assert read_response.status_code == 200
+        assert ingests_pending, "Extractions finished before the read was served"
+        assert read_elapsed < 1.0
+        assert all(r.status_code == 200 for r in ingest_responses)
+
+
 class TestExtractionsListEndpoint:
     """Tests for the extractions list endpoint."""
 
@@ -292,6 +846,40 @@ class TestExtractionsListEndpoint:
         assert data["total"] == 0
         assert data["extractions"] == []
 
+    def test_get_extraction_loads_payload_from_files(self, client, temp_dirs):
+        """Test that a stored extraction is listed and reloaded from disk."""
+        test_client, _ = client
+        output_dir, media_root = temp_dirs
+        from doughub2.api.extractions import extractions
+
+        extractions.clear()
+
+        with patch("doughub2.api.extractions.settings") as mock_settings:
+            mock_settings.EXTRACTION_DIR = output_dir
+            mock_settings.MEDIA_ROOT = str(media_root)
+
+            test_client.post(
+                "/extract",
+                json={
+                    "url": "https://example.com/questions/history1",
+                    "siteName": "History_Test",
+                    "pageHTML": "<html><body>Stored page</body></html>",
+                    "bodyText": "Stored page",
+                },
+                params={"wait": True},
+            )
+
+        listing = test_client.get("/extractions").json()
+        assert listing["total"] == 1
+        assert listing["extractions"][0]["siteName"] == "History_Test"
+
+        response = test_client.get("/extractions/0")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["url"] == "https://example.com/questions/history1"
+        assert data["bodyText"] == "Stored page"
+        assert data["pageHTML"] == "<html><body>Stored page</body></html>"
+
 
 class TestClearExtractionsEndpoint:
     """Tests for the clear extractions endpoint."""
@@ -307,7 +895,9 @@ class TestClearExtractionsEndpoint:
             mock_settings.MEDIA_ROOT = str(media_root)
             mock_settings.DATABASE_URL = "sqlite:///:memory:"
 
-            test_client.post("/extract", json={"url": "https://test.com/page"})
+            test_client.post(
+                "/extract", json={"url": "https://test.com/page"}, params={"wait": True}
+            )
 
         # Now clear
         response = test_client.post("/clear")
@@ -355,12 +945,16 @@ class TestDatabasePersistence:
             }
 
             # First extraction
-            response1 = test_client.post("/extract", json=payload)
+            response1 = test_client.post(
+                "/extract", json=payload, params={"wait": True}
+            )
             assert response1.status_code == 200
 
             # Same URL, different content
             payload["pageHTML"] = "<html>Updated content</html>"
-            response2 = test_client.post("/extract", json=payload)
+            response2 = test_client.post(
+                "/extract", json=payload, params={"wait": True}
+            )
             assert response2.status_code == 200
 
             # Should still only have one question
@@ -386,7 +980,9 @@ class TestDatabasePersistence:
                 "bodyText": "This is the exact same question content.",
                 "pageHTML": "<html>Content 1</html>",
             }
-            response1 = test_client.post("/extract", json=payload1)
+            response1 = test_client.post(
+                "/extract", json=payload1, params={"wait": True}
+            )
             assert response1.status_code == 200
             assert test_session.query(Question).count() == 1
 
@@ -397,7 +993,9 @@ class TestDatabasePersistence:
                 "bodyText": "This is the exact same question content.",
                 "pageHTML": "<html>Content 2</html>",
             }
-            response2 = test_client.post("/extract", json=payload2)
+            response2 = test_client.post(
+                "/extract", json=payload2, params={"wait": True}
+            )
             assert response2.status_code == 200
 
             # Verify that no new question was created
@@ -475,6 +1073,364 @@ class TestListQuestionsEndpoint:
         assert "questions" in data
         assert len(data["questions"]) == 0
 
+    def _seed(self, session, count, sources=("Source_A", "Source_B")):
+        """Add count questions spread over the given sources."""
+        created_at = datetime(2025, 1, 1, 12, 0, 0)
+        source_rows = [Source(name=name) for name in sources]
+        session.add_all(source_rows)
+        session.flush()
+        for i in range(count):
+            session.add(
+                Question(
+                    source_id=source_rows[i % len(source_rows)].source_id,
+                    source_question_key=f"page-q{i:03d}",
+                    raw_html="<html></html>",
+                    raw_metadata_json="{}",
+                    # Every other pair shares a timestamp to exercise tie-breaking
+                    created_at=created_at + timedelta(minutes=i // 2),
+                    updated_at=created_at,
+                )
+            )
+        session.commit()
+
+    def _collect(self, test_client, **params):
+        """Follow next_cursor through every page and return the pages."""
+        pages = []
+        cursor = None
+        while True:
+            query = dict(params, **({"cursor": cursor} if cursor else {}))
+            response = test_client.get("/questions", params=query)
+            assert response.status_code == 200
+            data = response.json()
+            pages.append(data)
+            assert len(pages) <= 50, "pagination does not terminate"
+            cursor = data["next_cursor"]
+            if cursor is None:
+                return pages
+
+    def test_keyset_pages_cover_all_questions_once(self, client):
+        """Test that paging by id returns every question exactly once."""
+        test_client, test_session = client
+        self._seed(test_session, 7)
+
+        pages = self._collect(test_client, limit=3)
+
+        ids = [q["question_id"] for page in pages for q in page["questions"]]
+        assert [len(page["questions"]) for page in pages] == [3, 3, 1]
+        assert ids == sorted(ids) and len(set(ids)) == 7
+        # The total is only computed for the first page
+        assert pages[0]["total"] == 7
+        assert all(page["total"] is None for page in pages[1:])
+
+    @pytest.mark.parametrize(
+        "sort,order",
+        [("created_at", "desc"), ("updated_at", "asc"), ("source", "desc")],
+    )
+    def test_keyset_pages_follow_sort(self, client, sort, order):
+        """Test that paging with ties in the sort key neither skips nor repeats."""
+        test_client, test_session = client
+        self._seed(test_session, 9)
+        questions = test_session.query(Question).all()
+        key = {
+            "created_at": lambda q: (q.created_at, q.question_id),
+            "updated_at": lambda q: (q.updated_at, q.question_id),
+            "source": lambda q: (q.source.name, q.question_id),
+        }[sort]
+        expected = [
+            q.question_id for q in sorted(questions, key=key, reverse=order == "desc")
+        ]
+
+        pages = self._collect(test_client, limit=2, sort=sort, order=order)
+
+        ids = [q["question_id"] for page in pages for q in page["questions"]]
+        assert ids == expected
+
+    @pytest.mark.parametrize("sort", ["created_at", "updated_at"])
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    def test_keyset_pages_through_server_timestamps(self, client, sort, order):
+        """Test paging over rows sharing one server-written timestamp."""
+        test_client, test_session = client
+        repo = QuestionRepository(test_session)
+        source = repo.get_or_create_source("Source_A")
+        for i in range(6):
+            repo.add_question(
+                {
+                    "source_id": source.source_id,
+                    "source_question_key": f"q{i}",
+                    "raw_html": "<html></html>",
+                    "raw_metadata_json": "{}",
+                }
+            )
+        # One statement evaluates CURRENT_TIMESTAMP once for every row
+        test_session.execute(
+            text(
+                "UPDATE questions "
+                "SET created_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP"
+            )
+        )
+        test_session.commit()
+
+        pages = self._collect(test_client, limit=2, sort=sort, order=order)
+
+        ids = [q["question_id"] for page in pages for q in page["questions"]]
+        assert ids == sorted(range(1, 7), reverse=order == "desc")
+
+    def test_list_uses_constant_statements_without_content(self, client, async_engine):
+        """Test that listing runs a fixed number of statements for any page size."""
+        test_client, test_session = client
+        self._seed(test_session, 12, sources=("Source_A", "Source_B", "Source_C"))
+        engine = async_engine.sync_engine
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            counts = []
+            for limit in (2, 12):
+                statements.clear()
+                response = test_client.get("/questions", params={"limit": limit})
+                assert response.status_code == 200
+                assert len(response.json()["questions"]) == limit
+                counts.append(len(statements))
+                # Neither the page query nor the version count touch content
+                assert not any("raw_html" in sql for sql in statements)
+                assert not any("raw_metadata_json" in sql for sql in statements)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        # One page query plus one version/count query, whatever the size
+        assert counts == [2, 2]
+
+    def test_rejects_invalid_cursor(self, client):
+        """Test that a malformed cursor is a client error."""
+        test_client, _ = client
+
+        response = test_client.get("/questions", params={"cursor": "not-a-cursor"})
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+
+    def test_rejects_cursor_from_another_sort(self, client):
+        """Test that a cursor cannot be reused with a different sort."""
+        test_client, test_session = client
+        self._seed(test_session, 3)
+        cursor = test_client.get("/questions", params={"limit": 1}).json()[
+            "next_cursor"
+        ]
+
+        response = test_client.get(
+            "/questions", params={"limit": 1, "cursor": cursor, "sort": "source"}
+        )
+
+        assert response.status_code == 400
+
+    def test_filters_by_hostname_and_category(self, client):
+        """Test that listings filter on the promoted metadata columns."""
+        test_client, test_session = client
+        self._seed(test_session, 6)
+        for question in test_session.query(Question):
+            question.hostname = "a.com" if question.question_id % 2 else "b.com"
+            question.category = "Renal" if question.question_id > 4 else None
+        test_session.commit()
+
+        pages = self._collect(test_client, limit=2, hostname="a.com")
+        ids = [q["question_id"] for page in pages for q in page["questions"]]
+        assert ids == [1, 3, 5]
+        assert pages[0]["total"] == 3
+
+        data = test_client.get(
+            "/questions", params={"hostname": "a.com", "category": "Renal"}
+        ).json()
+        assert [q["question_id"] for q in data["questions"]] == [5]
+        assert data["total"] == 1
+
+
+class TestSearchQuestionsEndpoint:
+    """Tests for the GET /questions/search endpoint."""
+
+    def _seed(self, session):
+        """Store indexed questions through the repository."""
+        repo = QuestionRepository(session)
+        mksap = repo.get_or_create_source("MKSAP_19")
+        uworld = repo.get_or_create_source("UWorld")
+        rows = [
+            (mksap, "m1", "Chest pain with elevated troponin", "<p>Acute MI</p>"),
+            (mksap, "m2", "Fever and cough", "<p>Community pneumonia</p>"),
+            (uworld, "u1", "Crushing chest pain", "<p>Aortic dissection</p>"),
+            (uworld, "u2", "Chest pain chest pain chest", "<p>Pericarditis</p>"),
+        ]
+        ids = {}
+        for source, key, body, page in rows:
+            question = repo.add_question(
+                {
+                    "source_id": source.source_id,
+                    "source_question_key": key,
+                    "raw_html": f"<html><body>{page}</body></html>",
+                    "raw_metadata_json": json.dumps({"bodyText": body}),
+                }
+            )
+            ids[key] = question.question_id
+        repo.commit()
+        repo.update_question_from_metadata(
+            {"question_id": ids["m2"], "tags": ["pulm"], "state": "suspended"}
+        )
+        repo.commit()
+        return ids
+
+    def test_ranked_results_with_snippets(self, client):
+        """Test that text matches are ranked and highlighted."""
+        test_client, test_session = client
+        ids = self._seed(test_session)
+
+        response = test_client.get("/questions/search", params={"q": "chest"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        keys = [r["source_question_key"] for r in data["results"]]
+        assert set(keys) == {"m1", "u1", "u2"}
+        # The question repeating the term ranks first
+        assert data["results"][0]["question_id"] == ids["u2"]
+        assert "<mark>Chest</mark>" in data["results"][0]["snippet"]
+        scores = [r["score"] for r in data["results"]]
+        assert scores == sorted(scores)
+
+    @pytest.mark.parametrize(
+        "q,expected",
+        [
+            ("deck:mksap chest", {"m1"}),
+            ("back:aortic", {"u1"}),
+            ("front:troponin", {"m1"}),
+            ("back:troponin", set()),
+            ("tag:pulm", {"m2"}),
+            ("tag:PUL fever", {"m2"}),
+            ("tag:pulm chest", set()),
+            ("is:suspended", {"m2"}),
+            ("is:new deck:mksap", {"m1"}),
+            ("deck:mksap deck:uworld chest", {"m1", "u1", "u2"}),
+            ("deck:mksap deck:nope", {"m1", "m2"}),
+            ("is:due deck:mksap", {"m1", "m2"}),
+            ("is:due", {"m1", "m2", "u1", "u2"}),
+            ('"chest pain" deck:uworld', {"u1", "u2"}),
+            ("pneumon", {"m2"}),
+        ],
+    )
+    def test_operators(self, client, q, expected):
+        """Test that browser operators filter results like the client did."""
+        test_client, test_session = client
+        self._seed(test_session)
+
+        response = test_client.get("/questions/search", params={"q": q})
+
+        assert response.status_code == 200
+        keys = {r["source_question_key"] for r in response.json()["results"]}
+        assert keys == expected
+
+    def test_paginates_ranked_results(self, client):
+        """Test that paging through ranked results neither skips nor repeats."""
+        test_client, test_session = client
+        self._seed(test_session)
+        first = test_client.get("/questions/search", params={"q": "chest"}).json()
+
+        seen = []
+        cursor = None
+        while True:
+            params = {"q": "chest", "limit": 1}
+            if cursor:
+                params["cursor"] = cursor
+            page = test_client.get("/questions/search", params=params).json()
+            seen += [r["question_id"] for r in page["results"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == [r["question_id"] for r in first["results"]]
+
+    def test_rejects_cursor_for_other_query(self, client):
+        """Test that a cursor is tied to the query it was issued for."""
+        test_client, test_session = client
+        self._seed(test_session)
+        cursor = test_client.get(
+            "/questions/search", params={"q": "chest", "limit": 1}
+        ).json()["next_cursor"]
+
+        response = test_client.get(
+            "/questions/search", params={"q": "fever", "cursor": cursor}
+        )
+
+        assert response.status_code == 400
+
+
+class TestTagCountsEndpoint:
+    """Tests for the GET /tags endpoint and the tag list filter."""
+
+    def test_counts_tags_and_filters_listing(self, client):
+        """Test that tags are counted per question and usable as a filter."""
+        test_client, test_session = client
+        repo = QuestionRepository(test_session)
+        source = repo.get_or_create_source("MKSAP_19")
+        ids = []
+        for key, tags in (("q1", ["cardio", "HTN"]), ("q2", "htn"), ("q3", None)):
+            question = repo.add_question(
+                {
+                    "source_id": source.source_id,
+                    "source_question_key": key,
+                    "raw_html": "<html></html>",
+                    "raw_metadata_json": "{}",
+                }
+            )
+            repo.update_question_from_metadata(
+                {"question_id": question.question_id, "tags": tags}
+            )
+            ids.append(question.question_id)
+        repo.commit()
+
+        response = test_client.get("/tags")
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "tags": [{"name": "HTN", "count": 2}, {"name": "cardio", "count": 1}]
+        }
+        data = test_client.get("/questions", params={"tag": "htn"}).json()
+        assert [q["question_id"] for q in data["questions"]] == ids[:2]
+        assert data["total"] == 2
+
+
+class TestListLogsEndpoint:
+    """Tests for the GET /logs endpoint."""
+
+    def test_filters_and_paginates_logs(self, client):
+        """Test that logs are listed newest first, filtered and paged."""
+        test_client, test_session = client
+        start = datetime(2026, 1, 1)
+        for i, level in enumerate(["INFO", "WARNING", "ERROR", "DEBUG", "ERROR"]):
+            test_session.add(
+                Log(
+                    level=level,
+                    logger_name="doughub2",
+                    message=f"m{i}",
+                    timestamp=start + timedelta(minutes=i),
+                )
+            )
+        test_session.commit()
+
+        data = test_client.get("/logs", params={"level": "WARNING", "limit": 2}).json()
+        assert [log["message"] for log in data["logs"]] == ["m4", "m2"]
+        data = test_client.get(
+            "/logs", params={"level": "WARNING", "cursor": data["next_cursor"]}
+        ).json()
+        assert [log["message"] for log in data["logs"]] == ["m1"]
+        assert data["next_cursor"] is None
+
+        since = (start + timedelta(minutes=3)).isoformat()
+        data = test_client.get("/logs", params={"since": since}).json()
+        assert [log["message"] for log in data["logs"]] == ["m4", "m3"]
+
+        assert test_client.get("/logs", params={"cursor": "x"}).status_code == 400
+        assert test_client.get("/logs", params={"level": "LOUD"}).status_code == 422
+
 
 class TestGetQuestionEndpoint:
     """Tests for the GET /questions/{question_id} endpoint."""
@@ -522,3 +1478,595 @@ class TestGetQuestionEndpoint:
         data = response.json()
         assert "detail" in data
         assert data["detail"] == "Question not found"
+
+
+class TestConditionalQuestionRequests:
+    """Tests for ETag / Last-Modified handling on the question endpoints."""
+
+    def _add_question(self, session, key="cond-q001"):
+        source = session.query(Source).filter_by(name="Cond_Source").first()
+        if source is None:
+            source = Source(name="Cond_Source")
+            session.add(source)
+            session.flush()
+        question = Question(
+            source_id=source.source_id,
+            source_question_key=key,
+            raw_html="<html><body><p>Conditional</p></body></html>",
+            raw_metadata_json="{}",
+            updated_at=datetime(2024, 5, 1, 12, 0, 0),
+        )
+        session.add(question)
+        session.commit()
+        return question
+
+    def test_detail_revalidates_with_if_none_match(self, client, async_engine):
+        """Test that a matching ETag gets a 304 without reading the HTML."""
+        test_client, test_session = client
+        engine = async_engine.sync_engine
+        question = self._add_question(test_session)
+        url = f"/questions/{question.question_id}"
+
+        response = test_client.get(url)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert etag.startswith('"') and etag.endswith('"')
+        assert response.headers["last-modified"] == "Wed, 01 May 2024 12:00:00 GMT"
+        assert response.headers["cache-control"] == "no-cache"
+        # Revalidate against the database rather than the cached response
+        question_detail_cache.clear()
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = test_client.get(url, headers={"If-None-Match": etag})
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert len(statements) == 1
+        assert "raw_html" not in statements[0]
+
+        # A weak or listed tag still matches; a stale one does not
+        response = test_client.get(url, headers={"If-None-Match": f'"x", W/{etag}'})
+        assert response.status_code == 304
+        response = test_client.get(url, headers={"If-None-Match": '"stale"'})
+        assert response.status_code == 200
+
+    def test_detail_etag_changes_when_question_is_updated(self, client):
+        """Test that an update invalidates the client's copy."""
+        test_client, test_session = client
+        question = self._add_question(test_session)
+        url = f"/questions/{question.question_id}"
+        etag = test_client.get(url).headers["etag"]
+
+        # Written behind QuestionRepository's back, so drop the cached copy
+        question.updated_at = datetime(2024, 5, 2, 8, 30, 0)
+        test_session.commit()
+        question_detail_cache.clear()
+
+        response = test_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.json()["raw_html"].startswith("<html>")
+
+    def test_detail_etag_changes_within_the_same_second(self, client):
+        """Test that two writes sharing an updated_at second get new ETags."""
+        test_client, test_session = client
+        repo = QuestionRepository(test_session)
+        source = repo.get_or_create_source("Cond_Source")
+        fields = {"source_id": source.source_id, "source_question_key": "cond-q002"}
+        question = repo.add_question(
+            {**fields, "raw_html": "<p>v1</p>", "raw_metadata_json": "{}"}
+        )
+        repo.commit()
+        url = f"/questions/{question.question_id}"
+        # Both writes land in the same second
+        pin_updated_at = text(
+            "UPDATE questions SET updated_at = '2024-05-01 12:00:00' "
+            "WHERE question_id = :id"
+        )
+        test_session.execute(pin_updated_at, {"id": question.question_id})
+        test_session.commit()
+        first = test_client.get(url)
+
+        repo.add_question(
+            {**fields, "raw_html": "<p>v2 CHANGED</p>", "raw_metadata_json": "{}"}
+        )
+        repo.commit()
+        test_session.execute(pin_updated_at, {"id": question.question_id})
+        test_session.commit()
+        updated_at = "Wed, 01 May 2024 12:00:00 GMT"
+        assert first.headers["last-modified"] == updated_at
+
+        for _ in range(2):  # from the database, then from the cache
+            response = test_client.get(
+                url, headers={"If-None-Match": first.headers["etag"]}
+            )
+            assert response.status_code == 200
+            assert response.headers["etag"] != first.headers["etag"]
+            assert response.headers["last-modified"] == updated_at
+            assert response.json()["raw_html"] == "<p>v2 CHANGED</p>"
+
+    def test_detail_if_modified_since(self, client):
+        """Test that If-Modified-Since is honoured at second resolution."""
+        test_client, test_session = client
+        question = self._add_question(test_session)
+        url = f"/questions/{question.question_id}"
+
+        response = test_client.get(
+            url, headers={"If-Modified-Since": "Wed, 01 May 2024 12:00:00 GMT"}
+        )
+        assert response.status_code == 304
+
+        response = test_client.get(
+            url, headers={"If-Modified-Since": "Wed, 01 May 2024 11:59:59 GMT"}
+        )
+        assert response.status_code == 200
+
+        response = test_client.get(url, headers={"If-Modified-Since": "garbage"})
+        assert response.status_code == 200
+
+    def test_missing_question_is_404_even_with_conditions(self, client):
+        """Test that conditional headers do not hide a missing question."""
+        test_client, _ = client
+
+        response = test_client.get("/questions/99999", headers={"If-None-Match": "*"})
+
+        assert response.status_code == 404
+
+    def test_list_etag_tracks_the_collection(self, client):
+        """Test that the listing revalidates until questions are added."""
+        test_client, test_session = client
+        self._add_question(test_session, "cond-q001")
+
+        response = test_client.get("/questions")
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+
+        response = test_client.get("/questions", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+        self._add_question(test_session, "cond-q002")
+
+        response = test_client.get("/questions", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.json()["total"] == 2
+
+    def test_list_etag_tracks_writes_that_keep_updated_at(self, client):
+        """Test that backfills and tag changes invalidate the listing."""
+        test_client, test_session = client
+        question_id = self._add_question(test_session, "cond-q001").question_id
+        etags = [test_client.get("/questions").headers["etag"]]
+
+        # Like backfill-metadata: a column changes, updated_at does not
+        test_session.execute(
+            update(Question)
+            .where(Question.question_id == question_id)
+            .values(category="Renal", updated_at=Question.updated_at)
+        )
+        test_session.commit()
+        etags.append(test_client.get("/questions").headers["etag"])
+
+        repo = QuestionRepository(test_session)
+        repo.update_question_from_metadata(
+            {"question_id": question_id, "tags": ["cardio"]}
+        )
+        repo.commit()
+        etags.append(test_client.get("/questions").headers["etag"])
+
+        assert len(set(etags)) == 3
+        response = test_client.get(
+            "/questions", params={"tag": "cardio"}, headers={"If-None-Match": etags[1]}
+        )
+        assert response.status_code == 200
+        assert response.json()["total"] == 1
+
+
+class TestQuestionDetailCache:
+    """Tests for the question detail response cache."""
+
+    def _add_question(self, session):
+        repo = QuestionRepository(session)
+        source = repo.get_or_create_source("Cache_Source")
+        question = repo.add_question(
+            {
+                "source_id": source.source_id,
+                "source_question_key": "cache-q001",
+                "raw_html": "<p>Original</p>",
+                "raw_metadata_json": '{"bodyText": "Original"}',
+            }
+        )
+        repo.commit()
+        return question
+
+    def _count_statements(self, engine, func):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            result = func()
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        return result, statements
+
+    def test_repeat_request_is_served_from_cache(self, client, async_engine):
+        """Test that a cached question is sent without querying the database."""
+        test_client, test_session = client
+        engine = async_engine.sync_engine
+        question = self._add_question(test_session)
+        url = f"/questions/{question.question_id}"
+        first = test_client.get(url)
+
+        second, statements = self._count_statements(
+            engine, lambda: test_client.get(url)
+        )
+
+        assert statements == []
+        assert second.status_code == 200
+        assert second.content == first.content
+        assert second.headers["etag"] == first.headers["etag"]
+        assert second.headers["last-modified"] == first.headers["last-modified"]
+
+        response = test_client.get(
+            url, headers={"If-None-Match": first.headers["etag"]}
+        )
+        assert response.status_code == 304
+
+    def test_repository_writes_invalidate(self, client):
+        """Test that question and metadata updates replace the cached copy."""
+        test_client, test_session = client
+        question = self._add_question(test_session)
+        url = f"/questions/{question.question_id}"
+        test_client.get(url)
+
+        repo = QuestionRepository(test_session)
+        repo.add_question(
+            {
+                "source_id": question.source_id,
+                "source_question_key": "cache-q001",
+                "raw_html": "<p>Revised</p>",
+                "raw_metadata_json": '{"bodyText": "Revised"}',
+            }
+        )
+        repo.commit()
+        assert test_client.get(url).json()["raw_html"] == "<p>Revised</p>"
+
+        assert question.question_id in question_detail_cache._entries
+        repo.update_question_from_metadata(
+            {"question_id": question.question_id, "state": "reviewed"}
+        )
+        repo.commit()
+        assert question.question_id not in question_detail_cache._entries
+
+    def test_note_creation_invalidates(self, client, tmp_path, monkeypatch):
+        """Test that creating a question's note drops its cached copy."""
+        test_client, test_session = client
+        monkeypatch.setattr("doughub2.config.NOTES_DIR", str(tmp_path))
+        question = self._add_question(test_session)
+        test_client.get(f"/questions/{question.question_id}")
+
+        QuestionRepository(test_session).ensure_note_for_question(question.question_id)
+
+        assert question.question_id not in question_detail_cache._entries
+
+    def test_disabled_with_zero_budget(self, client, monkeypatch):
+        """Test that QUESTION_CACHE_BYTES=0 turns the cache off."""
+        test_client, test_session = client
+        monkeypatch.setattr("doughub2.config.settings.QUESTION_CACHE_BYTES", 0)
+        question = self._add_question(test_session)
+
+        test_client.get(f"/questions/{question.question_id}")
+
+        assert len(question_detail_cache) == 0
+
+    def test_stats_endpoint(self, client):
+        """Test that hits and misses are reported."""
+        test_client, test_session = client
+        question = self._add_question(test_session)
+        url = f"/questions/{question.question_id}"
+        for _ in range(3):
+            test_client.get(url)
+
+        response = test_client.get("/cache/stats")
+
+        assert response.status_code == 200
+        stats = response.json()
+        assert stats["entries"] == 1
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == pytest.approx(2 / 3)
+        assert 0 < stats["bytes"] <= stats["max_bytes"]
+
+
+class TestQuestionBatchEndpoint:
+    """Tests for the GET /questions/batch endpoint."""
+
+    def _seed(self, session, count):
+        """Store count questions and return their IDs."""
+        repo = QuestionRepository(session)
+        source = repo.get_or_create_source("Batch_Source")
+        ids = []
+        for i in range(count):
+            question = repo.add_question(
+                {
+                    "source_id": source.source_id,
+                    "source_question_key": f"batch-{i}",
+                    "raw_html": f"<html><body>Question {i}</body></html>",
+                    "raw_metadata_json": json.dumps({"bodyText": f"Question {i}"}),
+                }
+            )
+            ids.append(question.question_id)
+        repo.commit()
+        return ids
+
+    def test_returns_questions_in_requested_order(self, client):
+        """Test that details come back in request order with missing IDs."""
+        test_client, test_session = client
+        ids = self._seed(test_session, 3)
+        requested = [ids[2], 99999, ids[0], ids[2]]
+
+        response = test_client.get(
+            "/questions/batch", params={"ids": ",".join(map(str, requested))}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [q["question_id"] for q in data["questions"]] == [ids[2], ids[0]]
+        assert data["questions"][0]["source_name"] == "Batch_Source"
+        assert data["questions"][0]["raw_html"] == (
+            "<html><body>Question 2</body></html>"
+        )
+        assert data["missing"] == [99999]
+
+    def test_etags_revalidate_with_the_detail_endpoint(self, client):
+        """Test that each question's ETag is the one its detail sends."""
+        test_client, test_session = client
+        ids = self._seed(test_session, 2)
+
+        etags = test_client.get(
+            "/questions/batch", params={"ids": ",".join(map(str, ids))}
+        ).json()["etags"]
+
+        assert set(etags) == {str(question_id) for question_id in ids}
+        url = f"/questions/{ids[0]}"
+        assert test_client.get(url).headers["etag"] == etags[str(ids[0])]
+        response = test_client.get(url, headers={"If-None-Match": etags[str(ids[0])]})
+        assert response.status_code == 304
+
+    def test_loads_all_questions_in_two_queries(self, client, async_engine):
+        """Test that the batch does not issue a query per question."""
+        test_client, test_session = client
+        engine = async_engine.sync_engine
+        ids = self._seed(test_session, 10)
+        test_session.expire_all()
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = test_client.get(
+                "/questions/batch", params={"ids": ",".join(map(str, ids))}
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert response.status_code == 200
+        assert len(response.json()["questions"]) == 10
+        # Questions with their sources, then the media of all of them
+        assert len(statements) == 2
+
+    def test_rejects_non_integer_ids(self, client):
+        """Test that non-integer IDs are a client error."""
+        test_client, _ = client
+
+        response = test_client.get("/questions/batch", params={"ids": "1,two"})
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid question ID"
+
+    def test_rejects_too_many_ids(self, client):
+        """Test that the number of distinct IDs per request is capped."""
+        test_client, _ = client
+        ids = ",".join(str(i) for i in range(1, 102))
+
+        response = test_client.get("/questions/batch", params={"ids": ids})
+
+        assert response.status_code == 400
+        assert "At most 100" in response.json()["detail"]
+
+        # Repeated IDs count once
+        response = test_client.get("/questions/batch", params={"ids": "1," * 150})
+        assert response.status_code == 200
+
+
+class TestExportQuestionsEndpoint:
+    """Tests for the GET /questions/export endpoint."""
+
+    def _seed(self, session):
+        repo = QuestionRepository(session)
+        for source_name in ("Export_A", "Export_B"):
+            source = repo.get_or_create_source(source_name)
+            repo.add_question(
+                {
+                    "source_id": source.source_id,
+                    "source_question_key": f"{source_name}-q1",
+                    "raw_html": f"<html><body>{source_name}</body></html>",
+                    "raw_metadata_json": "{}",
+                }
+            )
+        repo.commit()
+
+    def test_streams_ndjson(self, client):
+        """Test that every question is exported as one JSON line."""
+        test_client, test_session = client
+        self._seed(test_session)
+
+        response = test_client.get("/questions/export")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert "questions.ndjson" in response.headers["content-disposition"]
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert [r["source_name"] for r in records] == ["Export_A", "Export_B"]
+        assert records[0]["raw_html"] == "<html><body>Export_A</body></html>"
+
+    def test_gzip_and_source_filter(self, client):
+        """Test that the export can be gzipped and limited to one source."""
+        test_client, test_session = client
+        self._seed(test_session)
+
+        response = test_client.get(
+            "/questions/export", params={"gzip": True, "source": "Export_B"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/gzip"
+        assert "questions.ndjson.gz" in response.headers["content-disposition"]
+        lines = gzip.decompress(response.content).splitlines()
+        assert [json.loads(line)["source_name"] for line in lines] == ["Export_B"]
+
+
+class TestMediaEndpoint:
+    """Tests for the GET /media/{media_id} endpoint."""
+
+    CONTENT = bytes(range(256)) * 4
+
+    @pytest.fixture
+    def media_root(self, tmp_path, monkeypatch):
+        """Point MEDIA_ROOT at a temporary directory."""
+        monkeypatch.setattr(media_api.settings, "MEDIA_ROOT", str(tmp_path))
+        return tmp_path
+
+    def _add_media(self, session, media_root, relative_path, sha256=None):
+        """Store a question with one media file and return (question, media)."""
+        path = media_root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(self.CONTENT)
+        repo = QuestionRepository(session)
+        source = repo.get_or_create_source("Media_Source")
+        question = repo.add_question(
+            {
+                "source_id": source.source_id,
+                "source_question_key": "media-q1",
+                "raw_html": "<html><img src='x.png'></html>",
+                "raw_metadata_json": "{}",
+            }
+        )
+        media = repo.add_media_to_question(
+            question.question_id,
+            {
+                "media_role": "image",
+                "mime_type": "image/png",
+                "relative_path": relative_path,
+                "sha256": sha256,
+            },
+        )
+        repo.commit()
+        return question, media
+
+    def test_serves_content_addressed_file_as_immutable(self, client, media_root):
+        """Test that hashed blobs are cached forever and revalidate by hash."""
+        test_client, test_session = client
+        sha = "ab" * 32
+        _, media = self._add_media(
+            test_session, media_root, f"blobs/ab/{sha}", sha256=sha
+        )
+
+        response = test_client.get(f"/media/{media.media_id}")
+
+        assert response.status_code == 200
+        assert response.content == self.CONTENT
+        assert response.headers["content-type"] == "image/png"
+        assert response.headers["etag"] == f'"{sha}"'
+        assert response.headers["accept-ranges"] == "bytes"
+        assert "immutable" in response.headers["cache-control"]
+
+        response = test_client.get(
+            f"/media/{media.media_id}", headers={"If-None-Match": f'"{sha}"'}
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_supports_range_requests(self, client, media_root):
+        """Test that a byte range is answered with 206 Partial Content."""
+        test_client, test_session = client
+        _, media = self._add_media(test_session, media_root, "legacy/img.png")
+
+        response = test_client.get(
+            f"/media/{media.media_id}", headers={"Range": "bytes=10-19"}
+        )
+
+        assert response.status_code == 206
+        assert response.content == self.CONTENT[10:20]
+        assert response.headers["content-range"] == f"bytes 10-19/{len(self.CONTENT)}"
+
+    def test_unhashed_file_must_revalidate(self, client, media_root):
+        """Test that files without a hash get validators instead of immutable."""
+        test_client, test_session = client
+        _, media = self._add_media(test_session, media_root, "legacy/img.png")
+
+        response = test_client.get(f"/media/{media.media_id}")
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == "no-cache"
+        assert "last-modified" in response.headers
+
+        response = test_client.get(
+            f"/media/{media.media_id}",
+            headers={"If-None-Match": response.headers["etag"]},
+        )
+        assert response.status_code == 304
+
+    def test_missing_media_and_files_are_404(self, client, media_root):
+        """Test unknown IDs, deleted files and paths outside MEDIA_ROOT."""
+        test_client, test_session = client
+        _, media = self._add_media(test_session, media_root, "legacy/img.png")
+        (media_root / "legacy/img.png").unlink()
+        repo = QuestionRepository(test_session)
+        escaping = repo.add_media_to_question(
+            media.question_id,
+            {
+                "media_role": "image",
+                "mime_type": "text/plain",
+                "relative_path": "../../etc/passwd",
+            },
+        )
+        repo.commit()
+
+        assert test_client.get("/media/99999").status_code == 404
+        assert test_client.get(f"/media/{media.media_id}").status_code == 404
+        assert test_client.get(f"/media/{escaping.media_id}").status_code == 404
+
+    def test_question_detail_lists_media(self, client, media_root):
+        """Test that the detail response lists the question's media."""
+        test_client, test_session = client
+        sha = "cd" * 32
+        question, media = self._add_media(
+            test_session, media_root, f"blobs/cd/{sha}", sha256=sha
+        )
+
+        response = test_client.get(f"/questions/{question.question_id}")
+
+        assert response.status_code == 200
+        assert response.json()["media"] == [
+            {
+                "media_id": media.media_id,
+                "media_role": "image",
+                "media_type": None,
+                "mime_type": "image/png",
+                "sha256": sha,
+            }
+        ]
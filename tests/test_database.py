@@ -0,0 +1,111 @@
+"""
+Tests for the SQLite engine profile and background maintenance.
+"""
+
+import time
+
+import pytest
+from sqlalchemy import text
+
+from doughub2 import database
+from doughub2.database import create_db_engine, sqlite_pragmas
+from doughub2.maintenance import MaintenanceTask, run_maintenance
+from doughub2.models import Base
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """A file-backed engine with the production profile."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'test.db'}", "production")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def pragma(conn, name):
+    return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+class TestSQLiteProfile:
+    """Tests for sqlite_pragmas and create_db_engine."""
+
+    def test_production_profile_is_applied_to_connections(self, engine):
+        """Every connection should use WAL and the tuned pragmas."""
+        with engine.connect() as conn:
+            assert pragma(conn, "journal_mode") == "wal"
+            assert pragma(conn, "synchronous") == 1  # NORMAL
+            assert pragma(conn, "foreign_keys") == 1
+            assert pragma(conn, "busy_timeout") == 5000
+            assert pragma(conn, "cache_size") == -64 * 1024
+
+    def test_default_profile_leaves_sqlite_defaults(self, tmp_path):
+        """The default profile should not change any pragma."""
+        engine = create_db_engine(f"sqlite:///{tmp_path / 'plain.db'}", "default")
+        with engine.connect() as conn:
+            assert pragma(conn, "journal_mode") == "delete"
+            assert pragma(conn, "foreign_keys") == 0
+        engine.dispose()
+
+    def test_settings_override_profile(self, monkeypatch):
+        """SQLITE_* settings should take precedence over the profile."""
+        monkeypatch.setattr(database.settings, "SQLITE_SYNCHRONOUS", "FULL")
+        monkeypatch.setattr(database.settings, "SQLITE_BUSY_TIMEOUT_MS", 250)
+
+        pragmas = sqlite_pragmas("production")
+
+        assert pragmas["synchronous"] == "FULL"
+        assert pragmas["busy_timeout"] == 250
+        assert pragmas["journal_mode"] == "WAL"
+
+    def test_unknown_profile(self):
+        """An unknown profile should be rejected."""
+        with pytest.raises(ValueError, match="Unknown SQLite profile"):
+            sqlite_pragmas("turbo")
+
+    def test_readers_do_not_wait_for_a_writer(self, engine):
+        """In WAL mode a read should succeed while a write is uncommitted."""
+        with engine.connect() as writer:
+            writer.execute(text("INSERT INTO sources (name) VALUES ('Pending')"))
+            with engine.connect() as reader:
+                count = reader.execute(text("SELECT count(*) FROM sources")).scalar()
+            writer.commit()
+
+        assert count == 0
+
+
+class TestMaintenance:
+    """Tests for run_maintenance and MaintenanceTask."""
+
+    def test_run_maintenance_checkpoints_and_analyzes(self, engine):
+        """The first run should ANALYZE; later runs only optimize."""
+        with engine.begin() as conn:
+            for i in range(50):
+                conn.execute(
+                    text("INSERT INTO sources (name) VALUES (:name)"),
+                    {"name": f"S{i}"},
+                )
+
+        first = run_maintenance(engine)
+        second = run_maintenance(engine)
+
+        assert not first.checkpoint_busy
+        assert first.wal_pages > 0
+        assert first.checkpointed_pages == first.wal_pages
+        assert first.analyzed
+        assert not second.analyzed
+        # Only the statistics written by the first run were left in the WAL
+        assert second.wal_pages < first.wal_pages
+
+    def test_task_runs_until_stopped(self, engine):
+        """The task should run at its interval until stopped."""
+        task = MaintenanceTask(engine, interval=0.01)
+        task.start()
+        deadline = time.monotonic() + 5
+        while task.runs < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        task.stop()
+        runs = task.runs
+
+        assert runs >= 2
+        time.sleep(0.05)
+        assert task.runs == runs
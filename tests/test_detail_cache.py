@@ -0,0 +1,105 @@
+"""
+Tests for the byte-budget response cache.
+"""
+
+from datetime import datetime
+
+from doughub2.detail_cache import ENTRY_OVERHEAD_BYTES, CachedResponse, ResponseCache
+
+
+def entry(size: int, etag: str = '"v1"') -> CachedResponse:
+    """A cached response whose size counts size bytes against the budget."""
+    return CachedResponse(b"x" * (size - ENTRY_OVERHEAD_BYTES), etag)
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    def test_get_and_put(self):
+        """Stored entries should be returned with their validators."""
+        cache = ResponseCache(max_bytes=10_000)
+        stored = CachedResponse(b"{}", '"v1"', datetime(2024, 5, 1))
+
+        assert cache.get(1) is None
+        assert cache.put(1, stored, cache.generation)
+        assert cache.get(1) == stored
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        """Entries should be evicted oldest-use first once over budget."""
+        cache = ResponseCache(max_bytes=3000)
+        for key in (1, 2, 3):
+            cache.put(key, entry(1000), cache.generation)
+        cache.get(1)  # 2 is now the least recently used
+
+        cache.put(4, entry(1000), cache.generation)
+
+        assert cache.get(2) is None
+        assert all(cache.get(key) is not None for key in (1, 3, 4))
+        assert cache.stats()["bytes"] == 3000
+        assert cache.stats()["evictions"] == 1
+
+    def test_one_large_entry_evicts_several(self):
+        """A large entry should push out as many small ones as needed."""
+        cache = ResponseCache(max_bytes=3000)
+        for key in (1, 2, 3):
+            cache.put(key, entry(1000), cache.generation)
+
+        cache.put(4, entry(2500), cache.generation)
+
+        assert len(cache) == 1
+        assert cache.stats()["evictions"] == 3
+
+    def test_rejects_entries_over_budget(self):
+        """An entry larger than the whole budget should not be stored."""
+        cache = ResponseCache(max_bytes=3000)
+        cache.put(1, entry(1000), cache.generation)
+
+        assert not cache.put(2, entry(3001), cache.generation)
+        assert cache.get(1) is not None
+
+    def test_replacing_an_entry_updates_bytes(self):
+        """Putting an existing key should not count it twice."""
+        cache = ResponseCache(max_bytes=10_000)
+        cache.put(1, entry(1000), cache.generation)
+        cache.put(1, entry(2000, '"v2"'), cache.generation)
+
+        assert cache.stats()["bytes"] == 2000
+        assert cache.get(1).etag == '"v2"'
+
+    def test_invalidate(self):
+        """Invalidated entries should be dropped."""
+        cache = ResponseCache(max_bytes=10_000)
+        cache.put(1, entry(1000), cache.generation)
+
+        cache.invalidate(1)
+
+        assert cache.get(1) is None
+        assert cache.stats()["bytes"] == 0
+
+    def test_put_after_invalidation_is_ignored(self):
+        """A copy loaded before a concurrent write should not be stored."""
+        cache = ResponseCache(max_bytes=10_000)
+        generation = cache.generation
+
+        cache.invalidate(1)  # a write lands while the reader is loading
+
+        assert not cache.put(1, entry(1000), generation)
+        assert cache.get(1) is None
+
+    def test_stats(self):
+        """Stats should count hits and misses until cleared."""
+        cache = ResponseCache(max_bytes=10_000)
+        cache.put(1, entry(1000), cache.generation)
+        cache.get(1)
+        cache.get(1)
+        cache.get(2)
+
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+        assert stats["max_bytes"] == 10_000
+
+        cache.clear()
+        assert cache.stats()["hits"] == 0
+        assert len(cache) == 0
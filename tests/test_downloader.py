@@ -0,0 +1,97 @@
+"""
+Tests for the concurrent image downloader.
+
+These tests run the downloader against a local stub HTTP server.
+"""
+
+import hashlib
+
+import pytest
+
+from doughub2.downloader import ImageDownloader
+
+
+@pytest.fixture
+def downloader():
+    """Create a downloader with fast retries for testing."""
+    downloader = ImageDownloader(
+        max_workers=8, per_host_limit=2, timeout=2.0, retries=2, backoff=0.01
+    )
+    yield downloader
+    downloader.close()
+
+
+class TestImageDownloader:
+    """Tests for ImageDownloader."""
+
+    def test_download_many_preserves_order(self, downloader, image_server, tmp_path):
+        """Results should be returned in job order with files written."""
+        jobs = [
+            (
+                image_server.add(f"/img{i}.png", (200, f"image {i}".encode())),
+                tmp_path / f"{i}.png",
+            )
+            for i in range(5)
+        ]
+
+        results = downloader.download_many(jobs)
+
+        assert [r.url for r in results] == [url for url, _ in jobs]
+        for i, result in enumerate(results):
+            assert result.ok
+            assert result.path.read_bytes() == f"image {i}".encode()
+
+    def test_retries_transient_errors(self, downloader, image_server, tmp_path):
+        """A 503 followed by a 200 should succeed on the second attempt."""
+        url = image_server.add("/flaky.png", (503, b""), (200, b"ok"))
+
+        result = downloader.download(url, tmp_path / "flaky.png")
+
+        assert result.ok
+        assert result.attempts == 2
+        assert (tmp_path / "flaky.png").read_bytes() == b"ok"
+        assert result.sha256 == hashlib.sha256(b"ok").hexdigest()
+
+    def test_does_not_retry_client_errors(self, downloader, image_server, tmp_path):
+        """A 404 should fail immediately without leaving a file behind."""
+        url = image_server.url("/missing.png")
+
+        result = downloader.download(url, tmp_path / "missing.png")
+
+        assert not result.ok
+        assert result.attempts == 1
+        assert image_server.hits["/missing.png"] == 1
+        assert not (tmp_path / "missing.png").exists()
+        assert not (tmp_path / "missing.png.part").exists()
+
+    def test_gives_up_after_retries(self, downloader, image_server, tmp_path):
+        """Persistent server errors should fail after the retry budget."""
+        url = image_server.add("/down.png", (500, b""))
+
+        result = downloader.download(url, tmp_path / "down.png")
+
+        assert not result.ok
+        assert result.attempts == 3
+        assert image_server.hits["/down.png"] == 3
+
+    def test_respects_per_host_limit(self, downloader, image_server, tmp_path):
+        """No more than per_host_limit requests should hit one host at once."""
+        image_server.delay = 0.05
+        jobs = [
+            (image_server.add(f"/slow{i}.png", (200, b"x")), tmp_path / f"slow{i}.png")
+            for i in range(6)
+        ]
+
+        results = downloader.download_many(jobs)
+
+        assert all(r.ok for r in results)
+        assert image_server.max_active == 2
+
+    def test_connection_errors_are_reported(self, downloader, tmp_path):
+        """An unreachable host should produce an error result, not raise."""
+        result = downloader.download(
+            "http://127.0.0.1:9/unreachable.png", tmp_path / "unreachable.png"
+        )
+
+        assert not result.ok
+        assert result.attempts == 3
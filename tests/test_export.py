@@ -0,0 +1,105 @@
+"""
+Tests for the streaming NDJSON export.
+"""
+
+import gzip
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from doughub2.export import coalesce, export_lines, gzip_chunks
+from doughub2.models import Base, Media
+from doughub2.persistence import QuestionRepository
+
+
+@pytest.fixture
+def repo():
+    """Create a repository on an in-memory database with a few questions."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    repo = QuestionRepository(session)
+    for source_name in ("MKSAP", "UWorld"):
+        source = repo.get_or_create_source(source_name)
+        for i in range(3):
+            repo.add_question(
+                {
+                    "source_id": source.source_id,
+                    "source_question_key": f"{source_name}-{i}",
+                    "raw_html": f"<html>{source_name} {i} " + "x" * 500 + "</html>",
+                    "raw_metadata_json": json.dumps({"bodyText": f"Q{i}"}),
+                }
+            )
+    session.add(
+        Media(
+            question_id=1,
+            media_role="image",
+            mime_type="image/png",
+            relative_path="blobs/ab/abc.png",
+            sha256="abc",
+        )
+    )
+    repo.commit()
+    yield repo
+    session.close()
+    engine.dispose()
+
+
+class TestExportLines:
+    """Tests for export_lines."""
+
+    def test_one_record_per_question_with_media(self, repo):
+        """Every question should be exported once, in ID order, with media."""
+        records = [json.loads(line) for line in export_lines(repo, batch_size=2)]
+
+        assert [r["question_id"] for r in records] == [1, 2, 3, 4, 5, 6]
+        first = records[0]
+        assert first["source_name"] == "MKSAP"
+        assert first["raw_html"].startswith("<html>MKSAP 0 ")
+        assert json.loads(first["raw_metadata_json"]) == {"bodyText": "Q0"}
+        assert first["media"] == [
+            {
+                "media_role": "image",
+                "media_type": None,
+                "mime_type": "image/png",
+                "relative_path": "blobs/ab/abc.png",
+                "sha256": "abc",
+            }
+        ]
+        assert records[1]["media"] == []
+
+    def test_filters_by_source(self, repo):
+        """Only the requested source should be exported."""
+        records = [
+            json.loads(line) for line in export_lines(repo, source_name="UWorld")
+        ]
+
+        assert {r["source_name"] for r in records} == {"UWorld"}
+        assert len(records) == 3
+
+    def test_questions_are_not_kept_in_the_session(self, repo):
+        """Streaming should not accumulate ORM objects."""
+        repo.session.expunge_all()
+
+        for _ in export_lines(repo, batch_size=2):
+            assert len(repo.session.identity_map) == 0
+
+
+class TestStreamHelpers:
+    """Tests for coalesce and gzip_chunks."""
+
+    def test_coalesce_joins_small_chunks(self):
+        """Chunks should be joined until they reach the minimum size."""
+        chunks = list(coalesce([b"ab", b"cd", b"e", b"fg"], size=3))
+
+        assert chunks == [b"abcd", b"efg"]
+
+    def test_gzip_chunks_form_one_gzip_stream(self):
+        """The compressed chunks should concatenate to one gzip file."""
+        data = [b'{"a": 1}\n' * 1000, b'{"b": 2}\n']
+
+        compressed = b"".join(gzip_chunks(data))
+
+        assert gzip.decompress(compressed) == b"".join(data)
@@ -0,0 +1,91 @@
+"""
+Tests for the bounded extraction history.
+"""
+
+import json
+
+from doughub2.history import ExtractionHistory
+
+
+def _save(tmp_path, name, metadata, html):
+    """Write an extraction's JSON and HTML files and return their paths."""
+    json_file = tmp_path / f"{name}.json"
+    html_file = tmp_path / f"{name}.html"
+    json_file.write_text(json.dumps(metadata), encoding="utf-8")
+    html_file.write_text(html, encoding="utf-8")
+    return html_file, json_file
+
+
+class TestExtractionHistory:
+    """Tests for ExtractionHistory."""
+
+    def test_keeps_only_summary_fields(self):
+        """Large payload fields should not be held in memory."""
+        history = ExtractionHistory(capacity=10)
+        history.append(
+            {
+                "url": "https://example.com/q1",
+                "siteName": "MKSAP",
+                "pageHTML": "<html>" * 1000,
+                "elements": [{"tag": "p"}] * 100,
+            }
+        )
+
+        (summary,) = history.summaries()
+        assert summary["url"] == "https://example.com/q1"
+        assert "pageHTML" not in summary
+        assert "elements" not in summary
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Once full, the least recently used entry should be dropped."""
+        history = ExtractionHistory(capacity=2)
+        first = history.append({"url": "a"})
+        second = history.append({"url": "b"})
+
+        # Touch the first entry so the second becomes least recently used
+        assert history.load(first) is not None
+        third = history.append({"url": "c"})
+
+        assert len(history) == 2
+        assert history.load(second) is None
+        assert history.load(first)["url"] == "a"
+        assert history.load(third)["url"] == "c"
+        assert history.received == 3
+
+    def test_load_reads_payload_from_disk(self, tmp_path):
+        """The full payload should come from the saved JSON and HTML files."""
+        history = ExtractionHistory(capacity=10)
+        html_file, json_file = _save(
+            tmp_path,
+            "q1",
+            {"url": "https://example.com/q1", "bodyText": "Body", "elements": []},
+            "<html>Body</html>",
+        )
+        index = history.append(
+            {"url": "https://example.com/q1"}, html_file=html_file, json_file=json_file
+        )
+
+        data = history.load(index)
+
+        assert data["bodyText"] == "Body"
+        assert data["pageHTML"] == "<html>Body</html>"
+
+    def test_load_falls_back_to_summary_when_files_missing(self, tmp_path):
+        """Entries whose files were removed should still return the summary."""
+        history = ExtractionHistory(capacity=10)
+        index = history.append(
+            {"url": "https://example.com/q1"},
+            html_file=tmp_path / "gone.html",
+            json_file=tmp_path / "gone.json",
+        )
+
+        assert history.load(index)["url"] == "https://example.com/q1"
+
+    def test_clear_resets_indexes(self):
+        """Clearing should forget entries and restart numbering."""
+        history = ExtractionHistory(capacity=10)
+        history.append({"url": "a"})
+        history.clear()
+
+        assert len(history) == 0
+        assert history.append({"url": "b"}) == 0
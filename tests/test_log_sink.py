@@ -0,0 +1,131 @@
+"""
+Tests for the database log sink.
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from doughub2.database import create_db_engine
+from doughub2.log_sink import DatabaseLogSink
+from doughub2.models import Base, Log
+from doughub2.persistence import LogRepository
+
+
+@pytest.fixture
+def Session(tmp_path):
+    """A session factory on a fresh file-backed database."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'test.db'}", "production")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def test_logger():
+    """A logger outside the logging hierarchy, so no other handler sees it."""
+    return logging.Logger("doughub2.tests.log_sink")
+
+
+def stored_logs(Session):
+    with Session() as session:
+        return list(session.scalars(select(Log).order_by(Log.log_id)))
+
+
+class TestDatabaseLogSink:
+    """Tests for DatabaseLogSink."""
+
+    def test_writes_records_at_the_sink_level(self, Session, test_logger):
+        """Records at or above the sink level should be stored, formatted."""
+        sink = DatabaseLogSink(Session, flush_interval=0.2)
+        sink.start(test_logger)
+        for i in range(5):
+            test_logger.info("record %d of %s", i, "burst")
+        test_logger.debug("below the sink level")
+        sink.stop()
+
+        logs = stored_logs(Session)
+        assert [log.message for log in logs] == [
+            f"record {i} of burst" for i in range(5)
+        ]
+        assert {log.level for log in logs} == {"INFO"}
+        assert {log.logger_name for log in logs} == {test_logger.name}
+        assert sink.written == 5
+        assert test_logger.level == logging.NOTSET
+        assert not test_logger.handlers
+
+    def test_formats_on_the_listener_thread(self, Session, test_logger):
+        """Message arguments should be merged by the listener, not the caller."""
+        formatted_on = []
+
+        class Probe:
+            def __str__(self):
+                formatted_on.append(threading.current_thread().name)
+                return "probe"
+
+        sink = DatabaseLogSink(Session)
+        sink.start(test_logger)
+        test_logger.warning("value: %s", Probe())
+        sink.stop()
+
+        assert formatted_on == ["doughub2-log-sink"]
+        assert stored_logs(Session)[0].message == "value: probe"
+
+    def test_includes_tracebacks(self, Session, test_logger):
+        """Exceptions logged with exc_info should be stored with the message."""
+        sink = DatabaseLogSink(Session)
+        sink.start(test_logger)
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            test_logger.exception("failed")
+        sink.stop()
+
+        message = stored_logs(Session)[0].message
+        assert message.startswith("failed\nTraceback")
+        assert "RuntimeError: boom" in message
+
+    def test_drops_records_when_the_queue_is_full(self, Session, test_logger):
+        """A full queue should drop records rather than block the caller."""
+        sink = DatabaseLogSink(Session, queue_size=2)
+        # Attached without a listener, so nothing drains the queue
+        test_logger.setLevel(logging.INFO)
+        test_logger.addHandler(sink.handler)
+        for i in range(5):
+            test_logger.info("record %d", i)
+
+        assert sink.dropped == 3
+
+    def test_prunes_expired_logs(self, Session, test_logger):
+        """Logs older than the retention period should be deleted on start."""
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        with Session() as session:
+            LogRepository(session).add_logs(
+                [
+                    {
+                        "level": "INFO",
+                        "logger_name": "old",
+                        "message": "old",
+                        "timestamp": now - timedelta(days=10),
+                    },
+                    {
+                        "level": "INFO",
+                        "logger_name": "recent",
+                        "message": "recent",
+                        "timestamp": now - timedelta(days=1),
+                    },
+                ]
+            )
+            session.commit()
+
+        sink = DatabaseLogSink(Session, retention=timedelta(days=7))
+        sink.start(test_logger)
+        test_logger.info("new")
+        sink.stop()
+
+        assert [log.message for log in stored_logs(Session)] == ["recent", "new"]
+        assert sink.pruned == 1
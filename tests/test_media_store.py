@@ -0,0 +1,80 @@
+"""
+Tests for the content-addressed media store.
+"""
+
+import hashlib
+import os
+
+from doughub2.media_store import blob_relative_path, store_file
+
+
+class TestStoreFile:
+    """Tests for store_file."""
+
+    def test_stores_blob_by_content_hash(self, tmp_path):
+        """A file should be stored under its SHA-256 alone."""
+        source = tmp_path / "download" / "q1_img0.PNG"
+        source.parent.mkdir()
+        source.write_bytes(b"figure")
+        media_root = tmp_path / "media"
+
+        sha256, relative_path = store_file(source, media_root)
+
+        assert sha256 == hashlib.sha256(b"figure").hexdigest()
+        assert relative_path == f"blobs/{sha256[:2]}/{sha256}"
+        assert relative_path == blob_relative_path(sha256)
+        assert (media_root / relative_path).read_bytes() == b"figure"
+        assert source.exists()
+
+    def test_blob_is_hardlinked_not_copied(self, tmp_path):
+        """The blob should share the downloaded file's inode."""
+        source = tmp_path / "q1_img0.png"
+        source.write_bytes(b"figure")
+        media_root = tmp_path / "media"
+
+        _, relative_path = store_file(source, media_root)
+
+        assert os.path.samefile(source, media_root / relative_path)
+
+    def test_duplicate_content_is_stored_once(self, tmp_path):
+        """Identical files from different questions should share one blob."""
+        first = tmp_path / "q1_img0.png"
+        second = tmp_path / "q2_img3.png"
+        first.write_bytes(b"shared logo")
+        second.write_bytes(b"shared logo")
+        media_root = tmp_path / "media"
+
+        first_hash, first_path = store_file(first, media_root)
+        second_hash, second_path = store_file(second, media_root)
+
+        assert first_hash == second_hash
+        assert first_path == second_path
+        assert len([p for p in (media_root / "blobs").rglob("*") if p.is_file()]) == 1
+        # The duplicate download now points at the stored blob as well
+        assert os.path.samefile(second, media_root / second_path)
+        assert second.read_bytes() == b"shared logo"
+
+    def test_extension_does_not_split_blobs(self, tmp_path):
+        """The same bytes saved as .jpg, .jpeg or without extension share a blob."""
+        media_root = tmp_path / "media"
+        paths = set()
+        for name in ("q1_img0.jpg", "q2_img0.jpeg", "q3_img0"):
+            source = tmp_path / name
+            source.write_bytes(b"photo")
+            paths.add(store_file(source, media_root)[1])
+
+        assert len(paths) == 1
+        assert [p for p in (media_root / "blobs").rglob("*") if p.is_file()] == [
+            media_root / paths.pop()
+        ]
+
+    def test_uses_known_hash(self, tmp_path):
+        """A hash computed during download should be used as-is."""
+        source = tmp_path / "q1_img0.jpg"
+        source.write_bytes(b"photo")
+        known = hashlib.sha256(b"photo").hexdigest()
+
+        sha256, relative_path = store_file(source, tmp_path / "media", known)
+
+        assert sha256 == known
+        assert relative_path.endswith(f"/{known}")
@@ -0,0 +1,838 @@
+"""
+Tests for the DougHub2 persistence layer.
+
+This module contains tests for QuestionRepository operations that are
+not exercised end-to-end through the API tests.
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+import doughub2
+from doughub2.database import create_async_db_engine, create_db_engine, upgrade_schema
+from doughub2.models import Base, Question, QuestionTag, Tag
+from doughub2.persistence import (
+    AsyncQuestionRepository,
+    QuestionRepository,
+    compute_body_hash,
+)
+from doughub2.persistence.repository import BODY_WHITESPACE
+from doughub2.search import parse_search_query
+
+
+@pytest.fixture
+def session():
+    """Create an in-memory SQLite session for repository tests."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def repo(session):
+    """Create a repository bound to the test session."""
+    return QuestionRepository(session)
+
+
+def _add_question(repo, source_id, key, body_text):
+    """Add a question with the given body text to the repository."""
+    return repo.add_question(
+        {
+            "source_id": source_id,
+            "source_question_key": key,
+            "raw_html": f"<html>{key}</html>",
+            "raw_metadata_json": json.dumps({"bodyText": body_text}),
+        }
+    )
+
+
+class TestComputeBodyHash:
+    """Tests for the compute_body_hash function."""
+
+    def test_whitespace_differences_hash_identically(self):
+        """Layout whitespace should not change the hash."""
+        assert compute_body_hash("A  question\n\nabout\tsepsis ") == compute_body_hash(
+            "A question about sepsis"
+        )
+
+    def test_different_text_hashes_differently(self):
+        """Different content should produce different hashes."""
+        assert compute_body_hash("Question one") != compute_body_hash("Question two")
+
+    def test_collapses_only_unicode_white_space(self):
+        """Separators and the BOM are text; NEL and ideographic space are not.
+
+        The userscript's computeBodyHash must produce the same digest.
+        """
+        body = "\ufeffCafe\u0301\x1cA\x1d\x1e\x1fB\x85C\u3000 D\t "
+        normalized = "\ufeffCaf\u00e9\x1cA\x1d\x1e\x1fB C D"
+
+        digest = compute_body_hash(body)
+
+        assert digest == hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        assert digest == (
+            "b345b0b1367c45ce05954d6c59e56e8c769bdf249e16b2ecc3849111deb38a93"
+        )
+
+    def test_userscript_uses_the_same_whitespace(self):
+        """The userscript should collapse exactly BODY_WHITESPACE."""
+        userscript = (
+            Path(doughub2.__file__).parent
+            / "userscripts"
+            / "question_extractor.user.js"
+        ).read_text(encoding="utf-8")
+
+        match = re.search(r"const BODY_WHITESPACE = /(.+)/;", userscript)
+
+        assert match is not None
+        assert match.group(1) == BODY_WHITESPACE.pattern
+        assert ".split(BODY_WHITESPACE)" in userscript
+
+
+class TestBodyHashLookup:
+    """Tests for body-hash based duplicate detection."""
+
+    def test_add_question_derives_body_hash(self, repo):
+        """add_question should fill body_hash from the metadata bodyText."""
+        source = repo.get_or_create_source("MKSAP")
+        question = _add_question(repo, source.source_id, "q1", "Body text")
+        assert question.body_hash == compute_body_hash("Body text")
+
+    def test_get_question_by_body_text_matches_normalized_text(self, repo):
+        """Lookup should match text that differs only in whitespace."""
+        source = repo.get_or_create_source("MKSAP")
+        question = _add_question(repo, source.source_id, "q1", "Body  text\n")
+
+        found = repo.get_question_by_body_text(source.source_id, "Body text")
+        assert found is not None
+        assert found.question_id == question.question_id
+
+    def test_lookup_is_scoped_to_source(self, repo):
+        """The same body text in another source should not match."""
+        mksap = repo.get_or_create_source("MKSAP")
+        peerprep = repo.get_or_create_source("PeerPrep")
+        _add_question(repo, mksap.source_id, "q1", "Shared text")
+
+        assert repo.get_question_by_body_text(peerprep.source_id, "Shared text") is None
+
+
+class TestBackfillBodyHashes:
+    """Tests for backfilling body_hash on pre-existing rows."""
+
+    def test_backfill_populates_missing_hashes(self, repo, session):
+        """Rows without a hash should be hashed; rows without text skipped."""
+        source = repo.get_or_create_source("MKSAP")
+        for i, metadata in enumerate(
+            [{"bodyText": "First"}, {"bodyText": "Second"}, {"title": "No body"}]
+        ):
+            repo.add_question(
+                {
+                    "source_id": source.source_id,
+                    "source_question_key": f"q{i}",
+                    "raw_html": "<html></html>",
+                    "raw_metadata_json": json.dumps(metadata),
+                    "body_hash": None,
+                }
+            )
+        repo.commit()
+        session.execute(text("UPDATE questions SET updated_at = '2024-01-01 00:00:00'"))
+        session.commit()
+
+        assert repo.backfill_body_hashes(batch_size=2) == 2
+
+        session.expire_all()
+        questions = session.query(Question).all()
+        hashes = {q.source_question_key: q.body_hash for q in questions}
+        assert hashes == {
+            "q0": compute_body_hash("First"),
+            "q1": compute_body_hash("Second"),
+            "q2": None,
+        }
+        # Backfilling does not count as modifying the question
+        assert {q.updated_at for q in questions} == {datetime(2024, 1, 1)}
+
+
+class TestMetadataColumns:
+    """Tests for the columns promoted out of raw_metadata_json."""
+
+    METADATA = {
+        "bodyText": "A 54-year-old man",
+        "url": "https://example.com/q/1",
+        "hostname": "example.com",
+        "timestamp": "2025-11-27T14:50:33.000Z",
+        "title": "Chest pain",
+        "category": "Cardiology",
+    }
+
+    def _add(self, repo, source_id, key, metadata):
+        return repo.add_question(
+            {
+                "source_id": source_id,
+                "source_question_key": key,
+                "raw_html": "<html></html>",
+                "raw_metadata_json": json.dumps(metadata),
+            }
+        )
+
+    def test_add_question_fills_columns(self, repo):
+        """Ingest should copy the metadata fields into their columns."""
+        source = repo.get_or_create_source("MKSAP")
+        question = self._add(repo, source.source_id, "q1", self.METADATA)
+
+        assert question.body_text == "A 54-year-old man"
+        assert question.url == "https://example.com/q/1"
+        assert question.hostname == "example.com"
+        assert question.extracted_at == datetime(2025, 11, 27, 14, 50, 33)
+        assert question.title == "Chest pain"
+        assert question.category == "Cardiology"
+        assert question.body_hash == compute_body_hash("A 54-year-old man")
+
+    def test_backfill_fills_existing_rows(self, repo, session):
+        """Rows stored before the columns existed should be filled in batches."""
+        source = repo.get_or_create_source("MKSAP")
+        for i in range(3):
+            self._add(
+                repo, source.source_id, f"q{i}", {**self.METADATA, "url": f"u{i}"}
+            )
+        self._add(repo, source.source_id, "bare", {})
+        repo.commit()
+        session.execute(
+            text(
+                "UPDATE questions SET body_text = NULL, url = NULL, "
+                "hostname = NULL, extracted_at = NULL, title = NULL, "
+                "category = NULL, updated_at = '2024-01-01 00:00:00'"
+            )
+        )
+        session.commit()
+
+        assert repo.backfill_metadata_columns(batch_size=2) == 3
+        assert repo.backfill_metadata_columns(batch_size=2) == 0
+
+        session.expire_all()
+        questions = {q.source_question_key: q for q in session.query(Question)}
+        assert questions["q2"].url == "u2"
+        assert questions["q2"].category == "Cardiology"
+        assert questions["bare"].url is None
+        # Backfilling does not count as modifying the question
+        assert {q.updated_at for q in questions.values()} == {datetime(2024, 1, 1)}
+
+    @pytest.mark.parametrize("backfilled", [True, False])
+    def test_note_frontmatter(self, repo, session, tmp_path, monkeypatch, backfilled):
+        """Notes should get title and category, backfilled or not."""
+        monkeypatch.setattr("doughub2.config.NOTES_DIR", str(tmp_path))
+        source = repo.get_or_create_source("MKSAP")
+        question = self._add(repo, source.source_id, "q1", self.METADATA)
+        repo.commit()
+        if not backfilled:
+            session.execute(text("UPDATE questions SET title = NULL, category = NULL"))
+            session.commit()
+
+        note_path = repo.ensure_note_for_question(question.question_id)
+
+        frontmatter = Path(note_path).read_text(encoding="utf-8").splitlines()
+        assert "title: Chest pain" in frontmatter
+        assert "category: Cardiology" in frontmatter
+
+    def test_list_and_count_filters(self, repo, session):
+        """Listings should filter on hostname and category through indexes."""
+        source = repo.get_or_create_source("MKSAP")
+        for i, (hostname, category) in enumerate(
+            [("a.com", "Cardiology"), ("b.com", "Cardiology"), ("a.com", "Renal")]
+        ):
+            self._add(
+                repo,
+                source.source_id,
+                f"q{i}",
+                {"hostname": hostname, "category": category},
+            )
+        repo.commit()
+
+        rows = repo.list_question_summaries(10, hostname="a.com")
+        assert [row.source_question_key for row in rows] == ["q0", "q2"]
+        rows = repo.list_question_summaries(10, hostname="a.com", category="Cardiology")
+        assert [row.source_question_key for row in rows] == ["q0"]
+        assert repo.count_questions(category="Cardiology") == 2
+        assert repo.count_questions() == 3
+
+        plan = session.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT question_id FROM questions "
+                "WHERE category = 'Renal' ORDER BY question_id"
+            )
+        ).all()
+        assert "ix_questions_category_id" in " ".join(row[-1] for row in plan)
+
+
+class TestCompressedContent:
+    """Tests for compressed storage of raw HTML and metadata."""
+
+    def _stored_types(self, session):
+        return session.execute(
+            text("SELECT typeof(raw_html), typeof(raw_metadata_json) FROM questions")
+        ).all()
+
+    def test_large_content_is_stored_compressed(self, repo, session):
+        """HTML should be stored as a compressed blob and read back as text."""
+        source = repo.get_or_create_source("MKSAP")
+        html = "<html>" + "<p>Repeated paragraph</p>" * 500 + "</html>"
+        question = repo.add_question(
+            {
+                "source_id": source.source_id,
+                "source_question_key": "q1",
+                "raw_html": html,
+                "raw_metadata_json": json.dumps({"bodyText": "Body"}),
+            }
+        )
+        repo.commit()
+
+        raw_size = session.execute(
+            text("SELECT length(raw_html) FROM questions")
+        ).scalar_one()
+        assert self._stored_types(session) == [("blob", "text")]
+        assert raw_size < len(html) / 10
+
+        session.expire_all()
+        assert repo.get_question_by_id(question.question_id).raw_html == html
+        session.expire_all()
+        loaded = repo.get_question_by_id(question.question_id, include_content=True)
+        assert "raw_html" in loaded.__dict__
+        assert loaded.raw_html == html
+
+    def test_uncompressed_rows_are_read_as_is(self, repo, session):
+        """Rows written before compression was enabled should still load."""
+        source = repo.get_or_create_source("MKSAP")
+        session.execute(
+            text(
+                "INSERT INTO questions (source_id, source_question_key, raw_html, "
+                "raw_metadata_json, status, created_at, updated_at) VALUES "
+                "(:source_id, 'legacy', :html, '{}', 'extracted', "
+                "CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+            ),
+            {"source_id": source.source_id, "html": "<p>legacy</p>" * 100},
+        )
+        repo.commit()
+
+        (question,) = repo.get_all_questions()
+        assert question.raw_html == "<p>legacy</p>" * 100
+
+    def test_recompress_rewrites_rows(self, repo, session):
+        """The migration should compress old rows and can undo it."""
+        source = repo.get_or_create_source("MKSAP")
+        html = "<div>content</div>" * 200
+        metadata = json.dumps({"bodyText": "word " * 200})
+
+        with patch("doughub2.compression.settings") as mock_settings:
+            mock_settings.RAW_CONTENT_COMPRESSION = "none"
+            mock_settings.RAW_CONTENT_COMPRESSION_LEVEL = None
+            for i in range(3):
+                repo.add_question(
+                    {
+                        "source_id": source.source_id,
+                        "source_question_key": f"q{i}",
+                        "raw_html": html,
+                        "raw_metadata_json": metadata,
+                    }
+                )
+            repo.commit()
+        session.execute(text("UPDATE questions SET updated_at = '2024-01-01 00:00:00'"))
+        session.commit()
+        assert self._stored_types(session) == [("text", "text")] * 3
+
+        assert repo.recompress_raw_content(batch_size=2) == 3
+        assert self._stored_types(session) == [("blob", "blob")] * 3
+        assert repo.recompress_raw_content() == 0
+
+        session.expire_all()
+        questions = repo.get_all_questions()
+        assert all(q.raw_html == html for q in questions)
+        # Re-encoding does not count as modifying the question
+        assert {q.updated_at for q in questions} == {datetime(2024, 1, 1)}
+
+        with (
+            patch("doughub2.compression.settings") as compression_settings,
+            patch("doughub2.persistence.repository.config.settings") as repo_settings,
+        ):
+            for mock_settings in (compression_settings, repo_settings):
+                mock_settings.RAW_CONTENT_COMPRESSION = "none"
+                mock_settings.RAW_CONTENT_COMPRESSION_LEVEL = None
+            assert repo.recompress_raw_content() == 3
+        assert self._stored_types(session) == [("text", "text")] * 3
+
+    def test_recompress_skips_values_too_short_to_compress(self, repo, session):
+        """Short values stay text under any codec, so they are never rewritten."""
+        source = repo.get_or_create_source("MKSAP")
+        for key, html in (("short", "<p>Short</p>"), ("long", "<p>Long</p>" * 100)):
+            session.execute(
+                text(
+                    "INSERT INTO questions (source_id, source_question_key, "
+                    "raw_html, raw_metadata_json, status, created_at, updated_at) "
+                    "VALUES (:source_id, :key, :html, '{}', 'extracted', "
+                    "CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+                ),
+                {"source_id": source.source_id, "key": key, "html": html},
+            )
+        repo.commit()
+
+        assert repo.recompress_raw_content() == 1
+        assert self._stored_types(session) == [("text", "text"), ("blob", "text")]
+        assert repo.recompress_raw_content() == 0
+
+
+class TestSearchIndex:
+    """Tests for keeping the full-text index in sync."""
+
+    def _search(self, repo, text_query):
+        from doughub2.search import parse_search_query
+
+        rows = repo.search_questions(parse_search_query(text_query), limit=10)
+        return [row.question_id for row in rows]
+
+    def test_rebuild_indexes_existing_questions(self, repo, session):
+        """Questions stored without an index entry are found after a rebuild."""
+        source = repo.get_or_create_source("MKSAP")
+        question = _add_question(repo, source.source_id, "q1", "Anemia workup")
+        repo.commit()
+        session.execute(text("DELETE FROM questions_fts"))
+        session.commit()
+        assert self._search(repo, "anemia") == []
+
+        assert repo.rebuild_search_index(batch_size=1) == 1
+
+        assert self._search(repo, "anemia") == [question.question_id]
+
+    def test_readding_question_replaces_entry(self, repo):
+        """Updating a question should not leave its old text searchable."""
+        source = repo.get_or_create_source("MKSAP")
+        question = _add_question(repo, source.source_id, "q1", "Anemia workup")
+        _add_question(repo, source.source_id, "q1", "Thyroid nodule")
+        repo.commit()
+
+        assert self._search(repo, "anemia") == []
+        assert self._search(repo, "thyroid") == [question.question_id]
+
+
+class TestQuestionTags:
+    """Tests for the normalized tags and question_tags tables."""
+
+    def _tag(self, repo, question_id, tags):
+        repo.update_question_from_metadata({"question_id": question_id, "tags": tags})
+        repo.commit()
+
+    def _tags_of(self, session, question_id):
+        rows = session.execute(
+            select(Tag.name)
+            .join(QuestionTag, QuestionTag.tag_id == Tag.tag_id)
+            .where(QuestionTag.question_id == question_id)
+            .order_by(Tag.name)
+        )
+        return list(rows.scalars())
+
+    def test_tags_are_synced_incrementally(self, repo, session):
+        """Changing tags should only touch the tags that changed."""
+        source = repo.get_or_create_source("MKSAP")
+        question = _add_question(repo, source.source_id, "q1", "Chest pain")
+        qid = question.question_id
+        self._tag(repo, qid, ["cardio", "renal"])
+        self._tag(repo, qid, ["Cardio", "endo", "ENDO"])
+
+        assert self._tags_of(session, qid) == ["cardio", "endo"]
+        # "Cardio" is the existing tag, not a new one
+        assert session.execute(select(func.count()).select_from(Tag)).scalar() == 3
+
+    def test_tag_filters_use_the_index(self, repo, session):
+        """tag: searches and the tag list filter should match through question_tags."""
+        source = repo.get_or_create_source("MKSAP")
+        q1 = _add_question(repo, source.source_id, "q1", "Chest pain").question_id
+        q2 = _add_question(repo, source.source_id, "q2", "Kidney stones").question_id
+        q3 = _add_question(repo, source.source_id, "q3", "Thyroid").question_id
+        self._tag(repo, q1, ["cardiology", "board_review"])
+        self._tag(repo, q2, "renal,boardreview")
+        self._tag(repo, q3, [])
+
+        def search(q):
+            hits = repo.search_questions(parse_search_query(q), limit=10)
+            return [hit.question_id for hit in hits]
+
+        assert search("tag:CARD") == [q1]
+        assert search("tag:board_") == [q1]
+        assert search("tag:renal kidney") == [q2]
+        assert repo.count_search_results(parse_search_query("tag:board")) == 2
+        assert [
+            row.question_id for row in repo.list_question_summaries(10, tag="Renal")
+        ] == [q2]
+        assert repo.count_questions(tag="cardio") == 0
+
+        plan = " ".join(
+            row[-1]
+            for row in session.execute(
+                text(
+                    "EXPLAIN QUERY PLAN SELECT question_id FROM question_tags "
+                    "JOIN tags USING (tag_id) WHERE tags.name LIKE 'card%' ESCAPE '\\'"
+                )
+            )
+        )
+        assert "sqlite_autoindex_tags_1" in plan
+        assert "ix_question_tags_tag_question" in plan
+
+    def test_counts_and_rebuild(self, repo, session):
+        """Per-tag counts should come from question_tags, rebuilt from Question.tags."""
+        source = repo.get_or_create_source("MKSAP")
+        q1 = _add_question(repo, source.source_id, "q1", "Chest pain").question_id
+        q2 = _add_question(repo, source.source_id, "q2", "Kidney").question_id
+        self._tag(repo, q1, ["cardio", "renal"])
+        self._tag(repo, q2, ["renal"])
+        session.execute(text("DELETE FROM question_tags"))
+        session.commit()
+        assert repo.count_questions_by_tag() == []
+
+        assert repo.rebuild_question_tags(batch_size=1) == 2
+
+        assert [tuple(row) for row in repo.count_questions_by_tag()] == [
+            ("renal", 2),
+            ("cardio", 1),
+        ]
+
+    def test_bulk_add_syncs_given_tags(self, repo, session):
+        """add_questions should sync tags only for rows that provide them."""
+        source = repo.get_or_create_source("MKSAP")
+        q1 = _add_question(repo, source.source_id, "q1", "Chest pain").question_id
+        self._tag(repo, q1, ["cardio"])
+        rows = [
+            {
+                "source_id": source.source_id,
+                "source_question_key": key,
+                "raw_html": "<html></html>",
+                "raw_metadata_json": "{}",
+                **extra,
+            }
+            for key, extra in (("q1", {}), ("q2", {"tags": '["endo"]'}))
+        ]
+
+        q1_again, q2 = repo.add_questions(rows)
+        repo.commit()
+
+        assert q1_again == q1
+        assert self._tags_of(session, q1) == ["cardio"]
+        assert self._tags_of(session, q2) == ["endo"]
+
+
+class TestQuestionStats:
+    """Tests for the trigger-maintained question_stats row."""
+
+    def test_tracks_count_and_version(self, repo, session):
+        """Every write should move the version; inserts and deletes the count."""
+        source = repo.get_or_create_source("MKSAP")
+        versions = [repo.get_questions_version()]
+        _add_question(repo, source.source_id, "q1", "Chest pain")
+        repo.add_questions(
+            [
+                {
+                    "source_id": source.source_id,
+                    "source_question_key": key,
+                    "raw_html": "<html></html>",
+                    "raw_metadata_json": "{}",
+                }
+                for key in ("q1", "q2", "q3")
+            ]
+        )
+        repo.commit()
+        versions.append(repo.get_questions_version())
+        session.execute(text("DELETE FROM questions WHERE source_question_key = 'q3'"))
+        session.commit()
+        versions.append(repo.get_questions_version())
+
+        assert [v.count for v in versions] == [0, 3, 2]
+        assert versions[0].version < versions[1].version < versions[2].version
+        assert versions[2].count == repo.count_questions()
+
+
+class TestUpserts:
+    """Tests for the ON CONFLICT upserts and bulk writes."""
+
+    def _statements(self, session, func):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            result = func()
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        return result, statements
+
+    def test_add_question_is_one_upsert(self, repo, session):
+        """Re-adding a question updates it in place with one statement."""
+        source = repo.get_or_create_source("MKSAP")
+        question = repo.add_question(
+            {
+                "source_id": source.source_id,
+                "source_question_key": "q1",
+                "raw_html": "<p>v1</p>",
+                "raw_metadata_json": "{}",
+                "extraction_path": "/tmp/q1",
+            }
+        )
+        repo.commit()
+        source_id = source.source_id
+
+        updated, statements = self._statements(
+            session,
+            lambda: repo.add_question(
+                {
+                    "source_id": source_id,
+                    "source_question_key": "q1",
+                    "raw_html": "<p>v2</p>",
+                    "raw_metadata_json": "{}",
+                }
+            ),
+        )
+        repo.commit()
+
+        assert updated.question_id == question.question_id
+        assert updated.raw_html == "<p>v2</p>"
+        assert updated.status == "extracted"
+        # Fields not given keep their stored values
+        assert updated.extraction_path == "/tmp/q1"
+        question_writes = [sql for sql in statements if "INTO questions " in sql]
+        assert len(question_writes) == 1
+        assert "ON CONFLICT" in question_writes[0]
+        assert not any(sql.startswith("SELECT") for sql in statements)
+
+    def test_concurrent_get_or_create_source(self, tmp_path):
+        """Writers racing to create a source should all get the same row."""
+        engine = create_db_engine(f"sqlite:///{tmp_path / 'race.db'}", "production")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        barrier = threading.Barrier(8)
+        source_ids, errors = [], []
+
+        def create():
+            with Session() as session:
+                repo = QuestionRepository(session)
+                barrier.wait()
+                try:
+                    source_ids.append(repo.get_or_create_source("Racy").source_id)
+                    repo.commit()
+                except Exception as e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=create) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+        assert errors == []
+        assert len(set(source_ids)) == 1
+
+    def test_add_questions(self, repo, session):
+        """Bulk upserts return IDs in order and index every question."""
+        source = repo.get_or_create_source("MKSAP")
+        existing = _add_question(repo, source.source_id, "q0", "old anemia")
+        rows = [
+            {
+                "source_id": source.source_id,
+                "source_question_key": f"q{i}",
+                "raw_html": f"<p>question {i}</p>",
+                "raw_metadata_json": json.dumps({"bodyText": f"thyroid {i}"}),
+            }
+            for i in range(5)
+        ]
+        # An optional field on some rows only; a key given twice
+        rows[1]["status"] = "reviewed"
+        rows.append({**rows[2], "raw_html": "<p>question 2 again</p>"})
+
+        question_ids = repo.add_questions(rows)
+        repo.commit()
+
+        assert question_ids[0] == existing.question_id
+        assert len(set(question_ids)) == 5
+        assert question_ids[5] == question_ids[2]
+        stored = {q.question_id: q for q in session.query(Question)}
+        assert stored[question_ids[1]].status == "reviewed"
+        assert stored[question_ids[3]].status == "extracted"
+        assert stored[question_ids[2]].raw_html == "<p>question 2 again</p>"
+        assert stored[question_ids[0]].body_hash == compute_body_hash("thyroid 0")
+
+        def search(text_query):
+            hits = repo.search_questions(parse_search_query(text_query), limit=10)
+            return sorted(hit.question_id for hit in hits)
+
+        assert search("anemia") == []
+        assert search("thyroid") == sorted(set(question_ids))
+
+    def test_add_questions_rejects_incomplete_rows(self, repo):
+        """A row without a required field should be rejected."""
+        with pytest.raises(ValueError, match="raw_html"):
+            repo.add_questions([{"source_id": 1, "source_question_key": "q"}])
+
+    def test_add_media(self, repo, session):
+        """Bulk media inserts return IDs in order and touch their questions."""
+        source = repo.get_or_create_source("MKSAP")
+        first = _add_question(repo, source.source_id, "q1", "one")
+        second = _add_question(repo, source.source_id, "q2", "two")
+        session.execute(text("UPDATE questions SET updated_at = '2024-01-01'"))
+        rows = [
+            {
+                "question_id": question.question_id,
+                "media_role": "image",
+                "mime_type": "image/png",
+                "relative_path": f"{question.question_id}-{i}.png",
+            }
+            for question in (first, second)
+            for i in range(2)
+        ]
+
+        media_ids = repo.add_media(rows)
+        repo.commit()
+
+        assert media_ids == sorted(media_ids) and len(media_ids) == 4
+        assert [repo.get_media_by_id(m).relative_path for m in media_ids] == [
+            row["relative_path"] for row in rows
+        ]
+        updated = session.execute(text("SELECT updated_at FROM questions")).scalars()
+        assert all(not value.startswith("2024") for value in updated)
+
+
+class TestUpgradeSchema:
+    """Tests for in-place schema upgrades of older databases."""
+
+    def test_adds_missing_column_and_index(self):
+        """An old questions table should gain body_hash and its index."""
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_questions_source_body_hash"))
+            conn.execute(text("ALTER TABLE questions DROP COLUMN body_hash"))
+
+        upgrade_schema(engine)
+
+        with engine.connect() as conn:
+            columns = {
+                row[1] for row in conn.execute(text("PRAGMA table_info(questions)"))
+            }
+            indexes = {
+                row[1] for row in conn.execute(text("PRAGMA index_list(questions)"))
+            }
+        assert "body_hash" in columns
+        assert "ix_questions_source_body_hash" in indexes
+        engine.dispose()
+
+    def test_adds_column_with_server_default(self, session):
+        """Existing questions should take a new column's server default."""
+        engine = session.get_bind()
+        repo = QuestionRepository(session)
+        source = repo.get_or_create_source("MKSAP")
+        _add_question(repo, source.source_id, "q1", "Body")
+        repo.commit()
+        session.execute(text("ALTER TABLE questions DROP COLUMN version"))
+        session.commit()
+
+        upgrade_schema(engine)
+
+        assert session.execute(text("SELECT version FROM questions")).all() == [(1,)]
+        _add_question(repo, source.source_id, "q1", "Edited")
+        repo.commit()
+        assert session.execute(text("SELECT version FROM questions")).all() == [(2,)]
+
+
+class TestAsyncQuestionRepository:
+    """Tests for AsyncQuestionRepository on an aiosqlite engine."""
+
+    def _run(self, tmp_path, scenario):
+        url = f"sqlite:///{tmp_path / 'async.db'}"
+        sync_engine = create_engine(url)
+        Base.metadata.create_all(sync_engine)
+        sync_engine.dispose()
+
+        async def main():
+            engine = create_async_db_engine(url, "production")
+            try:
+                return await scenario(engine)
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(main())
+
+    def test_round_trip(self, tmp_path):
+        """Questions written and read asynchronously keep their content."""
+
+        async def scenario(engine):
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                repo = AsyncQuestionRepository(session)
+                source = await repo.get_or_create_source("Async_Source")
+                question = await repo.add_question(
+                    {
+                        "source_id": source.source_id,
+                        "source_question_key": "a1",
+                        "raw_html": "<p>Async anemia</p>",
+                        "raw_metadata_json": json.dumps({"bodyText": "anemia"}),
+                    }
+                )
+                await repo.commit()
+                question_id = question.question_id
+
+            async with AsyncSession(engine) as session:
+                repo = AsyncQuestionRepository(session)
+                loaded = await repo.get_question_by_id(
+                    question_id, include_content=True, include_source=True
+                )
+                hits = await repo.search_questions(parse_search_query("anemia"), 10)
+                version = await repo.get_questions_version()
+            return loaded, hits, version
+
+        loaded, hits, version = self._run(tmp_path, scenario)
+
+        # Everything read was loaded by the queries themselves
+        assert loaded.raw_html == "<p>Async anemia</p>"
+        assert loaded.source.name == "Async_Source"
+        assert [hit.question_id for hit in hits] == [loaded.question_id]
+        assert version.count == 1
+
+    def test_concurrent_sessions(self, tmp_path):
+        """Several sessions can query the database at the same time."""
+
+        async def scenario(engine):
+            async with AsyncSession(engine) as session:
+                repo = AsyncQuestionRepository(session)
+                source = await repo.get_or_create_source("Async_Source")
+                for i in range(10):
+                    await repo.add_question(
+                        {
+                            "source_id": source.source_id,
+                            "source_question_key": f"a{i}",
+                            "raw_html": f"<p>{i}</p>",
+                            "raw_metadata_json": "{}",
+                        }
+                    )
+                await repo.commit()
+
+            async def read(question_id):
+                async with AsyncSession(engine) as session:
+                    repo = AsyncQuestionRepository(session)
+                    question = await repo.get_question_by_id(
+                        question_id, include_content=True
+                    )
+                    return question.raw_html
+
+            return await asyncio.gather(*(read(i) for i in range(1, 11)))
+
+        assert self._run(tmp_path, scenario) == [f"<p>{i}</p>" for i in range(10)]
@@ -0,0 +1,123 @@
+"""
+Tests for the fast JSON response helpers.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from doughub2 import responses
+from doughub2.schemas import (
+    LogEntry,
+    LogListResponse,
+    QuestionDetailResponse,
+    QuestionListResponse,
+)
+
+
+@pytest.fixture
+def question():
+    """A detail response with HTML that needs escaping."""
+    return QuestionDetailResponse(
+        question_id=7,
+        source_name="MKSAP",
+        source_question_key="q7",
+        raw_html='<p class="x">Café “quoted”\n </p>' * 50,
+    )
+
+
+class TestModelResponse:
+    """Tests for model_response and FastJSONResponse."""
+
+    @pytest.mark.parametrize("encoder", ["default", "orjson"])
+    def test_matches_fastapi_encoding(self, monkeypatch, question, encoder):
+        """Each encoder should produce the same JSON document."""
+        if encoder == "orjson":
+            pytest.importorskip("orjson")
+        monkeypatch.setattr(responses.settings, "JSON_ENCODER", encoder)
+
+        response = responses.model_response(question, headers={"ETag": '"v1"'})
+
+        assert response.media_type == "application/json"
+        assert response.headers["etag"] == '"v1"'
+        assert json.loads(response.body) == question.model_dump(mode="json")
+        assert response.body == question.model_dump_json().encode("utf-8")
+
+    @pytest.mark.parametrize("encoder", ["default", "orjson"])
+    def test_fast_json_response_encodes_dicts(self, monkeypatch, encoder):
+        """Plain dict payloads should round-trip through either encoder."""
+        if encoder == "orjson":
+            pytest.importorskip("orjson")
+        monkeypatch.setattr(responses.settings, "JSON_ENCODER", encoder)
+        content = {"url": "https://example.com/é", "elements": [{"n": 1}], "x": None}
+
+        response = responses.FastJSONResponse(content)
+
+        assert json.loads(response.body) == content
+
+    def test_encoders_agree_byte_for_byte(self, monkeypatch):
+        """Switching encoders should not change the response bytes."""
+        pytest.importorskip("orjson")
+        model = QuestionListResponse(questions=[], next_cursor="abc", total=0)
+        bodies = []
+        for encoder in responses.JSON_ENCODERS:
+            monkeypatch.setattr(responses.settings, "JSON_ENCODER", encoder)
+            bodies.append(responses.model_response(model).body)
+
+        assert bodies[0] == bodies[1]
+
+    def test_orjson_encodes_models_in_one_pass(self, monkeypatch, question):
+        """The orjson path should not build a model_dump copy first."""
+        pytest.importorskip("orjson")
+        monkeypatch.setattr(responses.settings, "JSON_ENCODER", "orjson")
+        body = question.model_dump_json().encode("utf-8")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("model_dump called")
+
+        monkeypatch.setattr(QuestionDetailResponse, "model_dump", fail)
+
+        assert responses.model_response(question).body == body
+
+    @pytest.mark.parametrize(
+        "timestamp",
+        [
+            datetime(2024, 5, 1, 12, 0, 0),
+            datetime(2024, 5, 1, 12, 0, 0, 1500),
+            datetime(2024, 5, 1, 12, 0, 0, tzinfo=timezone.utc),
+            datetime(2024, 5, 1, 7, 0, 0, tzinfo=timezone(timedelta(hours=-5))),
+        ],
+    )
+    def test_encoders_agree_on_nested_models(self, monkeypatch, timestamp):
+        """Nested models and datetimes should encode the same with orjson."""
+        pytest.importorskip("orjson")
+        entry = LogEntry(
+            log_id=1,
+            level="INFO",
+            logger_name="doughub2",
+            message="Café \u2028 </script>",
+            timestamp=timestamp,
+        )
+        model = LogListResponse(logs=[entry, entry], next_cursor="1")
+        bodies = []
+        for encoder in responses.JSON_ENCODERS:
+            monkeypatch.setattr(responses.settings, "JSON_ENCODER", encoder)
+            bodies.append(responses.model_response(model).body)
+
+        assert bodies[0] == bodies[1]
+
+    def test_orjson_requires_the_package(self, monkeypatch, question):
+        """Selecting orjson without it installed should fail clearly."""
+        monkeypatch.setattr(responses.settings, "JSON_ENCODER", "orjson")
+        monkeypatch.setattr(responses, "orjson", None)
+
+        with pytest.raises(RuntimeError, match="orjson"):
+            responses.model_response(question)
+
+    def test_unknown_encoder(self, monkeypatch, question):
+        """An unknown JSON_ENCODER should be rejected."""
+        monkeypatch.setattr(responses.settings, "JSON_ENCODER", "ujson")
+
+        with pytest.raises(ValueError, match="Unknown JSON encoder"):
+            responses.model_response(question)
@@ -0,0 +1,131 @@
+"""
+Tests for the search query language and index text helpers.
+"""
+
+import pytest
+
+from doughub2.search import (
+    SearchHit,
+    build_match_expression,
+    html_to_text,
+    make_snippet,
+    parse_search_query,
+    parse_tags,
+    tags_to_text,
+)
+
+
+class TestParseSearchQuery:
+    """Tests for parse_search_query."""
+
+    def test_parses_operators_and_terms(self):
+        """Each browser operator should be routed to its own filter."""
+        query = parse_search_query(
+            'deck:"MKSAP 19" tag:cardio front:chest back:"troponin level" '
+            'is:Suspended "heart failure" murmur'
+        )
+
+        assert query.terms == ["heart failure", "murmur"]
+        assert query.fields == [
+            ("body", "chest"),
+            ("content", "troponin level"),
+        ]
+        assert query.tags == ["cardio"]
+        assert query.decks == ["MKSAP 19"]
+        assert query.states == ["suspended"]
+
+    def test_filter_only_query_has_no_text(self):
+        """tag:, deck: and is: alone should not need the full-text index."""
+        query = parse_search_query("tag:cardio deck:MKSAP is:new")
+
+        assert not query.has_text
+        assert query.has_filters
+
+    def test_ignores_states_the_browser_does_not_filter_on(self):
+        """is: values other than the browser's states should not filter."""
+        query = parse_search_query("is:due is:Learning is:")
+
+        assert query.states == ["learning"]
+        assert build_match_expression(query) is None
+
+    def test_match_expression_quotes_user_input(self):
+        """FTS syntax in user input should be matched literally."""
+        query = parse_search_query('back:cardio OR NEAR(x "say ""hi"""')
+
+        assert build_match_expression(query) == (
+            '"OR"* "NEAR(x"* "say hi"* content : "cardio"*'
+        )
+
+
+class TestIndexText:
+    """Tests for the text extracted for indexing."""
+
+    def test_html_to_text_skips_scripts_and_styles(self):
+        """Only the readable text of the page should be indexed."""
+        html = (
+            "<html><head><title>T</title><style>p{color:red}</style></head>"
+            "<body><p>Chest&nbsp;pain</p><script>var x = 1;</script>"
+            "<div>  with   fever</div></body></html>"
+        )
+
+        assert html_to_text(html) == "Chest pain with fever"
+
+    def test_tags_to_text_accepts_json_and_plain_strings(self):
+        """Stored tags may be a JSON list or a comma-separated string."""
+        assert tags_to_text('["cardio", "board-review"]') == "cardio board-review"
+        assert tags_to_text("cardio,renal") == "cardio renal"
+        assert tags_to_text(None) == ""
+
+    def test_parse_tags_dedupes_case_insensitively(self):
+        """Tag names should be split and deduplicated the way tags.name compares."""
+        assert parse_tags('["Cardio", "renal", "cardio", " "]') == ["Cardio", "renal"]
+        assert parse_tags("cardio, renal  Renal") == ["cardio", "renal"]
+        assert parse_tags(None) == []
+
+
+class TestMakeSnippet:
+    """Tests for the highlighted result excerpts."""
+
+    def test_highlights_prefix_matches_and_escapes_html(self):
+        """Matched words are marked, the rest of the text is escaped."""
+        hit = SearchHit(
+            question_id=1,
+            source_name="MKSAP",
+            source_question_key="q1",
+            body="A <b> patient with cardiac chest pain",
+        )
+
+        snippet = make_snippet(hit, parse_search_query("card"))
+
+        assert snippet == "A &lt;b&gt; patient with <mark>cardiac</mark> chest pain"
+
+    @pytest.mark.parametrize(
+        "body, query, expected",
+        [
+            ("x <b>ltr</b> y", "lt", "x &lt;b&gt;<mark>ltr</mark>&lt;/b&gt; y"),
+            ("salt & pepper", "amp", "salt &amp; pepper"),
+            ("R&D quotes", "quot", "R&amp;D <mark>quotes</mark>"),
+        ],
+    )
+    def test_never_marks_inside_escaped_entities(self, body, query, expected):
+        """Words are matched before escaping, not in the entities it adds."""
+        hit = SearchHit(
+            question_id=1, source_name="MKSAP", source_question_key="q1", body=body
+        )
+
+        assert make_snippet(hit, parse_search_query(query)) == expected
+
+    def test_falls_back_to_content_and_trims_the_window(self):
+        """The excerpt is taken around the first match in body or content."""
+        content = " ".join(f"w{i}" for i in range(100)) + " troponin " + "x " * 50
+        hit = SearchHit(
+            question_id=1,
+            source_name="MKSAP",
+            source_question_key="q1",
+            body="No match here",
+            content=content,
+        )
+
+        snippet = make_snippet(hit, parse_search_query("back:troponin"), words=8)
+
+        assert snippet == "… w98 w99 <mark>troponin</mark> x x x x x …"
@@ -0,0 +1,103 @@
+"""
+Tests for the group-commit writer.
+"""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from doughub2.database import create_db_engine
+from doughub2.models import Base, Source
+from doughub2.persistence import QuestionRepository
+from doughub2.writer import GroupCommitWriter
+
+
+@pytest.fixture
+def Session(tmp_path):
+    """A session factory on a fresh file-backed database."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'test.db'}", "production")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def add_source(name):
+    """A unit of work that adds a source and returns its ID."""
+    return (
+        lambda session: QuestionRepository(session).get_or_create_source(name).source_id
+    )
+
+
+def source_names(Session):
+    with Session() as session:
+        return set(session.scalars(select(Source.name)))
+
+
+class TestGroupCommitWriter:
+    """Tests for GroupCommitWriter."""
+
+    def test_commits_a_burst_once(self, Session):
+        """Units submitted together should share one commit."""
+        writer = GroupCommitWriter(Session, max_delay=0.2)
+        futures = [writer.submit(add_source(f"S{i}")) for i in range(5)]
+
+        source_ids = [future.result(timeout=5) for future in futures]
+        writer.shutdown()
+
+        assert source_ids == [1, 2, 3, 4, 5]
+        assert writer.commits == 1
+        assert writer.units == 5
+        assert source_names(Session) == {f"S{i}" for i in range(5)}
+
+    def test_batches_are_limited_to_max_batch(self, Session):
+        """No more than max_batch units should be committed together."""
+        writer = GroupCommitWriter(Session, max_batch=2, max_delay=0.2)
+        futures = [writer.submit(add_source(f"S{i}")) for i in range(5)]
+
+        for future in futures:
+            future.result(timeout=5)
+        writer.shutdown()
+
+        assert writer.commits == 3
+        assert len(source_names(Session)) == 5
+
+    def test_failing_unit_fails_alone(self, Session):
+        """A failing unit should not roll back the rest of its batch."""
+
+        def fail(session):
+            add_source("Doomed")(session)
+            raise RuntimeError("constraint failed")
+
+        writer = GroupCommitWriter(Session, max_delay=0.2)
+        good = writer.submit(add_source("Good1"))
+        bad = writer.submit(fail)
+        also_good = writer.submit(add_source("Good2"))
+
+        assert good.result(timeout=5)
+        assert also_good.result(timeout=5)
+        with pytest.raises(RuntimeError, match="constraint failed"):
+            bad.result(timeout=5)
+        writer.shutdown()
+
+        assert source_names(Session) == {"Good1", "Good2"}
+
+    def test_shutdown_commits_pending_units(self, Session):
+        """Shutdown should wait for submitted units to be committed."""
+        writer = GroupCommitWriter(Session, max_delay=0.5)
+        future = writer.submit(add_source("Late"))
+
+        writer.shutdown()
+
+        assert future.done()
+        assert source_names(Session) == {"Late"}
+
+    def test_restarts_after_shutdown(self, Session):
+        """Submitting after shutdown should start a new writer thread."""
+        writer = GroupCommitWriter(Session, max_delay=0)
+        writer.submit(add_source("First")).result(timeout=5)
+        writer.shutdown()
+
+        writer.submit(add_source("Second")).result(timeout=5)
+        writer.shutdown()
+
+        assert source_names(Session) == {"First", "Second"}